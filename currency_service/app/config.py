@@ -17,9 +17,15 @@ class Settings(BaseSettings):
     redis_url: str = "redis://localhost:6377"
     
     # Currency API
+    rate_provider: str = "http"  # http | file | fake
+    rate_snapshot_path: str = "data/rates_snapshot.json"  # used by the file provider
     currency_api_url: str = "https://api.exchangerate-api.com/v4/latest"
     currency_cache_ttl: int = 3600  # 1 hour in seconds
     fallback_cache_ttl: int = 86400  # 24 hours for fallback rates
+    supported_currencies_ttl: int = 86400  # 24 hours for in-memory supported currencies
+    
+    # Historical rates
+    rate_store_path: str = "data/rates"
     
     # HTTP Settings
     http_timeout: float = 10.0
@@ -1,6 +1,27 @@
-from fastapi import Depends
+from fastapi import Depends, Request, HTTPException, status
+from app.config import settings
 from app.services.currency import CurrencyService
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 def get_currency_service() -> CurrencyService:
     """Get currency service instance"""
     return CurrencyService()
+
+def verify_internal_token(request: Request) -> None:
+    """Verify internal service token for inter-service communication"""
+    token = request.headers.get("X-Internal-Token")
+    if not token:
+        logger.warning("Missing internal token", category="security", operation="internal_auth")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Internal token required"
+        )
+    
+    if token != settings.internal_secret_token:
+        logger.warning("Invalid internal token", category="security", operation="internal_auth")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Unauthorized internal access"
+        )
@@ -2,7 +2,8 @@ from fastapi import FastAPI, Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.routers import currency
+from app.routers import currency, internal
+from app.services.rate_providers import rate_provider
 from app.utils.logger import get_logger, set_request_context
 import time
 import uuid
@@ -96,6 +97,7 @@ app.add_middleware(RequestLoggingMiddleware)
 
 # Include routers
 app.include_router(currency.router)
+app.include_router(internal.router)
 
 @app.get("/")
 async def root():
@@ -118,12 +120,14 @@ async def startup_event():
         category="application",
         operation="service_startup",
         service_name="currency_service",
-        version=settings.api_version
+        version=settings.api_version,
+        rate_provider=rate_provider.name
     )
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown event"""
+    await rate_provider.close()
     logger.info(
         "Currency Service shutting down",
         category="application",
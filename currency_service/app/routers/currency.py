@@ -1,10 +1,13 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
+from typing import List, Optional
+from datetime import date, datetime
 from app.services.currency import CurrencyService
 from app.schemas.currency import (
     CurrencyInfo, 
     ConversionRequest, 
     ConversionResponse, 
+    BatchConversionRequest,
+    BatchConversionResponse,
     CurrencyRatesResponse,
     SupportedCurrenciesResponse,
     HealthResponse
@@ -12,21 +15,33 @@ from app.schemas.currency import (
 
 router = APIRouter(prefix="/api/v1", tags=["currency"])
 
+# Past-day snapshots never change, so their responses can be cached forever
+HISTORICAL_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 def get_currency_service() -> CurrencyService:
     """Get currency service instance"""
     return CurrencyService()
 
+def _validate_rates_date(rates_date: Optional[date]) -> None:
+    """Reject rate dates in the future"""
+    if rates_date is not None and rates_date > datetime.utcnow().date():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Rates date cannot be in the future: {rates_date}"
+        )
+
+def _is_historical(rates_date: Optional[date]) -> bool:
+    """Check whether a date refers to a finished (immutable) day"""
+    return rates_date is not None and rates_date < datetime.utcnow().date()
+
 @router.get("/currencies", response_model=SupportedCurrenciesResponse)
 async def get_supported_currencies(
     service: CurrencyService = Depends(get_currency_service)
-) -> SupportedCurrenciesResponse:
+) -> Response:
     """Get list of top 10 supported currencies"""
     try:
-        currencies = await service.get_supported_currencies()
-        return SupportedCurrenciesResponse(
-            currencies=currencies,
-            total_count=len(currencies)
-        )
+        body = await service.get_supported_currencies_body()
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -35,17 +50,27 @@ async def get_supported_currencies(
 
 @router.get("/rates", response_model=CurrencyRatesResponse)
 async def get_currency_rates(
+    response: Response,
     base_currency: str = "USD",
+    rates_date: Optional[date] = Query(None, alias="date", description="Day of the rates snapshot (default: current rates)"),
     service: CurrencyService = Depends(get_currency_service)
 ) -> CurrencyRatesResponse:
-    """Get current exchange rates for a base currency"""
+    """Get current or historical exchange rates for a base currency"""
     try:
-        rates_response = await service.get_currency_rates(base_currency)
+        _validate_rates_date(rates_date)
+        rates_response = await service.get_currency_rates(base_currency, rates_date)
         if rates_response is None:
+            if _is_historical(rates_date):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"No {base_currency} rates snapshot for {rates_date}"
+                )
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Unable to fetch currency rates at this time"
             )
+        if _is_historical(rates_date):
+            response.headers["Cache-Control"] = HISTORICAL_CACHE_CONTROL
         return rates_response
     except HTTPException:
         raise
@@ -58,13 +83,13 @@ async def get_currency_rates(
 @router.post("/convert", response_model=ConversionResponse)
 async def convert_currency(
     request: ConversionRequest,
+    response: Response,
     service: CurrencyService = Depends(get_currency_service)
 ) -> ConversionResponse:
     """Convert amount from one currency to another"""
     try:
         # Validate currencies are supported
-        supported_currencies = await service.get_supported_currencies()
-        supported_codes = {curr.code for curr in supported_currencies}
+        supported_codes = await service.get_supported_codes()
         
         if request.from_currency not in supported_codes:
             raise HTTPException(
@@ -78,18 +103,29 @@ async def convert_currency(
                 detail=f"Unsupported target currency: {request.to_currency}"
             )
         
+        _validate_rates_date(request.date)
+        
         conversion_result = await service.convert_amount(
             request.amount,
             request.from_currency,
-            request.to_currency
+            request.to_currency,
+            request.date
         )
         
         if conversion_result is None:
+            if _is_historical(request.date):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"No rates snapshot to convert {request.from_currency} to {request.to_currency} on {request.date}"
+                )
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail=f"Unable to convert {request.from_currency} to {request.to_currency} at this time"
             )
         
+        if _is_historical(request.date):
+            response.headers["Cache-Control"] = HISTORICAL_CACHE_CONTROL
+        
         return conversion_result
         
     except HTTPException:
@@ -100,20 +136,69 @@ async def convert_currency(
             detail=f"Failed to convert currency: {str(e)}"
         )
 
+@router.post("/convert/batch", response_model=BatchConversionResponse)
+async def convert_currency_batch(
+    request: BatchConversionRequest,
+    response: Response,
+    service: CurrencyService = Depends(get_currency_service)
+) -> BatchConversionResponse:
+    """Convert many amounts in one call using a single rate table"""
+    try:
+        # Validate all currencies against one supported codes lookup
+        supported_codes = await service.get_supported_codes()
+
+        for index, item in enumerate(request.items):
+            if item.from_currency not in supported_codes:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unsupported source currency at item {index}: {item.from_currency}"
+                )
+            if item.to_currency not in supported_codes:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unsupported target currency at item {index}: {item.to_currency}"
+                )
+            _validate_rates_date(item.date)
+
+        results, failed = await service.convert_batch(request.items)
+
+        if failed:
+            # Same as /convert: a missing snapshot of a past day is not a temporary failure
+            if all(_is_historical(item.date) for item in failed):
+                missing_dates = sorted({item.date.isoformat() for item in failed})
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"No rates snapshot to convert batch on {', '.join(missing_dates)}"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Unable to convert batch at this time"
+            )
+
+        if all(_is_historical(item.date) for item in request.items):
+            response.headers["Cache-Control"] = HISTORICAL_CACHE_CONTROL
+
+        return BatchConversionResponse(
+            results=results,
+            total_count=len(results)
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to convert currency batch: {str(e)}"
+        )
+
 @router.post("/currencies/refresh", response_model=SupportedCurrenciesResponse)
 async def refresh_currencies(
     service: CurrencyService = Depends(get_currency_service)
 ) -> SupportedCurrenciesResponse:
     """Force refresh top 10 currencies list from API"""
     try:
-        # Clear cache and fetch fresh data
-        currencies = await service._fetch_currencies_from_api()
-        if currencies is None:
-            currencies = service._get_fallback_currencies()
-        
-        # Cache the fresh data
-        cache_key = f"{service.cache_key_prefix}currencies_top10"
-        await service._cache_currencies(currencies, cache_key)
+        # Fetch fresh data and rebuild cached snapshots
+        currencies = await service.refresh_supported_currencies()
         
         return SupportedCurrenciesResponse(
             currencies=currencies,
@@ -137,14 +222,14 @@ async def health_check(
         
         return HealthResponse(
             status=overall_status,
-            timestamp=health_status.get("timestamp", "unknown"),
+            timestamp=datetime.utcnow(),
             redis_connected=health_status["redis_connected"],
             api_accessible=health_status["api_accessible"]
         )
     except Exception as e:
         return HealthResponse(
             status="unhealthy",
-            timestamp="unknown",
+            timestamp=datetime.utcnow(),
             redis_connected=False,
             api_accessible=False
         )
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, HTTPException, status, Depends
+from app.services.currency import CurrencyService
+from app.schemas.currency import ColumnarConversionRequest, ColumnarConversionResponse
+from app.dependencies import get_currency_service, verify_internal_token
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+@router.post("/convert/columnar", response_model=ColumnarConversionResponse)
+async def convert_columnar(
+    request: ColumnarConversionRequest,
+    service: CurrencyService = Depends(get_currency_service),
+    _: None = Depends(verify_internal_token)
+) -> ColumnarConversionResponse:
+    """Convert parallel arrays of amounts and currencies (for reports and bulk imports)"""
+    try:
+        result = await service.convert_columnar(
+            request.amounts,
+            request.from_currencies,
+            request.to_currencies,
+            request.date
+        )
+
+        if result is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Unable to fetch currency rates at this time"
+            )
+
+        converted_amounts, rates = result
+        return ColumnarConversionResponse(
+            converted_amounts=converted_amounts,
+            rates=rates,
+            date=request.date,
+            total_count=len(converted_amounts)
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to convert currency columns: {str(e)}"
+        )
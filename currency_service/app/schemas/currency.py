@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Dict, List, Optional
-from datetime import datetime
+from datetime import datetime, date as date_type
 
 class CurrencyInfo(BaseModel):
     """Information about a currency"""
@@ -22,6 +22,7 @@ class ConversionRequest(BaseModel):
     amount: float = Field(..., description="Amount to convert (can be negative)")
     from_currency: str = Field(..., min_length=3, max_length=3, description="Source currency code")
     to_currency: str = Field(..., min_length=3, max_length=3, description="Target currency code")
+    date: Optional[date_type] = Field(None, description="Use the rate snapshot of this day (default: current rate)")
 
 class ConversionResponse(BaseModel):
     """Response for currency conversion"""
@@ -31,12 +32,43 @@ class ConversionResponse(BaseModel):
     to_currency: str = Field(..., description="Target currency code")
     rate: float = Field(..., description="Exchange rate used")
     timestamp: datetime = Field(..., description="Conversion timestamp")
+    date: Optional[date_type] = Field(None, description="Day of the rate snapshot used, if historical")
+
+class BatchConversionRequest(BaseModel):
+    """Request for converting many amounts in one call"""
+    items: List[ConversionRequest] = Field(..., min_length=1, max_length=1000, description="Conversions to perform, in order")
+
+class BatchConversionResponse(BaseModel):
+    """Response for batch currency conversion"""
+    results: List[ConversionResponse] = Field(..., description="Conversion results in request order")
+    total_count: int = Field(..., description="Number of converted items")
+
+class ColumnarConversionRequest(BaseModel):
+    """Request for converting parallel arrays of amounts and currency codes"""
+    amounts: List[float] = Field(..., max_length=200000, description="Amounts to convert")
+    from_currencies: List[str] = Field(..., max_length=200000, description="Source currency code per amount")
+    to_currencies: List[str] = Field(..., max_length=200000, description="Target currency code per amount")
+    date: Optional[date_type] = Field(None, description="Use the rate snapshot of this day (default: current rates)")
+
+    @model_validator(mode="after")
+    def validate_lengths(self):
+        if not (len(self.amounts) == len(self.from_currencies) == len(self.to_currencies)):
+            raise ValueError("amounts, from_currencies and to_currencies must have the same length")
+        return self
+
+class ColumnarConversionResponse(BaseModel):
+    """Response for columnar currency conversion"""
+    converted_amounts: List[float] = Field(..., description="Converted amounts in input order")
+    rates: List[float] = Field(..., description="Exchange rate used per amount")
+    date: Optional[date_type] = Field(None, description="Day of the rate snapshot used, if historical")
+    total_count: int = Field(..., description="Number of converted amounts")
 
 class CurrencyRatesResponse(BaseModel):
     """Response for currency rates"""
     base_currency: str = Field(..., description="Base currency")
     rates: Dict[str, float] = Field(..., description="Exchange rates")
     timestamp: datetime = Field(..., description="Rates timestamp")
+    date: Optional[date_type] = Field(None, description="Day of the rate snapshot, if historical")
 
 class SupportedCurrenciesResponse(BaseModel):
     """Response for supported currencies"""
@@ -1,18 +1,56 @@
 import redis
-import httpx
 import json
 import logging
-from typing import Dict, Optional, List
-from datetime import datetime, timedelta
+import time
+from typing import Dict, Optional, List, FrozenSet, Tuple
+from datetime import datetime, date, timedelta
 from app.config import settings
-from app.schemas.currency import CurrencyInfo, ExchangeRate, ConversionResponse, CurrencyRatesResponse
+from app.services.rate_store import rate_store
+from app.services.rate_providers import RateProvider, rate_provider
+from app.services.vectorized import convert_arrays
+from app.schemas.currency import (
+    CurrencyInfo,
+    ExchangeRate,
+    ConversionRequest,
+    ConversionResponse,
+    CurrencyRatesResponse,
+    SupportedCurrenciesResponse
+)
 
 logger = logging.getLogger(__name__)
 
-class CurrencyService:
+class SupportedCurrenciesCache:
+    """In-process snapshot of supported currencies, rebuilt only on refresh or expiry"""
+
     def __init__(self):
+        self.codes: FrozenSet[str] = frozenset()
+        self.currencies: Tuple[CurrencyInfo, ...] = ()
+        self.response_body: bytes = b""
+        self.expires_at: float = 0.0
+
+    def is_fresh(self) -> bool:
+        """Check whether the snapshot can be served without I/O"""
+        return bool(self.codes) and time.monotonic() < self.expires_at
+
+    def update(self, currencies: List[CurrencyInfo], ttl: int):
+        """Rebuild the code set and the pre-serialised response body"""
+        currencies = tuple(currencies)
+        response_body = SupportedCurrenciesResponse(
+            currencies=list(currencies),
+            total_count=len(currencies)
+        ).model_dump_json().encode("utf-8")
+        self.codes = frozenset(currency.code for currency in currencies)
+        self.currencies = currencies
+        self.response_body = response_body
+        self.expires_at = time.monotonic() + ttl
+
+# Shared across requests (CurrencyService is created per request)
+supported_currencies_cache = SupportedCurrenciesCache()
+
+class CurrencyService:
+    def __init__(self, provider: Optional[RateProvider] = None):
         self.redis_client = redis.from_url(settings.redis_url, decode_responses=True)
-        self.http_client = httpx.AsyncClient(timeout=settings.http_timeout)
+        self.rate_provider = provider or rate_provider
         self.cache_key_prefix = "currency:"
         
         # Top 10 most popular currencies for UI
@@ -56,11 +94,15 @@ class CurrencyService:
     
     async def get_supported_currencies(self) -> List[CurrencyInfo]:
         """Get list of top 10 supported currencies"""
+        if supported_currencies_cache.is_fresh():
+            return list(supported_currencies_cache.currencies)
+
         try:
             # Try to get from cache first
             cache_key = f"{self.cache_key_prefix}currencies_top10"
             cached_currencies = await self._get_cached_currencies(cache_key)
             if cached_currencies:
+                supported_currencies_cache.update(cached_currencies, settings.supported_currencies_ttl)
                 return cached_currencies
             
             # Fetch from API
@@ -68,15 +110,44 @@ class CurrencyService:
             if currencies:
                 # Cache the currencies
                 await self._cache_currencies(currencies, cache_key)
+                supported_currencies_cache.update(currencies, settings.supported_currencies_ttl)
                 return currencies
             
             # Fallback to hardcoded list
             logger.warning("Using fallback currency list")
-            return self._get_fallback_currencies()
             
         except Exception as e:
             logger.error(f"Error getting supported currencies: {e}")
-            return self._get_fallback_currencies()
+
+        # Retry the real list sooner than a normal refresh
+        currencies = self._get_fallback_currencies()
+        supported_currencies_cache.update(currencies, settings.currency_cache_ttl)
+        return currencies
+
+    async def get_supported_codes(self) -> FrozenSet[str]:
+        """Get supported currency codes; no I/O while the in-memory snapshot is fresh"""
+        if not supported_currencies_cache.is_fresh():
+            await self.get_supported_currencies()
+        return supported_currencies_cache.codes
+
+    async def get_supported_currencies_body(self) -> bytes:
+        """Get pre-serialised SupportedCurrenciesResponse JSON"""
+        if not supported_currencies_cache.is_fresh():
+            await self.get_supported_currencies()
+        return supported_currencies_cache.response_body
+
+    async def refresh_supported_currencies(self) -> List[CurrencyInfo]:
+        """Force refresh supported currencies from API and rebuild the in-memory snapshot"""
+        currencies = await self._fetch_currencies_from_api()
+        ttl = settings.supported_currencies_ttl
+        if currencies is None:
+            currencies = self._get_fallback_currencies()
+            ttl = settings.currency_cache_ttl
+
+        cache_key = f"{self.cache_key_prefix}currencies_top10"
+        await self._cache_currencies(currencies, cache_key)
+        supported_currencies_cache.update(currencies, ttl)
+        return currencies
     
     async def get_exchange_rate(self, from_currency: str, to_currency: str) -> Optional[float]:
         """
@@ -124,9 +195,16 @@ class CurrencyService:
                 return fallback_rate
             return None
     
-    async def convert_amount(self, amount: float, from_currency: str, to_currency: str) -> Optional[ConversionResponse]:
+    async def convert_amount(
+        self,
+        amount: float,
+        from_currency: str,
+        to_currency: str,
+        on_date: Optional[date] = None
+    ) -> Optional[ConversionResponse]:
         """
         Convert amount from one currency to another.
+        If on_date is given, the stored rate snapshot of that day is used.
         Returns None if conversion cannot be performed.
         """
         if from_currency == to_currency:
@@ -136,10 +214,15 @@ class CurrencyService:
                 from_currency=from_currency,
                 to_currency=to_currency,
                 rate=1.0,
-                timestamp=datetime.utcnow()
+                timestamp=datetime.utcnow(),
+                date=on_date
             )
-            
-        rate = await self.get_exchange_rate(from_currency, to_currency)
+
+        if on_date is not None:
+            rates = await self.get_rates_for_date(on_date)
+            rate = self._calculate_rate(rates, from_currency, to_currency) if rates else None
+        else:
+            rate = await self.get_exchange_rate(from_currency, to_currency)
         if rate is None:
             return None
             
@@ -151,49 +234,175 @@ class CurrencyService:
             from_currency=from_currency,
             to_currency=to_currency,
             rate=rate,
-            timestamp=datetime.utcnow()
+            timestamp=datetime.utcnow(),
+            date=on_date
         )
-    
-    async def get_currency_rates(self, base_currency: str = "USD") -> Optional[CurrencyRatesResponse]:
-        """Get all exchange rates for a base currency"""
+
+    async def convert_batch(
+        self,
+        items: List[ConversionRequest]
+    ) -> Tuple[List[ConversionResponse], List[ConversionRequest]]:
+        """
+        Convert many amounts, resolving each distinct rate table (current or dated) once.
+        Returns (results, failed items); results are only complete when no item failed
+        because its rate table or rate cannot be determined.
+        """
+        tables: Dict[Optional[date], Optional[Dict[str, float]]] = {}
+        timestamp = datetime.utcnow()
+        results = []
+        failed = []
+        for item in items:
+            if item.from_currency == item.to_currency:
+                # Same as convert_amount: no rate table needed
+                rate = 1.0
+            else:
+                if item.date not in tables:
+                    if item.date is None:
+                        tables[item.date] = await self._get_rates_table("USD")
+                    else:
+                        tables[item.date] = await self.get_rates_for_date(item.date)
+                rates = tables[item.date]
+                rate = self._calculate_rate(rates, item.from_currency, item.to_currency) if rates else None
+            if rate is None:
+                logger.error(f"No rate available for {item.from_currency}->{item.to_currency} on {item.date} in batch")
+                failed.append(item)
+                continue
+            converted_amount = item.amount if item.from_currency == item.to_currency else round(item.amount * rate, 2)
+            results.append(ConversionResponse(
+                amount=item.amount,
+                converted_amount=converted_amount,
+                from_currency=item.from_currency,
+                to_currency=item.to_currency,
+                rate=rate,
+                timestamp=timestamp,
+                date=item.date
+            ))
+
+        return results, failed
+
+    async def convert_columnar(
+        self,
+        amounts: List[float],
+        from_currencies: List[str],
+        to_currencies: List[str],
+        on_date: Optional[date] = None
+    ) -> Optional[Tuple[List[float], List[float]]]:
+        """
+        Convert parallel arrays of amounts with vectorised rate lookups.
+        Returns (converted_amounts, rates), or None if the rate table cannot be determined.
+        Raises ValueError for currencies missing from the rate table.
+        """
+        if on_date is None:
+            rates = await self._get_rates_table("USD")
+        else:
+            rates = await self.get_rates_for_date(on_date)
+        if rates is None:
+            return None
+
+        converted, used_rates = convert_arrays(amounts, from_currencies, to_currencies, rates)
+        return converted.tolist(), used_rates.tolist()
+
+    async def _get_rates_table(self, base_currency: str) -> Optional[Dict[str, float]]:
+        """Get full rates table for a base currency, from cache or API"""
         try:
-            rates = await self._fetch_exchange_rates(base_currency)
+            cache_key = f"{self.cache_key_prefix}rates:{base_currency}"
+            cached_data = self.redis_client.get(cache_key)
+            if cached_data:
+                return json.loads(cached_data)
+        except Exception as e:
+            logger.error(f"Error getting cached rates table for {base_currency}: {e}")
+
+        return await self._fetch_exchange_rates(base_currency)
+
+    async def get_rates_for_date(self, on_date: date) -> Optional[Dict[str, float]]:
+        """
+        Get USD-based rates snapshot for a day.
+        Today's snapshot is taken on first use; past days without a snapshot return None.
+        Non-live providers (file, fake) are never persisted, so they only serve today.
+        """
+        if not self.rate_provider.live:
+            if on_date == datetime.utcnow().date():
+                return await self._fetch_exchange_rates("USD")
+            return None
+
+        rates = rate_store.get(on_date)
+        if rates is not None:
+            return rates
+
+        if on_date == datetime.utcnow().date():
+            await self._fetch_exchange_rates("USD")
+            return rate_store.get(on_date)
+
+        return None
+
+    async def get_currency_rates(
+        self,
+        base_currency: str = "USD",
+        on_date: Optional[date] = None
+    ) -> Optional[CurrencyRatesResponse]:
+        """Get all exchange rates for a base currency, optionally for a past day"""
+        try:
+            if on_date is not None:
+                usd_rates = await self.get_rates_for_date(on_date)
+                if usd_rates is None:
+                    return None
+                base_rate = usd_rates.get(base_currency, 1.0 if base_currency == "USD" else None)
+                if not base_rate:
+                    return None
+                rates = {code: rate / base_rate for code, rate in usd_rates.items()}
+            else:
+                rates = await self._fetch_exchange_rates(base_currency)
             if rates is None:
                 return None
                 
             return CurrencyRatesResponse(
                 base_currency=base_currency,
                 rates=rates,
-                timestamp=datetime.utcnow()
+                timestamp=datetime.utcnow(),
+                date=on_date
             )
         except Exception as e:
             logger.error(f"Error getting currency rates for {base_currency}: {e}")
             return None
     
     async def _fetch_exchange_rates(self, base_currency: str) -> Optional[Dict[str, float]]:
-        """Fetch exchange rates from API"""
+        """Fetch exchange rates from the configured rate provider"""
         try:
-            url = f"{settings.currency_api_url}/{base_currency}"
-            response = await self.http_client.get(url)
-            response.raise_for_status()
-            
-            data = response.json()
-            rates = data.get("rates", {})
+            rates = await self.rate_provider.fetch_rates(base_currency)
+            if rates is None:
+                logger.error(f"Rate provider '{self.rate_provider.name}' has no rates for {base_currency}")
+                return None
+
+            # Persist the first live USD table of the day as the historical snapshot
+            if base_currency == "USD" and rates and self.rate_provider.live:
+                self._store_snapshot(rates)
             
             # Cache the entire rates object
-            cache_key = f"{self.cache_key_prefix}rates:{base_currency}"
-            self.redis_client.setex(
-                cache_key, 
-                settings.currency_cache_ttl, 
-                json.dumps(rates)
-            )
+            try:
+                cache_key = f"{self.cache_key_prefix}rates:{base_currency}"
+                self.redis_client.setex(
+                    cache_key, 
+                    settings.currency_cache_ttl, 
+                    json.dumps(rates)
+                )
+            except Exception as e:
+                logger.error(f"Error caching rates for {base_currency}: {e}")
             
-            logger.info(f"Fetched and cached rates for {base_currency}")
+            logger.info(f"Fetched rates for {base_currency}")
             return rates
             
         except Exception as e:
             logger.error(f"Error fetching exchange rates for {base_currency}: {e}")
             return None
+
+    def _store_snapshot(self, rates: Dict[str, float]):
+        """Store today's USD rates snapshot if not stored yet"""
+        try:
+            today = datetime.utcnow().date()
+            if not rate_store.has(today):
+                rate_store.put(today, rates)
+        except Exception as e:
+            logger.error(f"Error storing rates snapshot: {e}")
     
     async def _get_cached_rate(self, from_currency: str, to_currency: str) -> Optional[float]:
         """Get rate from cache"""
@@ -283,12 +492,11 @@ class CurrencyService:
         except Exception as e:
             logger.error(f"Redis health check failed: {e}")
         
-        # Check external API
+        # Check rate provider
         try:
-            response = await self.http_client.get(settings.currency_api_url, timeout=5.0)
-            health["api_accessible"] = response.status_code == 200
+            health["api_accessible"] = await self.rate_provider.is_available()
         except Exception as e:
-            logger.error(f"External API health check failed: {e}")
+            logger.error(f"Rate provider health check failed: {e}")
         
         return health
     
@@ -368,7 +576,3 @@ class CurrencyService:
                     locale=info["locale"]
                 ))
         return currencies
-
-    async def close(self):
-        """Close HTTP client"""
-        await self.http_client.aclose()
@@ -0,0 +1,173 @@
+import csv
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RateProvider(ABC):
+    """Source of exchange rate tables (rates of every currency per 1 unit of base)"""
+
+    name = "base"
+    # Only live market rates are persisted as historical snapshots
+    live = False
+
+    @abstractmethod
+    async def fetch_rates(self, base_currency: str) -> Optional[Dict[str, float]]:
+        """Fetch rates table for a base currency, or None if unavailable"""
+        pass
+
+    @abstractmethod
+    async def is_available(self) -> bool:
+        """Check whether the provider can currently serve rates"""
+        pass
+
+    async def close(self):
+        """Release provider resources"""
+
+
+def rebase_rates(rates: Dict[str, float], source_base: str, base_currency: str) -> Optional[Dict[str, float]]:
+    """Express a rates table relative to another base currency"""
+    if base_currency == source_base:
+        return dict(rates)
+    base_rate = rates.get(base_currency)
+    if not base_rate or base_rate <= 0:
+        return None
+    return {code: rate / base_rate for code, rate in rates.items()}
+
+
+class HttpRateProvider(RateProvider):
+    """Upstream HTTP API provider (exchangerate-api compatible), with one long-lived client"""
+
+    name = "http"
+    live = True
+
+    def __init__(self, api_url: str, timeout: float):
+        self.api_url = api_url.rstrip("/")
+        self.http_client = httpx.AsyncClient(timeout=timeout)
+
+    async def fetch_rates(self, base_currency: str) -> Optional[Dict[str, float]]:
+        response = await self.http_client.get(f"{self.api_url}/{base_currency}")
+        response.raise_for_status()
+        return response.json().get("rates", {})
+
+    async def is_available(self) -> bool:
+        try:
+            response = await self.http_client.get(self.api_url, timeout=5.0)
+            return response.status_code == 200
+        except Exception as e:
+            logger.error(f"External API health check failed: {e}")
+            return False
+
+    async def close(self):
+        await self.http_client.aclose()
+
+
+class FileRateProvider(RateProvider):
+    """
+    Local snapshot provider for offline operation and reproducible benchmarks.
+
+    Accepts JSON ({"base": "USD", "rates": {...}} or a plain {code: rate} mapping, USD based)
+    or CSV with `currency,rate` columns (USD based). The file is reloaded when it changes.
+    """
+
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._loaded_mtime: Optional[float] = None
+        self._snapshot: Optional[Tuple[str, Dict[str, float]]] = None
+
+    async def fetch_rates(self, base_currency: str) -> Optional[Dict[str, float]]:
+        snapshot = self._load()
+        if snapshot is None:
+            return None
+        source_base, rates = snapshot
+        return rebase_rates(rates, source_base, base_currency)
+
+    async def is_available(self) -> bool:
+        return self._load() is not None
+
+    def _load(self) -> Optional[Tuple[str, Dict[str, float]]]:
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError as e:
+            logger.error(f"Rate snapshot file unavailable: {e}")
+            return None
+
+        if self._snapshot is None or mtime != self._loaded_mtime:
+            try:
+                self._snapshot = self._parse()
+                self._loaded_mtime = mtime
+                logger.info(f"Loaded rate snapshot from {self.path} with {len(self._snapshot[1])} currencies")
+            except Exception as e:
+                logger.error(f"Error reading rate snapshot {self.path}: {e}")
+                return self._snapshot
+
+        return self._snapshot
+
+    def _parse(self) -> Tuple[str, Dict[str, float]]:
+        if self.path.lower().endswith(".csv"):
+            with open(self.path, "r", encoding="utf-8", newline="") as f:
+                rates = {row["currency"].strip().upper(): float(row["rate"]) for row in csv.DictReader(f)}
+            base = "USD"
+        else:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if "rates" in data:
+                base = data.get("base", "USD")
+                rates = {code: float(rate) for code, rate in data["rates"].items()}
+            else:
+                base = "USD"
+                rates = {code: float(rate) for code, rate in data.items()}
+
+        rates.setdefault(base, 1.0)
+        return base, rates
+
+
+class FakeRateProvider(RateProvider):
+    """Deterministic in-memory provider for tests and load testing"""
+
+    name = "fake"
+
+    DEFAULT_RATES = {
+        "USD": 1.0, "EUR": 0.92, "GBP": 0.79, "JPY": 150.0, "CHF": 0.88,
+        "CAD": 1.36, "AUD": 1.52, "CNY": 7.2, "UAH": 41.0, "RUB": 92.0,
+        "INR": 83.0, "BRL": 5.0, "MXN": 17.0, "KRW": 1330.0, "SGD": 1.34,
+        "NZD": 1.64, "NOK": 10.6, "SEK": 10.4, "DKK": 6.9, "PLN": 4.0,
+        "CZK": 23.0, "HUF": 360.0, "TRY": 32.0, "ZAR": 18.5, "AED": 3.6725,
+        "SAR": 3.75, "THB": 36.0, "MYR": 4.7, "IDR": 15700.0, "PHP": 56.0,
+    }
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        self.rates = dict(rates if rates is not None else self.DEFAULT_RATES)
+        self.rates.setdefault("USD", 1.0)
+
+    async def fetch_rates(self, base_currency: str) -> Optional[Dict[str, float]]:
+        return rebase_rates(self.rates, "USD", base_currency)
+
+    async def is_available(self) -> bool:
+        return True
+
+
+def create_rate_provider() -> RateProvider:
+    """Create the rate provider selected by settings.rate_provider"""
+    provider = settings.rate_provider.lower()
+    if provider == "file":
+        return FileRateProvider(settings.rate_snapshot_path)
+    if provider == "fake":
+        return FakeRateProvider()
+    if provider != "http":
+        raise ValueError(f"Unknown rate provider: {settings.rate_provider}")
+    return HttpRateProvider(settings.currency_api_url, settings.http_timeout)
+
+
+# Shared provider instance (CurrencyService is created per request)
+rate_provider = create_rate_provider()
@@ -0,0 +1,115 @@
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RateSnapshotStore:
+    """
+    Compact on-disk store of daily USD-based rate snapshots keyed by (date, currency).
+
+    Layout: `currencies.json` holds the column order of currency codes, and every
+    day is a `YYYY-MM-DD.bin` file with one float64 per column (NaN = missing).
+    Snapshots are immutable once written, so loaded days are kept in a small LRU.
+    """
+
+    INDEX_FILE = "currencies.json"
+
+    def __init__(self, path: str, max_cached_days: int = 366):
+        self.path = path
+        self.max_cached_days = max_cached_days
+        self._lock = threading.Lock()
+        self._codes: Optional[List[str]] = None
+        self._cache: "OrderedDict[date, Dict[str, float]]" = OrderedDict()
+
+    def get(self, day: date) -> Optional[Dict[str, float]]:
+        """Get USD-based rates for a day, or None if no snapshot exists"""
+        with self._lock:
+            cached = self._cache.get(day)
+            if cached is not None:
+                self._cache.move_to_end(day)
+                return cached
+
+            try:
+                with open(self._day_path(day), "rb") as f:
+                    raw = f.read()
+            except FileNotFoundError:
+                return None
+
+            values = array("d")
+            values.frombytes(raw)
+            codes = self._load_codes()
+            rates = {
+                code: value
+                for code, value in zip(codes, values)
+                if not math.isnan(value)
+            }
+            self._remember(day, rates)
+            return rates
+
+    def has(self, day: date) -> bool:
+        """Check whether a snapshot exists for a day"""
+        with self._lock:
+            return day in self._cache or os.path.exists(self._day_path(day))
+
+    def put(self, day: date, rates: Dict[str, float]) -> None:
+        """Persist a snapshot for a day; existing snapshots are never overwritten"""
+        with self._lock:
+            if os.path.exists(self._day_path(day)):
+                return
+
+            os.makedirs(self.path, exist_ok=True)
+            codes = self._load_codes()
+            new_codes = sorted(code for code in rates if code not in set(codes))
+            if new_codes:
+                codes = codes + new_codes
+                self._write_atomic(self.INDEX_FILE, json.dumps(codes).encode("utf-8"))
+                self._codes = codes
+
+            values = array("d", (float(rates.get(code, math.nan)) for code in codes))
+            self._write_atomic(f"{day.isoformat()}.bin", values.tobytes())
+            self._remember(day, {code: float(rate) for code, rate in rates.items()})
+            logger.info(f"Stored rate snapshot for {day} with {len(rates)} currencies")
+
+    def _load_codes(self) -> List[str]:
+        if self._codes is None:
+            try:
+                with open(os.path.join(self.path, self.INDEX_FILE), "r", encoding="utf-8") as f:
+                    self._codes = json.load(f)
+            except FileNotFoundError:
+                self._codes = []
+        return self._codes
+
+    def _remember(self, day: date, rates: Dict[str, float]) -> None:
+        self._cache[day] = rates
+        self._cache.move_to_end(day)
+        while len(self._cache) > self.max_cached_days:
+            self._cache.popitem(last=False)
+
+    def _day_path(self, day: date) -> str:
+        return os.path.join(self.path, f"{day.isoformat()}.bin")
+
+    def _write_atomic(self, filename: str, payload: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, os.path.join(self.path, filename))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+# Shared store instance (CurrencyService is created per request)
+rate_store = RateSnapshotStore(settings.rate_store_path)
@@ -0,0 +1,75 @@
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+# Products this close to a .5 boundary (in cents) are re-rounded with Python's round()
+# so results match CurrencyService.convert_amount exactly
+_TIE_TOLERANCE = 1e-6
+# Above this many cents the float product is too coarse for the tie check, so those
+# values are rounded with round() as well
+_EXACT_CENTS_LIMIT = 2.0 ** 32
+
+
+def convert_arrays(
+    amounts: Sequence[float],
+    from_currencies: Sequence[str],
+    to_currencies: Sequence[str],
+    usd_rates: Dict[str, float]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert parallel arrays of amounts using a USD-based rates table.
+
+    Currency codes are mapped to columns of the rate vector once per distinct code,
+    then every row is converted with array arithmetic. Same-currency rows are identity
+    conversions and need no rate, as in CurrencyService.convert_amount.
+    Returns (converted_amounts, rates); raises ValueError for unknown currencies.
+    """
+    amounts_arr = np.asarray(amounts, dtype=np.float64)
+    if not (len(amounts_arr) == len(from_currencies) == len(to_currencies)):
+        raise ValueError("amounts, from_currencies and to_currencies must have the same length")
+    if len(amounts_arr) == 0:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64)
+
+    codes, inverse = np.unique(
+        np.concatenate([np.asarray(from_currencies, dtype=str), np.asarray(to_currencies, dtype=str)]),
+        return_inverse=True
+    )
+    rate_vector = np.empty(len(codes), dtype=np.float64)
+    for index, code in enumerate(codes):
+        rate = 1.0 if code == "USD" else usd_rates.get(code)
+        rate_vector[index] = rate if rate and rate > 0 else np.nan
+
+    from_idx = inverse[:len(amounts_arr)]
+    to_idx = inverse[len(amounts_arr):]
+    same_currency = from_idx == to_idx
+
+    # Unknown codes only matter in rows that actually convert
+    converting = ~same_currency
+    missing = np.isnan(rate_vector)
+    used_missing = np.unique(np.concatenate([from_idx[converting], to_idx[converting]]))
+    unknown = [str(codes[index]) for index in used_missing if missing[index]]
+    if unknown:
+        raise ValueError(f"No rates available for: {', '.join(unknown)}")
+
+    with np.errstate(invalid="ignore"):
+        rates = rate_vector[to_idx] / rate_vector[from_idx]
+    rates[same_currency] = 1.0
+
+    converted = round_cents(amounts_arr * rates)
+    # Same-currency amounts are passed through unrounded, as in convert_amount
+    converted[same_currency] = amounts_arr[same_currency]
+
+    return converted, rates
+
+
+def round_cents(values: np.ndarray) -> np.ndarray:
+    """Round to 2 decimals with the same results as Python's round(value, 2)"""
+    scaled = values * 100.0
+    rounded = np.rint(scaled) / 100.0
+
+    fraction = np.abs(scaled - np.trunc(scaled))
+    exact = np.flatnonzero((np.abs(fraction - 0.5) < _TIE_TOLERANCE) | (np.abs(scaled) >= _EXACT_CENTS_LIMIT))
+    for index in exact:
+        rounded[index] = round(float(values[index]), 2)
+
+    return rounded
@@ -0,0 +1,71 @@
+"""
+/convert/batch reports a missing past-day snapshot the same way as /convert
+"""
+import asyncio
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException, Response
+
+from app.routers.currency import convert_currency_batch
+from app.schemas.currency import BatchConversionRequest, ConversionRequest
+from app.services.currency import CurrencyService
+from app.services.rate_providers import FakeRateProvider
+
+RATES = dict(FakeRateProvider.DEFAULT_RATES)
+TODAY = datetime.utcnow().date()
+YESTERDAY = TODAY - timedelta(days=1)
+
+
+@pytest.fixture
+def service():
+    service = CurrencyService(provider=FakeRateProvider())
+    service.get_supported_codes = AsyncMock(return_value=frozenset(RATES) | {"USD"})
+    service._get_rates_table = AsyncMock(return_value=RATES)
+    # No snapshot stored for any past day
+    service.get_rates_for_date = AsyncMock(return_value=None)
+    return service
+
+
+def convert(service, *items):
+    request = BatchConversionRequest(items=list(items))
+    return asyncio.run(convert_currency_batch(request, Response(), service))
+
+
+class TestConvertBatch:
+
+    def test_current_rates(self, service):
+        result = convert(service, ConversionRequest(amount=10, from_currency="USD", to_currency="EUR"))
+
+        assert result.total_count == 1
+        assert result.results[0].rate == RATES["EUR"]
+
+    def test_missing_past_snapshot_is_404(self, service):
+        with pytest.raises(HTTPException) as exc_info:
+            convert(
+                service,
+                ConversionRequest(amount=10, from_currency="USD", to_currency="EUR"),
+                ConversionRequest(amount=10, from_currency="USD", to_currency="EUR", date=YESTERDAY)
+            )
+
+        assert exc_info.value.status_code == 404
+        assert YESTERDAY.isoformat() in exc_info.value.detail
+
+    def test_missing_current_rates_is_503(self, service):
+        service._get_rates_table = AsyncMock(return_value=None)
+
+        with pytest.raises(HTTPException) as exc_info:
+            convert(
+                service,
+                ConversionRequest(amount=10, from_currency="USD", to_currency="EUR"),
+                ConversionRequest(amount=10, from_currency="USD", to_currency="EUR", date=YESTERDAY)
+            )
+
+        assert exc_info.value.status_code == 503
+
+    def test_same_currency_needs_no_snapshot(self, service):
+        result = convert(service, ConversionRequest(amount=10.005, from_currency="EUR", to_currency="EUR", date=YESTERDAY))
+
+        assert result.results[0].converted_amount == 10.005
+        assert result.results[0].rate == 1.0
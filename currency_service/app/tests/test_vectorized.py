@@ -0,0 +1,111 @@
+"""
+Vectorised conversion must give exactly the same results as the scalar path
+(CurrencyService._calculate_rate + round(amount * rate, 2))
+"""
+import random
+
+import numpy as np
+import pytest
+
+from app.services.currency import CurrencyService
+from app.services.rate_providers import FakeRateProvider
+from app.services.vectorized import convert_arrays, round_cents
+
+RATES = dict(FakeRateProvider.DEFAULT_RATES)
+CODES = sorted(RATES)
+
+
+@pytest.fixture
+def service():
+    return CurrencyService(provider=FakeRateProvider())
+
+
+def scalar_convert(service, amount, from_currency, to_currency):
+    """Reference result, as convert_amount / convert_batch compute it"""
+    rate = service._calculate_rate(RATES, from_currency, to_currency)
+    if from_currency == to_currency:
+        return amount, rate
+    return round(amount * rate, 2), rate
+
+
+class TestConvertArrays:
+    """convert_arrays matches the scalar conversion"""
+
+    def test_random_rows_match_scalar(self, service):
+        rng = random.Random(42)
+        amounts = [round(rng.uniform(0.01, 100000), rng.choice([0, 1, 2, 3])) for _ in range(5000)]
+        from_currencies = [rng.choice(CODES) for _ in amounts]
+        to_currencies = [rng.choice(CODES) for _ in amounts]
+
+        converted, rates = convert_arrays(amounts, from_currencies, to_currencies, RATES)
+
+        for i, amount in enumerate(amounts):
+            expected_amount, expected_rate = scalar_convert(service, amount, from_currencies[i], to_currencies[i])
+            assert converted[i] == expected_amount, (amount, from_currencies[i], to_currencies[i])
+            assert rates[i] == expected_rate
+
+    def test_large_amounts_match_scalar(self, service):
+        rng = random.Random(7)
+        amounts = [round(rng.uniform(1e6, 1e12), rng.choice([2, 3])) for _ in range(20000)]
+        from_currencies = [rng.choice(CODES) for _ in amounts]
+        to_currencies = [rng.choice(CODES) for _ in amounts]
+
+        converted, _ = convert_arrays(amounts, from_currencies, to_currencies, RATES)
+
+        expected = [scalar_convert(service, *row)[0] for row in zip(amounts, from_currencies, to_currencies)]
+        assert converted.tolist() == expected
+
+    def test_half_cent_ties_match_scalar(self, service):
+        # Amounts whose converted value lands on (or next to) a .5 cent boundary
+        amounts = [0.125, 0.135, 1.005, 2.675, 10.125, 1234.565, 0.045, 99999.995]
+        from_currencies = ["USD"] * len(amounts)
+        to_currencies = ["USD"] * len(amounts)
+
+        # Same-currency rows pass amounts through unrounded
+        converted, _ = convert_arrays(amounts, from_currencies, to_currencies, RATES)
+        assert converted.tolist() == amounts
+
+        # Converting with rate 1.0 through another currency exercises rounding on ties
+        rates = {**RATES, "XTS": 1.0}
+        converted, _ = convert_arrays(amounts, ["XTS"] * len(amounts), ["USD"] * len(amounts), rates)
+        assert converted.tolist() == [round(amount, 2) for amount in amounts]
+
+        for amount in amounts:
+            for to_currency in ("EUR", "UAH", "JPY"):
+                expected, _ = scalar_convert(service, amount, "USD", to_currency)
+                assert convert_arrays([amount], ["USD"], [to_currency], RATES)[0][0] == expected
+
+    def test_round_cents_matches_round(self):
+        values = np.array([0.005, 0.015, 0.025, 1.005, 2.675, 1.115, -0.125, -2.675, 123456.785, 5e-324, 0.0])
+        assert round_cents(values).tolist() == [round(float(value), 2) for value in values]
+
+    def test_missing_currency_raises(self):
+        with pytest.raises(ValueError, match="XXX"):
+            convert_arrays([1.0, 2.0], ["USD", "XXX"], ["EUR", "USD"], RATES)
+
+    def test_missing_currency_matches_scalar_none(self, service):
+        assert service._calculate_rate(RATES, "XXX", "EUR") is None
+        with pytest.raises(ValueError):
+            convert_arrays([1.0], ["XXX"], ["EUR"], RATES)
+
+    def test_same_currency_missing_from_table_is_identity(self, service):
+        # The scalar path converts XXX->XXX without looking up a rate
+        assert service._calculate_rate(RATES, "XXX", "XXX") == 1.0
+
+        converted, rates = convert_arrays([12.345, 10.0], ["XXX", "USD"], ["XXX", "EUR"], RATES)
+
+        assert converted.tolist() == [12.345, scalar_convert(service, 10.0, "USD", "EUR")[0]]
+        assert rates.tolist() == [1.0, RATES["EUR"]]
+
+    def test_missing_currency_in_converting_row_still_raises(self):
+        with pytest.raises(ValueError, match="XXX") as exc_info:
+            convert_arrays([1.0, 2.0], ["XXX", "XXX"], ["XXX", "EUR"], RATES)
+        assert "EUR" not in str(exc_info.value)
+
+    def test_length_mismatch_raises(self):
+        with pytest.raises(ValueError, match="same length"):
+            convert_arrays([1.0, 2.0], ["USD"], ["EUR", "UAH"], RATES)
+
+    def test_empty_input(self):
+        converted, rates = convert_arrays([], [], [], RATES)
+        assert converted.size == 0 and rates.size == 0
@@ -0,0 +1,30 @@
+"""add_idempotency_key_to_expenses
+
+Revision ID: 5f1d7c2a9b34
+Revises: 2adb54e9430e
+Create Date: 2025-10-20 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f1d7c2a9b34'
+down_revision: Union[str, None] = '2adb54e9430e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('expenses', sa.Column('idempotency_key', sa.String(length=255), nullable=True))
+    op.create_unique_constraint('uq_expenses_idempotency_key', 'expenses', ['idempotency_key'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_expenses_idempotency_key', 'expenses', type_='unique')
+    op.drop_column('expenses', 'idempotency_key')
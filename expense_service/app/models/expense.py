@@ -13,4 +13,5 @@ class Expense(Base):
     user_id = Column(Integer, index=True)  # внешний ключ логически
     category_id = Column(Integer, nullable=True)
     account_id = Column(Integer, nullable=True, index=True)  # Optional account reference
-    currency = Column(String(3), nullable=False, default="USD")  # Currency code
\ No newline at end of file
+    currency = Column(String(3), nullable=False, default="USD")  # Currency code
+    idempotency_key = Column(String(255), nullable=True, unique=True)  # Key of the internal create request
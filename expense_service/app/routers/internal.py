@@ -1,7 +1,13 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from typing import Annotated, List
+from fastapi import APIRouter, Depends, Query, Header, HTTPException, status
+from typing import Annotated, List, Optional
 
-from app.schemas.expense import ExpenseCreate, ExpenseResponse
+from app.schemas.expense import (
+    ExpenseCreate,
+    ExpenseResponse,
+    ExpenseBulkCreate,
+    ExpenseBulkResult,
+    ExpenseBulkResponse
+)
 from app.services.expense import ExpenseService
 from app.dependencies import get_expense_service_internal, verify_internal_token
 from app.utils.logger import get_logger
@@ -27,6 +33,7 @@ logger = get_logger(__name__)
 async def internal_expense_create(
     expense: ExpenseCreate,
     user_id: Annotated[int, Query(description="User ID to validate ownership", gt=0)],
+    idempotency_key: Annotated[Optional[str], Header(alias="Idempotency-Key", max_length=255)] = None,
     service: ExpenseService = Depends(get_expense_service_internal),
     _: None = Depends(verify_internal_token)
 ) -> ExpenseResponse:
@@ -38,9 +45,13 @@ async def internal_expense_create(
     - Validate expense data
     - Handle internal expense creation logic
     
+    Requests repeated with the same Idempotency-Key return the expense created
+    by the first request instead of creating a duplicate.
+    
     Args:
         expense: The expense data to create
         user_id: The ID of the user who owns the expense
+        idempotency_key: Optional key identifying the create operation
         service: Injected expense service instance
         
     Returns:
@@ -51,7 +62,7 @@ async def internal_expense_create(
         HTTPException: 400 if invalid expense data
     """
     try:
-        created_expense = service.create(expense, user_id)
+        created_expense = service.create(expense, user_id, idempotency_key)
         
         logger.info(f"Internal expense created: {created_expense.id} for user {user_id}")
         
@@ -66,6 +77,64 @@ async def internal_expense_create(
         )
 
 
+def _error_message(error: Exception) -> str:
+    """Extract a readable message from service exceptions"""
+    if isinstance(error, HTTPException):
+        if isinstance(error.detail, dict):
+            return str(error.detail.get("error", error.detail))
+        return str(error.detail)
+    return str(error)
+
+
+@router.post(
+    '/bulk',
+    response_model=ExpenseBulkResponse,
+    summary="Create expenses in bulk for internal use",
+    description="Internal endpoint for other services to create many expenses in one request",
+    responses={
+        200: {"description": "Items processed; per-item outcome is reported in results"},
+        403: {"description": "Invalid internal token or unauthorized access"},
+    }
+)
+def internal_expense_bulk_create(
+    request: ExpenseBulkCreate,
+    service: ExpenseService = Depends(get_expense_service_internal),
+    _: None = Depends(verify_internal_token)
+) -> ExpenseBulkResponse:
+    """
+    Internal endpoint for other services to create expenses in bulk.
+    
+    Every item is created independently with the same validation and
+    idempotency rules as the single internal create endpoint, so a failed
+    item does not affect the others. The handler is synchronous, so FastAPI
+    runs the blocking database loop in its threadpool.
+    
+    Args:
+        request: Items to create, each with its owner and optional idempotency key
+        service: Injected expense service instance
+        
+    Returns:
+        ExpenseBulkResponse: Per-item results in request order
+    """
+    results = []
+    for index, item in enumerate(request.items):
+        try:
+            created_expense = service.create(item.expense, item.user_id, item.idempotency_key)
+            results.append(ExpenseBulkResult(index=index, id=created_expense.id))
+        except Exception as e:
+            logger.warning(f"Bulk expense item {index} for user {item.user_id} failed: {_error_message(e)}")
+            results.append(ExpenseBulkResult(index=index, error=_error_message(e)))
+
+    failed_count = sum(1 for result in results if result.error is not None)
+    logger.info(f"Internal bulk expense create: {len(results) - failed_count} created, {failed_count} failed")
+
+    return ExpenseBulkResponse(
+        results=results,
+        created_count=len(results) - failed_count,
+        failed_count=failed_count
+    )
+
+
 @router.get(
     '/expenses/account/{account_id}',
     response_model=List[ExpenseResponse],
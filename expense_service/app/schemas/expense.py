@@ -89,6 +89,32 @@ class ExpenseCreate(ExpenseBase):
         }
     )
 
+class ExpenseBulkItem(BaseModel):
+    """Single expense of a bulk internal create request"""
+    user_id: int = Field(gt=0, description="ID of the user who owns the expense")
+    idempotency_key: Optional[str] = Field(
+        None,
+        max_length=255,
+        description="Key identifying the create operation; repeated keys return the existing expense"
+    )
+    expense: ExpenseCreate
+
+class ExpenseBulkCreate(BaseModel):
+    """Schema for creating expenses of many users in one internal request"""
+    items: List[ExpenseBulkItem] = Field(min_length=1, max_length=1000)
+
+class ExpenseBulkResult(BaseModel):
+    """Outcome of a single bulk item, in request order"""
+    index: int = Field(description="Position of the item in the request")
+    id: Optional[int] = Field(None, description="Created (or previously created) expense ID")
+    error: Optional[str] = Field(None, description="Error message if the item failed")
+
+class ExpenseBulkResponse(BaseModel):
+    """Response schema for bulk internal expense creation"""
+    results: List[ExpenseBulkResult]
+    created_count: int
+    failed_count: int
+
 class ExpenseUpdate(BaseModel):
     """Schema for updating an existing expense"""
     amount: Optional[float] = Field(
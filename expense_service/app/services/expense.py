@@ -118,8 +118,22 @@ class ExpenseService:
                 {"original_error": str(e)}
             )
 
-    def create(self, data: ExpenseCreate, user_id: int) -> Expense:
+    def get_by_idempotency_key(self, idempotency_key: str, user_id: int) -> Optional[Expense]:
+        """Get expense previously created with the given idempotency key"""
+        expense = self.db.query(Expense).filter(
+            Expense.idempotency_key == idempotency_key,
+            Expense.user_id == user_id
+        ).first()
+        return expense
+
+    def create(self, data: ExpenseCreate, user_id: int, idempotency_key: Optional[str] = None) -> Expense:
         """Create a new expense with proper validation and transaction management"""
+        if idempotency_key:
+            existing = self.get_by_idempotency_key(idempotency_key, user_id)
+            if existing:
+                self.logger.info(f"Expense {existing.id} already created for idempotency key {idempotency_key}")
+                return existing
+
         try:
             # Validate amount
             validated_amount = self._validate_amount(data.amount)
@@ -138,11 +152,9 @@ class ExpenseService:
             else:
                 self.logger.info("Skipping category validation - category_id is None, 0, or invalid")
             
-            # Validate account if provided and update balance
+            # Validate account if provided (balance is updated once the expense row is inserted)
             if data.account_id is not None:
                 self._validate_account(data.account_id, user_id)
-                # Deduct amount from account balance with currency conversion
-                self.account_client.update_account_balance(data.account_id, user_id, -validated_amount, data.currency)
             
             # Log currency value for debugging
             self.logger.info(f"Currency value: {data.currency} (type: {type(data.currency)})")
@@ -154,23 +166,44 @@ class ExpenseService:
                 account_id=data.account_id,
                 currency=data.currency or "USD",  # Default to USD if None
                 date=validated_date,
-                user_id=user_id
+                user_id=user_id,
+                idempotency_key=idempotency_key
             )
 
+            # Insert first: the unique idempotency key is claimed before any balance change
             try:
-                with self.db.begin():
-                    self.db.add(expense)
-                log_operation(self.logger, "Expense created", user_id, f"ID: {expense.id}, Amount: {validated_amount}, Category: {data.category_id}, Account: {data.account_id}, Date: {validated_date}")
-                self.db.refresh(expense)
-                return expense
+                self.db.add(expense)
+                self.db.flush()
+            except IntegrityError:
+                self.db.rollback()
+                # Concurrent request with the same idempotency key won the insert
+                existing = self.get_by_idempotency_key(idempotency_key, user_id) if idempotency_key else None
+                if existing:
+                    self.logger.info(f"Expense {existing.id} already created for idempotency key {idempotency_key}")
+                    return existing
+                raise
+
+            # Deduct amount from account balance with currency conversion
+            if data.account_id is not None:
+                self.account_client.update_account_balance(data.account_id, user_id, -validated_amount, data.currency)
+
+            try:
+                self.db.commit()
             except Exception as e:
                 self.db.rollback()
                 self.logger.error(f"Database error during expense creation: {e}")
+                if data.account_id is not None:
+                    # The expense was not stored, so give the deducted amount back
+                    self.account_client.update_account_balance(data.account_id, user_id, validated_amount, data.currency)
                 raise ExpenseValidationError(
                     "Failed to create expense",
                     ErrorCode.EXPENSE_CREATION_FAILED,
                     {"original_error": str(e)}
                 )
+
+            log_operation(self.logger, "Expense created", user_id, f"ID: {expense.id}, Amount: {validated_amount}, Category: {data.category_id}, Account: {data.account_id}, Date: {validated_date}")
+            self.db.refresh(expense)
+            return expense
             
             
         except (ExpenseValidationError, ExpenseAmountError, ExpenseDateError, 
@@ -287,6 +320,9 @@ class ExpenseService:
                 expense.currency = data.currency
                 changes.append(f"Currency: {old_currency} -> {data.currency}")
             
+            # Write the row before touching balances, so database errors leave them unchanged
+            self.db.flush()
+
             # Handle account balance updates
             self._handle_balance_updates(expense, old_amount, old_account_id, user_id)
             
@@ -0,0 +1,112 @@
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from random import randint
+from datetime import date
+from starlette import status
+
+from app.config import settings
+from app.services.expense import ExpenseService
+
+
+class TestInternalCreateExpense:
+
+    def test_repeated_idempotency_key_returns_same_expense(self, client: TestClient):
+        user_id = randint(1000, 2000)
+        category_id = 456
+        payload = {
+            "amount": 15.25,
+            "date": str(date.today()),
+            "category_id": category_id
+        }
+        headers = {
+            "X-Internal-Token": "test-internal-token",
+            "Idempotency-Key": f"recurring:{user_id}:{date.today()}"
+        }
+
+        with patch.object(settings, "INTERNAL_SECRET_TOKEN", "test-internal-token"), \
+             patch("app.clients.category_service_client.CategoryServiceClient.validate_category") as mock_validate:
+
+            mock_validate.return_value = {"user_id": user_id, "category_id": category_id}
+
+            first = client.post(f"/internal/?user_id={user_id}", json=payload, headers=headers)
+            second = client.post(f"/internal/?user_id={user_id}", json=payload, headers=headers)
+
+        assert first.status_code == status.HTTP_200_OK
+        assert second.status_code == status.HTTP_200_OK
+        assert second.json()["id"] == first.json()["id"]
+        assert mock_validate.call_count == 1
+
+    def test_balance_is_updated_once_when_concurrent_request_loses_insert(self, client: TestClient):
+        user_id = randint(2000, 3000)
+        account_id = 77
+        payload = {"amount": 30.0, "date": str(date.today()), "account_id": account_id}
+        headers = {
+            "X-Internal-Token": "test-internal-token",
+            "Idempotency-Key": f"recurring-race:{user_id}:{date.today()}"
+        }
+        real_lookup = ExpenseService.get_by_idempotency_key
+        lookups = []
+
+        def lookup_missing_first(service, key, owner_id):
+            # The second request does not see the first expense on its pre-check, as in a race
+            lookups.append(key)
+            return None if len(lookups) == 2 else real_lookup(service, key, owner_id)
+
+        with patch.object(settings, "INTERNAL_SECRET_TOKEN", "test-internal-token"), \
+             patch("app.clients.account_service_client.AccountServiceClient.validate_account") as mock_account, \
+             patch("app.clients.account_service_client.AccountServiceClient.update_account_balance") as mock_balance, \
+             patch.object(ExpenseService, "get_by_idempotency_key", lookup_missing_first):
+
+            mock_account.return_value = {"id": account_id, "user_id": user_id}
+            first = client.post(f"/internal/?user_id={user_id}", json=payload, headers=headers)
+            second = client.post(f"/internal/?user_id={user_id}", json=payload, headers=headers)
+
+        assert first.status_code == status.HTTP_200_OK
+        assert second.status_code == status.HTTP_200_OK
+        assert second.json()["id"] == first.json()["id"]
+        assert mock_balance.call_count == 1
+        assert mock_balance.call_args.args[:2] == (account_id, user_id)
+
+    def test_different_idempotency_keys_create_separate_expenses(self, client: TestClient):
+        user_id = randint(1000, 2000)
+        payload = {"amount": 20.0, "date": str(date.today())}
+
+        with patch.object(settings, "INTERNAL_SECRET_TOKEN", "test-internal-token"):
+            first = client.post(
+                f"/internal/?user_id={user_id}",
+                json=payload,
+                headers={"X-Internal-Token": "test-internal-token", "Idempotency-Key": f"key-a-{user_id}"}
+            )
+            second = client.post(
+                f"/internal/?user_id={user_id}",
+                json=payload,
+                headers={"X-Internal-Token": "test-internal-token", "Idempotency-Key": f"key-b-{user_id}"}
+            )
+
+        assert first.status_code == status.HTTP_200_OK
+        assert second.status_code == status.HTTP_200_OK
+        assert second.json()["id"] != first.json()["id"]
+
+    def test_bulk_create_reports_results_per_item(self, client: TestClient):
+        user_id = randint(1000, 2000)
+        future_date = date.today().replace(year=date.today().year + 1)
+        payload = {
+            "items": [
+                {"user_id": user_id, "idempotency_key": f"bulk-a-{user_id}", "expense": {"amount": 10.0, "date": str(date.today())}},
+                {"user_id": user_id, "idempotency_key": f"bulk-b-{user_id}", "expense": {"amount": 11.0, "date": str(future_date)}},
+                {"user_id": user_id + 1, "expense": {"amount": 12.0, "date": str(date.today())}},
+            ]
+        }
+
+        with patch.object(settings, "INTERNAL_SECRET_TOKEN", "test-internal-token"):
+            response = client.post("/internal/bulk", json=payload, headers={"X-Internal-Token": "test-internal-token"})
+            repeated = client.post("/internal/bulk", json={"items": payload["items"][:1]}, headers={"X-Internal-Token": "test-internal-token"})
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["created_count"] == 2
+        assert data["failed_count"] == 1
+        assert [result["index"] for result in data["results"]] == [0, 1, 2]
+        assert data["results"][1]["id"] is None
+        assert data["results"][1]["error"]
+        assert repeated.json()["results"][0]["id"] == data["results"][0]["id"]
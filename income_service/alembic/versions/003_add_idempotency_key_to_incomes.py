@@ -0,0 +1,30 @@
+"""add_idempotency_key_to_incomes
+
+Revision ID: 003_add_idempotency_key_to_incomes
+Revises: 002_add_currency_to_incomes
+Create Date: 2025-10-20 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_add_idempotency_key_to_incomes'
+down_revision: Union[str, None] = '002_add_currency_to_incomes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('incomes', sa.Column('idempotency_key', sa.String(length=255), nullable=True))
+    op.create_unique_constraint('uq_incomes_idempotency_key', 'incomes', ['idempotency_key'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_incomes_idempotency_key', 'incomes', type_='unique')
+    op.drop_column('incomes', 'idempotency_key')
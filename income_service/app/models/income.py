@@ -15,6 +15,7 @@ class Income(Base):
     currency = Column(String(3), nullable=False, default="USD")  # Currency code
     description = Column(Text, nullable=True)
     date = Column(DateTime, nullable=False, default=func.now())
+    idempotency_key = Column(String(255), nullable=True, unique=True)  # Key of the internal create request
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
@@ -1,17 +1,18 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from typing import Annotated, List
+from fastapi import APIRouter, Depends, Query, Header, HTTPException, Request, status
+from typing import Annotated, List, Optional
 
-from app.schemas.income import IncomeCreate, IncomeOut
+from app.schemas.income import IncomeCreate, IncomeOut, IncomeBulkCreate, IncomeBulkResult, IncomeBulkResponse
 from app.services.income import IncomeService
 from app.dependencies import get_income_service
 from app.utils.logger import get_logger
 from app.models.income import Income
+from app.config import settings
 
 # Create a separate router for internal endpoints
 router = APIRouter(prefix="/internal", tags=["Internal"])
 logger = get_logger(__name__)
 
-def verify_internal_token(request) -> None:
+def verify_internal_token(request: Request) -> None:
     """Verify internal service token for inter-service communication"""
     token = request.headers.get("X-Internal-Token")
     if not token:
@@ -21,15 +22,100 @@ def verify_internal_token(request) -> None:
             detail="Internal token required"
         )
     
-    # In a real implementation, you would validate the token
-    # For now, we'll just check if it exists
-    if token != "my-secret-token":
+    if token != settings.INTERNAL_SECRET_TOKEN:
         logger.warning("Invalid internal token")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Unauthorized internal access"
         )
 
+@router.post(
+    '/incomes',
+    response_model=IncomeOut,
+    summary="Create income for internal use",
+    description="Internal endpoint for other services to create incomes on behalf of users",
+    responses={
+        200: {"description": "Income created (or already created with the same idempotency key)"},
+        403: {"description": "Invalid internal token"},
+        400: {"description": "Invalid income data"},
+    }
+)
+async def internal_income_create(
+    income: IncomeCreate,
+    user_id: Annotated[int, Query(description="User ID who owns the income", gt=0)],
+    idempotency_key: Annotated[Optional[str], Header(alias="Idempotency-Key", max_length=255)] = None,
+    service: IncomeService = Depends(get_income_service),
+    _: None = Depends(verify_internal_token)
+) -> IncomeOut:
+    """
+    Internal endpoint for other services to create incomes.
+    
+    Requests repeated with the same Idempotency-Key return the income created
+    by the first request instead of creating a duplicate.
+    
+    Args:
+        income: The income data to create
+        user_id: The ID of the user who owns the income
+        idempotency_key: Optional key identifying the create operation
+        service: Injected income service instance
+        
+    Returns:
+        IncomeOut: The created income details
+    """
+    created_income = await service.create(income, user_id, idempotency_key)
+    logger.info(f"Internal income created: {created_income.id} for user {user_id}")
+    return created_income
+
+
+@router.post(
+    '/incomes/bulk',
+    response_model=IncomeBulkResponse,
+    summary="Create incomes in bulk for internal use",
+    description="Internal endpoint for other services to create many incomes in one request",
+    responses={
+        200: {"description": "Items processed; per-item outcome is reported in results"},
+        403: {"description": "Invalid internal token"},
+    }
+)
+async def internal_income_bulk_create(
+    request: IncomeBulkCreate,
+    service: IncomeService = Depends(get_income_service),
+    _: None = Depends(verify_internal_token)
+) -> IncomeBulkResponse:
+    """
+    Internal endpoint for other services to create incomes in bulk.
+    
+    Every item is created independently with the same validation and
+    idempotency rules as the single internal create endpoint. The service
+    runs its database calls in the threadpool, so the loop over items does
+    not block the event loop.
+    
+    Args:
+        request: Items to create, each with its owner and optional idempotency key
+        service: Injected income service instance
+        
+    Returns:
+        IncomeBulkResponse: Per-item results in request order
+    """
+    results = []
+    for index, item in enumerate(request.items):
+        try:
+            created_income = await service.create(item.income, item.user_id, item.idempotency_key)
+            results.append(IncomeBulkResult(index=index, id=created_income.id))
+        except Exception as e:
+            logger.warning(f"Bulk income item {index} for user {item.user_id} failed: {e}")
+            results.append(IncomeBulkResult(index=index, error=str(e)))
+
+    failed_count = sum(1 for result in results if result.error is not None)
+    logger.info(f"Internal bulk income create: {len(results) - failed_count} created, {failed_count} failed")
+
+    return IncomeBulkResponse(
+        results=results,
+        created_count=len(results) - failed_count,
+        failed_count=failed_count
+    )
+
+
 @router.get(
     '/incomes/account/{account_id}',
     response_model=List[IncomeOut],
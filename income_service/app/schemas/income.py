@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime, date
 
 class IncomeBase(BaseModel):
@@ -14,6 +14,28 @@ class IncomeCreate(IncomeBase):
     """Schema for creating a new income"""
     pass
 
+class IncomeBulkItem(BaseModel):
+    """Single income of a bulk internal create request"""
+    user_id: int = Field(..., gt=0, description="ID of the user who owns the income")
+    idempotency_key: Optional[str] = Field(None, max_length=255, description="Key identifying the create operation")
+    income: IncomeCreate
+
+class IncomeBulkCreate(BaseModel):
+    """Schema for creating incomes of many users in one internal request"""
+    items: List[IncomeBulkItem] = Field(..., min_length=1, max_length=1000)
+
+class IncomeBulkResult(BaseModel):
+    """Outcome of a single bulk item, in request order"""
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class IncomeBulkResponse(BaseModel):
+    """Response schema for bulk internal income creation"""
+    results: List[IncomeBulkResult]
+    created_count: int
+    failed_count: int
+
 class IncomeUpdate(BaseModel):
     """Schema for updating an existing income"""
     amount: Optional[float] = Field(None, gt=0, description="New income amount")
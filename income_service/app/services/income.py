@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func, desc
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from datetime import datetime, date
+from starlette.concurrency import run_in_threadpool
 from app.models.income import Income
 from app.schemas.income import IncomeCreate, IncomeUpdate, IncomeOut, IncomeSummary, IncomeStats
 from app.exceptions import (
@@ -62,8 +64,31 @@ class IncomeService:
             logger.error(f"Failed to handle balance updates: {e}")
             raise IncomeValidationError("Failed to update account balances")
     
-    async def create(self, income: IncomeCreate, user_id: int) -> IncomeOut:
-        """Create a new income"""
+    def get_by_idempotency_key(self, idempotency_key: str, user_id: int) -> Optional[IncomeOut]:
+        """Get income previously created with the given idempotency key"""
+        income = self.db.query(Income).filter(
+            and_(Income.idempotency_key == idempotency_key, Income.user_id == user_id)
+        ).first()
+        return IncomeOut.model_validate(income) if income else None
+
+    def _insert(self, db_income: Income) -> None:
+        """Add and flush a new income row (blocking)"""
+        self.db.add(db_income)
+        self.db.flush()
+
+    async def create(self, income: IncomeCreate, user_id: int, idempotency_key: Optional[str] = None) -> IncomeOut:
+        """
+        Create a new income (a repeated idempotency key returns the existing income).
+
+        Database calls run in the threadpool so that bulk creation does not
+        block the event loop between the awaited service calls.
+        """
+        if idempotency_key:
+            existing = await run_in_threadpool(self.get_by_idempotency_key, idempotency_key, user_id)
+            if existing:
+                logger.info(f"Income {existing.id} already created for idempotency key {idempotency_key}")
+                return existing
+
         try:
             # Validate amount
             if income.amount <= 0:
@@ -89,11 +114,9 @@ class IncomeService:
             if income.category_id:
                 await self._validate_category(income.category_id, user_id)
             
-            # Validate account if provided and update balance
+            # Validate account if provided (balance is updated once the income row is inserted)
             if income.account_id is not None:
                 await self._validate_account(income.account_id, user_id)
-                # Add amount to account balance with currency conversion
-                await self.account_client.update_account_balance(income.account_id, user_id, income.amount, income.currency)
             
             # Create income
             income_date = datetime.now()
@@ -110,18 +133,39 @@ class IncomeService:
                 account_id=income.account_id,
                 currency=income.currency,
                 description=income.description,
-                date=income_date
+                date=income_date,
+                idempotency_key=idempotency_key
             )
             
-            self.db.add(db_income)
-            self.db.commit()
-            self.db.refresh(db_income)
+            # Insert first: the unique idempotency key is claimed before any balance change
+            await run_in_threadpool(self._insert, db_income)
+
+            # Add amount to account balance with currency conversion
+            if income.account_id is not None:
+                await self.account_client.update_account_balance(income.account_id, user_id, income.amount, income.currency)
+
+            try:
+                await run_in_threadpool(self.db.commit)
+            except Exception:
+                if income.account_id is not None:
+                    # The income was not stored, so take the added amount back
+                    await self.account_client.update_account_balance(income.account_id, user_id, -income.amount, income.currency)
+                raise
+            await run_in_threadpool(self.db.refresh, db_income)
             
             logger.info(f"Created income {db_income.id} for user {user_id}")
             return IncomeOut.model_validate(db_income)
             
+        except IntegrityError as e:
+            await run_in_threadpool(self.db.rollback)
+            # Concurrent request with the same idempotency key won the insert
+            existing = await run_in_threadpool(self.get_by_idempotency_key, idempotency_key, user_id) if idempotency_key else None
+            if existing:
+                return existing
+            logger.error(f"Error creating income: {e}")
+            raise IncomeValidationError("Failed to create income")
         except Exception as e:
-            self.db.rollback()
+            await run_in_threadpool(self.db.rollback)
             if isinstance(e, (IncomeAmountError, IncomeDateError, IncomeDescriptionError, IncomeValidationError)):
                 raise
             logger.error(f"Error creating income: {e}")
@@ -198,10 +242,13 @@ class IncomeService:
             if income_update.currency is not None:
                 db_income.currency = income_update.currency
             
+            # Write the row before touching balances, so database errors leave them unchanged
+            db_income.updated_at = datetime.now()
+            self.db.flush()
+
             # Handle account balance updates
             await self._handle_balance_updates(db_income, old_amount, old_account_id, user_id)
             
-            db_income.updated_at = datetime.now()
             self.db.commit()
             self.db.refresh(db_income)
             
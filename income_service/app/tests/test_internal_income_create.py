@@ -0,0 +1,69 @@
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, patch
+from random import randint
+from datetime import date
+from starlette import status
+
+from app.config import settings
+from app.services.income import IncomeService
+
+HEADERS = {"X-Internal-Token": "test-internal-token"}
+
+
+class TestInternalCreateIncome:
+
+    def test_repeated_idempotency_key_returns_same_income(self, client: TestClient):
+        user_id = randint(1000, 2000)
+        payload = {"amount": 100.0, "date": str(date.today())}
+        headers = {**HEADERS, "Idempotency-Key": f"recurring:{user_id}:{date.today()}"}
+
+        with patch.object(settings, "INTERNAL_SECRET_TOKEN", "test-internal-token"):
+            first = client.post(f"/internal/incomes?user_id={user_id}", json=payload, headers=headers)
+            second = client.post(f"/internal/incomes?user_id={user_id}", json=payload, headers=headers)
+
+        assert first.status_code == status.HTTP_200_OK
+        assert second.status_code == status.HTTP_200_OK
+        assert second.json()["id"] == first.json()["id"]
+
+    def test_balance_is_updated_once_when_concurrent_request_loses_insert(self, client: TestClient):
+        user_id = randint(2000, 3000)
+        account_id = 55
+        payload = {"amount": 40.0, "date": str(date.today()), "account_id": account_id}
+        headers = {**HEADERS, "Idempotency-Key": f"recurring-race:{user_id}:{date.today()}"}
+        real_lookup = IncomeService.get_by_idempotency_key
+        lookups = []
+
+        def lookup_missing_first(service, key, owner_id):
+            # The second request does not see the first income on its pre-check, as in a race
+            lookups.append(key)
+            return None if len(lookups) == 2 else real_lookup(service, key, owner_id)
+
+        with patch.object(settings, "INTERNAL_SECRET_TOKEN", "test-internal-token"), \
+             patch("app.clients.account_service_client.AccountServiceClient.validate_account", new_callable=AsyncMock) as mock_account, \
+             patch("app.clients.account_service_client.AccountServiceClient.update_account_balance", new_callable=AsyncMock) as mock_balance, \
+             patch.object(IncomeService, "get_by_idempotency_key", lookup_missing_first):
+
+            mock_account.return_value = {"id": account_id, "user_id": user_id}
+            first = client.post(f"/internal/incomes?user_id={user_id}", json=payload, headers=headers)
+            second = client.post(f"/internal/incomes?user_id={user_id}", json=payload, headers=headers)
+
+        assert first.status_code == status.HTTP_200_OK
+        assert second.status_code == status.HTTP_200_OK
+        assert second.json()["id"] == first.json()["id"]
+        assert mock_balance.await_count == 1
+        assert mock_balance.await_args.args[:3] == (account_id, user_id, 40.0)
+
+    def test_balance_is_reverted_when_commit_fails(self, client: TestClient):
+        user_id = randint(3000, 4000)
+        account_id = 56
+        payload = {"amount": 25.0, "date": str(date.today()), "account_id": account_id}
+
+        with patch.object(settings, "INTERNAL_SECRET_TOKEN", "test-internal-token"), \
+             patch("app.clients.account_service_client.AccountServiceClient.validate_account", new_callable=AsyncMock), \
+             patch("app.clients.account_service_client.AccountServiceClient.update_account_balance", new_callable=AsyncMock) as mock_balance, \
+             patch("sqlalchemy.orm.Session.commit", side_effect=RuntimeError("database went away")):
+
+            response = client.post(f"/internal/incomes?user_id={user_id}", json=payload, headers=HEADERS)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert [call.args[2] for call in mock_balance.await_args_list] == [25.0, -25.0]
@@ -18,6 +18,27 @@ class Settings(BaseSettings):
     max_file_size: int = 10 * 1024 * 1024  # 10MB
     allowed_file_types: List[str] = ["application/pdf"]
     upload_directory: str = "uploads"
+    upload_chunk_size: int = 1024 * 1024  # 1MB
+    upload_form_overhead: int = 64 * 1024  # multipart boundaries and form fields on top of max_file_size
+
+    # Parsing Configuration
+    parse_timeout: int = 30
+    parser_workers: int = 2
+    parser_max_pending_jobs: int = 8
+    parser_min_pages_per_task: int = 8
+    parser_stream_pages_per_task: int = 2
+    bank_detection_min_score: int = 3
+
+    # Background Job Configuration
+    job_database_path: str = "uploads/pdf_jobs.db"
+    job_workers: int = 2
+    job_max_queued: int = 100
+    job_retention_hours: int = 24
+
+    # Parse Result Cache Configuration
+    result_cache_enabled: bool = True
+    result_cache_directory: str = "uploads/result_cache"
+    result_cache_max_bytes: int = 256 * 1024 * 1024  # 256MB
     
     # Logging Configuration
     log_level: str = "INFO"
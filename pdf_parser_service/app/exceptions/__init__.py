@@ -1,6 +1,7 @@
 from .pdf_parsing_exceptions import (
     PDFParsingError,
     UnsupportedBankError,
+    BankDetectionError,
     FileProcessingError,
     InvalidPDFError,
     ParsingTimeoutError
@@ -9,6 +10,7 @@ from .pdf_parsing_exceptions import (
 __all__ = [
     "PDFParsingError",
     "UnsupportedBankError", 
+    "BankDetectionError",
     "FileProcessingError",
     "InvalidPDFError",
     "ParsingTimeoutError"
@@ -16,6 +16,13 @@ class UnsupportedBankError(PDFParsingError):
         message = f"Bank type '{bank_type}' is not supported. Supported banks: {', '.join(supported_banks)}"
         super().__init__(message, {"bank_type": bank_type, "supported_banks": supported_banks})
 
+class BankDetectionError(PDFParsingError):
+    """Exception raised when the bank cannot be detected from the PDF"""
+    def __init__(self, supported_banks: list):
+        self.supported_banks = supported_banks
+        message = f"Could not detect the bank of this statement. Specify bank_type, one of: {', '.join(supported_banks)}"
+        super().__init__(message, {"supported_banks": supported_banks})
+
 class FileProcessingError(PDFParsingError):
     """Exception raised when file processing fails"""
     def __init__(self, message: str, file_name: Optional[str] = None):
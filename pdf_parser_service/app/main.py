@@ -16,6 +16,9 @@ from app.exceptions import (
     FileProcessingError
 )
 from app.config import settings
+from app.middleware import UploadSizeLimitMiddleware
+from app.services.worker_pool import pdf_worker_pool
+from app.services.job_queue import pdf_job_queue
 from app.utils.logger import get_logger
 import time
 import uuid
@@ -108,6 +111,11 @@ app.add_exception_handler(HTTPException, http_exception_handler)
 
 # Add middleware
 app.add_middleware(RequestLoggingMiddleware)
+# Reject oversized uploads before Starlette spools the multipart body
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_body_size=settings.max_file_size + settings.upload_form_overhead
+)
 
 # Include routers
 app.include_router(pdf_parser.router)
@@ -135,8 +143,11 @@ async def root():
 async def startup_event():
     """Application startup event"""
     logger.info("PDF Parser Service starting up...")
+    await pdf_job_queue.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown event"""
     logger.info("PDF Parser Service shutting down...")
+    await pdf_job_queue.stop()
+    pdf_worker_pool.shutdown()
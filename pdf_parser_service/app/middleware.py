@@ -0,0 +1,57 @@
+from fastapi import HTTPException
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.exception_handlers import http_exception_handler
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject request bodies larger than max_body_size before they are parsed.
+
+    Starlette spools a whole multipart body to a temporary file before the router
+    sees the upload, so the limit has to be enforced on the raw body: a request
+    declaring a larger Content-Length is answered with 413 without reading it, and
+    a body without Content-Length fails with 413 as soon as it crosses the limit.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    def _too_large(self) -> HTTPException:
+        return HTTPException(
+            status_code=413,
+            detail=f"Request body exceeds maximum allowed size of {self.max_body_size} bytes"
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_size:
+            logger.warning(f"Rejected {request.url.path}: Content-Length {content_length} exceeds {self.max_body_size}")
+            response = await http_exception_handler(request, self._too_large())
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    logger.warning(f"Rejected {request.url.path}: body exceeds {self.max_body_size} bytes")
+                    # Raised inside body parsing, so the app's HTTPException handler answers it
+                    raise self._too_large()
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -46,6 +46,32 @@ class PDFParseResponse(BaseModel):
     failed_parses: int = Field(..., description="Number of failed parses")
     parsing_metadata: Optional[dict] = Field(default_factory=dict, description="Additional parsing metadata")
     
+class PDFJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class PDFJobCreateResponse(BaseModel):
+    """Schema for a queued PDF parsing job"""
+    job_id: str = Field(..., description="Job identifier for status polling")
+    status: PDFJobStatus = Field(..., description="Job status")
+
+class PDFJobResponse(BaseModel):
+    """Schema for PDF parsing job status"""
+    job_id: str = Field(..., description="Job identifier")
+    status: PDFJobStatus = Field(..., description="Job status")
+    file_name: Optional[str] = Field(None, description="Uploaded file name")
+    progress: float = Field(..., ge=0.0, le=1.0, description="Share of pages processed")
+    pages_processed: int = Field(..., description="Number of pages processed")
+    total_pages: Optional[int] = Field(None, description="Total number of pages, once known")
+    transactions_found: int = Field(..., description="Transactions parsed so far")
+    error: Optional[str] = Field(None, description="Error message for failed jobs")
+    result: Optional[PDFParseResponse] = Field(None, description="Parse result for completed jobs")
+    created_at: datetime = Field(..., description="When the job was queued")
+    started_at: Optional[datetime] = Field(None, description="When processing started")
+    finished_at: Optional[datetime] = Field(None, description="When processing finished")
+
 class TransactionValidation(BaseModel):
     """Schema for transaction validation/editing"""
     transaction_id: str = Field(..., description="Unique identifier for the transaction")
@@ -1,11 +1,22 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Depends
-from typing import Optional
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Optional, Tuple
+import hashlib
+import json
 import os
 import uuid
 from app.models.transaction import (
     PDFParseResponse,
+    PDFJobCreateResponse,
+    PDFJobResponse,
+    PDFJobStatus,
+    BankType,
 )
+from app.exceptions import PDFParsingError
 from app.services.pdf_parser import PDFParserService
+from app.services.parsers import parser_registry
+from app.services.job_queue import pdf_job_queue, JobQueueFullError
 from app.config import settings
 from app.utils.logger import get_logger
 from app.config.bank_headers import BANK_HEADERS 
@@ -16,6 +27,70 @@ router = APIRouter(prefix="/pdf", tags=["pdf-parser"])
 # Initialize services
 pdf_parser_service = PDFParserService()
 
+def _validate_upload(file: UploadFile) -> None:
+    """Validate uploaded file type and size"""
+    # Validate file type
+    if file.content_type != "application/pdf":
+        logger.warning(f"Invalid file type: {file.content_type}")
+        raise HTTPException(
+            status_code=400,
+            detail="Only PDF files are supported"
+        )
+
+    # Validate declared file size (the actual size is checked while saving)
+    if file.size is not None and file.size > settings.max_file_size:
+        raise _file_too_large()
+
+
+def _file_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail=f"File size exceeds maximum allowed size of {settings.max_file_size} bytes"
+    )
+
+
+async def _save_upload(file: UploadFile) -> Tuple[str, str]:
+    """
+    Save uploaded file to the upload directory and return its path and SHA-256 hash.
+
+    The upload is copied in chunks of upload_chunk_size, so memory use does not grow with
+    file size; the size limit is enforced on the bytes actually received.
+    """
+    # Create upload directory if it doesn't exist
+    os.makedirs(settings.upload_directory, exist_ok=True)
+
+    # Generate unique filename
+    file_id = str(uuid.uuid4())
+    file_extension = os.path.splitext(file.filename)[1] if file.filename else ".pdf"
+    temp_file_path = os.path.join(settings.upload_directory, f"{file_id}{file_extension}")
+
+    # Save uploaded file temporarily
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(temp_file_path, "wb") as buffer:
+            while chunk := await file.read(settings.upload_chunk_size):
+                size += len(chunk)
+                if size > settings.max_file_size:
+                    logger.warning(f"Upload {file.filename} exceeds {settings.max_file_size} bytes")
+                    raise _file_too_large()
+                digest.update(chunk)
+                await run_in_threadpool(buffer.write, chunk)
+    except Exception:
+        _remove_upload(temp_file_path)
+        raise
+
+    logger.info(f"Processing PDF file: {file.filename} (ID: {file_id})")
+    return temp_file_path, digest.hexdigest()
+
+
+def _remove_upload(temp_file_path: str) -> None:
+    """Clean up temporary file"""
+    if os.path.exists(temp_file_path):
+        os.remove(temp_file_path)
+        logger.debug(f"Cleaned up temporary file: {temp_file_path}")
+
+
 @router.post("/parse", response_model=PDFParseResponse)
 async def parse_pdf(
     file: UploadFile = File(..., description="PDF file to parse"),
@@ -27,60 +102,120 @@ async def parse_pdf(
     """
     try:
         logger.info(f"Received file upload request: {file.filename}, size: {file.size}, type: {file.content_type}")
-        
-        # Validate file type
-        if file.content_type != "application/pdf":
-            logger.warning(f"Invalid file type: {file.content_type}")
-            raise HTTPException(
-                status_code=400,
-                detail="Only PDF files are supported"
-            )
-        
-        # Validate file size
-        if file.size > settings.max_file_size:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size exceeds maximum allowed size of {settings.max_file_size} bytes"
-            )
-        
-        # Create upload directory if it doesn't exist
-        os.makedirs(settings.upload_directory, exist_ok=True)
-        
-        # Generate unique filename
-        file_id = str(uuid.uuid4())
-        file_extension = os.path.splitext(file.filename)[1] if file.filename else ".pdf"
-        temp_file_path = os.path.join(settings.upload_directory, f"{file_id}{file_extension}")
-        
+        _validate_upload(file)
+        temp_file_path, content_hash = await _save_upload(file)
+
         try:
-            # Save uploaded file temporarily
-            with open(temp_file_path, "wb") as buffer:
-                content = await file.read()
-                buffer.write(content)
-            
-            logger.info(f"Processing PDF file: {file.filename} (ID: {file_id})")
-            
             # Parse PDF
-            from app.models.transaction import BankType
             bank_type_enum = BankType(bank_type) if bank_type else None
             
-            result = await pdf_parser_service.parse_pdf(temp_file_path, bank_type_enum)
+            result = await pdf_parser_service.parse_pdf(temp_file_path, bank_type_enum, content_hash)
             
             logger.info(f"Successfully parsed PDF: {len(result.transactions)} transactions found")
             
             return result
             
         finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
-                logger.debug(f"Cleaned up temporary file: {temp_file_path}")
+            _remove_upload(temp_file_path)
     
+    except Exception as e:
+        logger.error(f"Error processing PDF upload: {e}")
+        if isinstance(e, (HTTPException, PDFParsingError)):
+            raise
+        raise HTTPException(status_code=500, detail=f"Failed to process PDF: {str(e)}")
+
+@router.post("/parse/stream")
+async def parse_pdf_stream(
+    file: UploadFile = File(..., description="PDF file to parse"),
+    bank_type: Optional[str] = Form(None, description="Specific bank type (optional)"),
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Parse a bank PDF file and stream results as NDJSON while pages are processed.
+
+    Each line is a JSON event: {"type": "transaction", "data": {...}},
+    {"type": "progress", "pages_processed": n, "total_pages": m}, a final {"type": "summary", ...}
+    or {"type": "error", "message": ...} if parsing fails after the stream has started.
+    """
+    try:
+        logger.info(f"Received streaming upload request: {file.filename}, size: {file.size}, type: {file.content_type}")
+        _validate_upload(file)
+        temp_file_path, content_hash = await _save_upload(file)
+    except Exception as e:
+        logger.error(f"Error processing PDF upload: {e}")
+        if isinstance(e, HTTPException):
+            raise
+        raise HTTPException(status_code=500, detail=f"Failed to process PDF: {str(e)}")
+
+    try:
+        bank_type_enum = BankType(bank_type) if bank_type else None
+        events = await pdf_parser_service.stream_pdf(temp_file_path, bank_type_enum, content_hash)
+    except Exception as e:
+        _remove_upload(temp_file_path)
+        if isinstance(e, PDFParsingError):
+            raise
+        logger.error(f"Error processing PDF upload: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to process PDF: {str(e)}")
+
+    async def ndjson():
+        try:
+            async for event in events:
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        except PDFParsingError as e:
+            yield json.dumps({"type": "error", "message": e.message, "details": e.details}, ensure_ascii=False) + "\n"
+        except Exception as e:
+            logger.error(f"Error streaming PDF parse results: {e}")
+            yield json.dumps({"type": "error", "message": f"Failed to process PDF: {str(e)}"}, ensure_ascii=False) + "\n"
+        finally:
+            _remove_upload(temp_file_path)
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+@router.post("/jobs", response_model=PDFJobCreateResponse, status_code=202)
+async def create_parse_job(
+    file: UploadFile = File(..., description="PDF file to parse"),
+    bank_type: Optional[str] = Form(None, description="Specific bank type (optional)"),
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Queue a bank PDF for background parsing; poll GET /pdf/jobs/{job_id} for progress and result
+    """
+    try:
+        logger.info(f"Received parse job upload: {file.filename}, size: {file.size}, type: {file.content_type}")
+        _validate_upload(file)
+        bank_type_enum = BankType(bank_type) if bank_type else None
+        temp_file_path, _ = await _save_upload(file)
     except Exception as e:
         logger.error(f"Error processing PDF upload: {e}")
         if isinstance(e, HTTPException):
             raise
         raise HTTPException(status_code=500, detail=f"Failed to process PDF: {str(e)}")
 
+    try:
+        pdf_parser_service.validate_request(temp_file_path, bank_type_enum)
+        job_id = await pdf_job_queue.submit(user_id, temp_file_path, file.filename, bank_type_enum)
+    except JobQueueFullError as e:
+        _remove_upload(temp_file_path)
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception:
+        _remove_upload(temp_file_path)
+        raise
+
+    return PDFJobCreateResponse(job_id=job_id, status=PDFJobStatus.QUEUED)
+
+@router.get("/jobs/{job_id}", response_model=PDFJobResponse)
+async def get_parse_job(
+    job_id: str,
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Get status, progress and (when completed) result of a PDF parsing job
+    """
+    job = await pdf_job_queue.get(job_id, user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job
+
 @router.get("/supported-banks")
 async def get_supported_banks(
     user_id: int = Depends(get_current_user_id)
@@ -88,9 +223,10 @@ async def get_supported_banks(
     """
     Get list of supported bank types
     """
+    supported_banks = parser_registry.supported_banks()
     return {
-        "supported_banks": list([bank.lower() for bank in BANK_HEADERS.keys()]),
-        "total_count": len(BANK_HEADERS)
+        "supported_banks": [bank.value for bank in supported_banks],
+        "total_count": len(supported_banks)
     }
 
 @router.get("/languages/{bank_name}")
@@ -125,5 +261,5 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "pdf-parser",
-        "supported_banks": len(BANK_HEADERS.keys())
+        "supported_banks": len(parser_registry.supported_banks())
     }
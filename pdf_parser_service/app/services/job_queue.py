@@ -0,0 +1,263 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from app.config import settings
+from app.exceptions import PDFParsingError
+from app.models.transaction import BankType, ParsedTransaction, PDFJobResponse, PDFJobStatus, PDFParseResponse
+from app.services.pdf_parser import PDFParserService
+from app.services.result_cache import hash_file
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pdf_jobs (
+    id TEXT PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    bank_type TEXT,
+    file_path TEXT NOT NULL,
+    file_name TEXT,
+    pages_processed INTEGER NOT NULL DEFAULT 0,
+    total_pages INTEGER,
+    transactions_found INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+)
+"""
+
+
+class JobQueueFullError(Exception):
+    """Raised when the job queue has no room for another job"""
+
+
+class PDFJobQueue:
+    """
+    Background PDF parsing jobs stored in a local SQLite table.
+
+    Jobs are processed by `workers` asyncio tasks; table extraction itself runs in the
+    shared PDF worker process pool. Progress is written after every page range, so
+    clients can poll status. Jobs that were queued or running when the service stopped
+    are picked up again on start. SQLite is accessed from worker threads, one statement
+    at a time, so the event loop never waits on a database write.
+    """
+
+    def __init__(self, database_path: str, workers: int, max_queued: int):
+        self.database_path = database_path
+        self.workers = workers
+        self.max_queued = max_queued
+        self._connection: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self.parser_service = PDFParserService()
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.database_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.database_path, check_same_thread=False)
+            self._connection.row_factory = sqlite3.Row
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(_SCHEMA)
+            self._connection.commit()
+        return self._connection
+
+    def _execute(self, sql: str, parameters: tuple = ()) -> sqlite3.Cursor:
+        """Run one statement and commit (blocking, call through asyncio.to_thread)"""
+        with self._db_lock:
+            cursor = self.db.execute(sql, parameters)
+            self.db.commit()
+            return cursor
+
+    def _fetch(self, sql: str, parameters: tuple = ()) -> List[sqlite3.Row]:
+        """Run a query and return all rows (blocking, call through asyncio.to_thread)"""
+        with self._db_lock:
+            return self.db.execute(sql, parameters).fetchall()
+
+    async def _fetch_one(self, sql: str, parameters: tuple = ()) -> Optional[sqlite3.Row]:
+        rows = await asyncio.to_thread(self._fetch, sql, parameters)
+        return rows[0] if rows else None
+
+    async def start(self) -> None:
+        """Start workers and requeue unfinished jobs"""
+        await self._purge_expired()
+        unfinished = await asyncio.to_thread(
+            self._fetch,
+            "SELECT id, file_path FROM pdf_jobs WHERE status IN (?, ?) ORDER BY created_at",
+            (PDFJobStatus.QUEUED.value, PDFJobStatus.RUNNING.value)
+        )
+        for row in unfinished:
+            if os.path.exists(row["file_path"]):
+                await self._update(row["id"], status=PDFJobStatus.QUEUED.value, pages_processed=0, transactions_found=0)
+                self._queue.put_nowait(row["id"])
+            else:
+                await self._fail(row["id"], "Uploaded file was lost before the job could run")
+        if unfinished:
+            logger.info(f"Requeued {self._queue.qsize()} unfinished PDF jobs")
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Stop workers; running jobs stay in the table and are resumed on next start"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        with self._db_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    async def submit(self, user_id: int, file_path: str, file_name: Optional[str], bank_type: Optional[BankType]) -> str:
+        """Register a job for an uploaded file and queue it"""
+        if self._queue.qsize() >= self.max_queued:
+            raise JobQueueFullError(f"Too many queued PDF jobs ({self.max_queued})")
+        await self._purge_expired()
+
+        job_id = str(uuid.uuid4())
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT INTO pdf_jobs (id, user_id, status, bank_type, file_path, file_name, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job_id, user_id, PDFJobStatus.QUEUED.value, bank_type.value if bank_type else None,
+             file_path, file_name, datetime.utcnow().isoformat())
+        )
+        self._queue.put_nowait(job_id)
+        logger.info(f"Queued PDF job {job_id} for user {user_id}")
+        return job_id
+
+    async def get(self, job_id: str, user_id: int) -> Optional[PDFJobResponse]:
+        """Get job status; jobs of other users are not visible"""
+        row = await self._fetch_one("SELECT * FROM pdf_jobs WHERE id = ? AND user_id = ?", (job_id, user_id))
+        if row is None:
+            return None
+
+        total_pages = row["total_pages"]
+        if row["status"] == PDFJobStatus.COMPLETED.value:
+            progress = 1.0
+        elif total_pages:
+            progress = round(row["pages_processed"] / total_pages, 4)
+        else:
+            progress = 0.0
+
+        return PDFJobResponse(
+            job_id=row["id"],
+            status=row["status"],
+            file_name=row["file_name"],
+            progress=progress,
+            pages_processed=row["pages_processed"],
+            total_pages=total_pages,
+            transactions_found=row["transactions_found"],
+            error=row["error"],
+            result=PDFParseResponse.model_validate_json(row["result"]) if row["result"] else None,
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"]
+        )
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Job store itself failed; _run_job has already dealt with parsing errors
+                logger.error(f"Unexpected error in PDF job {job_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job_id: str) -> None:
+        row = await self._fetch_one("SELECT * FROM pdf_jobs WHERE id = ?", (job_id,))
+        if row is None or row["status"] != PDFJobStatus.QUEUED.value:
+            return
+
+        await self._update(job_id, status=PDFJobStatus.RUNNING.value, started_at=datetime.utcnow().isoformat())
+        file_path = row["file_path"]
+        bank_type = BankType(row["bank_type"]) if row["bank_type"] else None
+
+        transactions: List[ParsedTransaction] = []
+        # Stays False only when the service stops mid-job: the file is kept for the requeued job
+        finished = False
+        try:
+            content_hash = await asyncio.to_thread(hash_file, file_path) if settings.result_cache_enabled else None
+            async for event in await self.parser_service.stream_pdf(file_path, bank_type, content_hash):
+                if event["type"] == "transaction":
+                    transactions.append(ParsedTransaction.model_validate(event["data"]))
+                elif event["type"] == "progress":
+                    await self._update(
+                        job_id,
+                        pages_processed=event["pages_processed"],
+                        total_pages=event["total_pages"],
+                        transactions_found=len(transactions)
+                    )
+                elif event["type"] == "summary":
+                    result = PDFParseResponse(
+                        transactions=transactions,
+                        bank_detected=event["bank_detected"],
+                        total_transactions=event["total_transactions"],
+                        successful_parses=event["successful_parses"],
+                        failed_parses=event["failed_parses"],
+                        parsing_metadata=event["parsing_metadata"]
+                    )
+                    await self._update(
+                        job_id,
+                        status=PDFJobStatus.COMPLETED.value,
+                        result=result.model_dump_json(),
+                        transactions_found=len(transactions),
+                        finished_at=datetime.utcnow().isoformat()
+                    )
+                    logger.info(f"PDF job {job_id} completed: {len(transactions)} transactions")
+                    finished = True
+            if not finished:
+                await self._fail(job_id, "Parsing ended without a result")
+                finished = True
+        except PDFParsingError as e:
+            await self._fail(job_id, e.message)
+            finished = True
+        except Exception as e:
+            logger.error(f"Unexpected error in PDF job {job_id}: {e}")
+            await self._fail(job_id, f"Failed to process PDF: {str(e)}")
+            finished = True
+        finally:
+            if finished and os.path.exists(file_path):
+                os.remove(file_path)
+
+    async def _fail(self, job_id: str, error: str) -> None:
+        logger.warning(f"PDF job {job_id} failed: {error}")
+        await self._update(job_id, status=PDFJobStatus.FAILED.value, error=error, finished_at=datetime.utcnow().isoformat())
+
+    async def _update(self, job_id: str, **fields) -> None:
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        await asyncio.to_thread(
+            self._execute, f"UPDATE pdf_jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id)
+        )
+
+    async def _purge_expired(self) -> None:
+        """Delete finished jobs older than the retention period"""
+        cutoff = (datetime.utcnow() - timedelta(hours=settings.job_retention_hours)).isoformat()
+        cursor = await asyncio.to_thread(
+            self._execute,
+            "DELETE FROM pdf_jobs WHERE status IN (?, ?) AND finished_at < ?",
+            (PDFJobStatus.COMPLETED.value, PDFJobStatus.FAILED.value, cutoff)
+        )
+        deleted = cursor.rowcount
+        if deleted:
+            logger.info(f"Purged {deleted} expired PDF jobs")
+
+
+# Shared job queue (workers are started on application startup)
+pdf_job_queue = PDFJobQueue(settings.job_database_path, settings.job_workers, settings.job_max_queued)
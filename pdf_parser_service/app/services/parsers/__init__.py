@@ -1,7 +1,10 @@
 from .base_parser import BasePDFParser
 from .monobank_parser import MonobankParser
+from .registry import ParserRegistry, parser_registry
 
 __all__ = [
     "BasePDFParser",
-    "MonobankParser"
+    "MonobankParser",
+    "ParserRegistry",
+    "parser_registry"
 ]
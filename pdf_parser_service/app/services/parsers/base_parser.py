@@ -1,22 +1,56 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import date
 from decimal import Decimal, InvalidOperation
 import re
-import pdfplumber
 from app.models.transaction import ParsedTransaction, BankType, TransactionType
-from app.config.bank_headers import get_headers_for_bank, get_patterns_for_bank
+from app.config import settings
+from app.config.bank_headers import get_all_headers_for_bank
+from app.services.worker_pool import pdf_worker_pool
 from app.utils.logger import get_logger
+from .extraction import count_pages, extract_page_tables, extract_tables, split_pages
 
 logger = get_logger(__name__)
 
 class BasePDFParser(ABC):
     """Abstract base class for PDF parsers"""
+
+    # Bump when parsing output changes, so cached results of older versions are not reused
+    version = "1"
+
+    date_pattern = re.compile(r'(\d{2}\.\d{2}\.\d{4})')
+    whitespace_pattern = re.compile(r'\s+')
+    # Lowercase first-page phrases that identify the statement issuer, with their weight.
+    # Only bank-specific text belongs here (bank or legal entity name, column titles no other
+    # bank uses); generic headers such as "amount" or "balance" would match any statement.
+    detection_markers: Dict[str, int] = {}
+
+    # Common description prefixes that don't add value, removed in this order
+    description_prefix_patterns = [
+        re.compile(r'^[A-Z]{2,}\s*\|'),  # Remove "ZMIST |" type prefixes
+        re.compile(r'^\d+\s*'),  # Remove leading numbers
+    ]
     
     def __init__(self, bank_type: BankType):
         self.bank_type = bank_type
         self.logger = get_logger(f"{__name__}.{bank_type.value}")
+        self.header_pattern = self._compile_header_pattern(get_all_headers_for_bank(bank_type.value))
+
+    @staticmethod
+    def _compile_header_pattern(headers: List[str]) -> Optional["re.Pattern[str]"]:
+        """One alternation matching any header indicator (longest first), or None without headers"""
+        if not headers:
+            return None
+        indicators = sorted(set(headers), key=len, reverse=True)
+        return re.compile("|".join(re.escape(indicator) for indicator in indicators))
     
+    def detection_score(self, first_page_text: str) -> int:
+        """How strongly first-page text looks like this bank's statement: total weight of the markers found"""
+        text = self.whitespace_pattern.sub(' ', first_page_text.lower())
+        return sum(weight for marker, weight in self.detection_markers.items() if marker in text)
+
     @abstractmethod
     async def parse_pdf(self, file_path: str) -> List[ParsedTransaction]:
         """Parse PDF file and extract transactions"""
@@ -44,13 +78,14 @@ class BasePDFParser(ABC):
         self.logger.info(f"Total transactions extracted: {len(all_transactions)}")
         return all_transactions
     
-    def _parse_date(self, date_str: str, date_format: str = r'(\d{2}\.\d{2}\.\d{4})') -> Optional[date]:
+    def _parse_date(self, date_str: str, date_format: Optional[str] = None) -> Optional[date]:
         """Parse date string to date object"""
         try:
-            if not date_str or not re.search(date_format, date_str):
+            if not date_str:
                 return None
-                
-            date_match = re.search(date_format, date_str)
+
+            pattern = self.date_pattern if date_format is None else re.compile(date_format)
+            date_match = pattern.search(date_str)
             if not date_match:
                 return None
                 
@@ -105,21 +140,71 @@ class BasePDFParser(ABC):
             
         return min(confidence, 1.0)
     
-    def _extract_tables_from_pdf(self, file_path: str) -> List[List[List[str]]]:
-        """Extract all tables from PDF file"""
-        tables = []
+    async def _extract_tables_from_pdf(self, file_path: str) -> List[List[List[str]]]:
+        """Extract all tables from PDF file, splitting page ranges across worker processes"""
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_tables = page.extract_tables()
-                    if page_tables:
-                        tables.extend(page_tables)
+            page_count = await pdf_worker_pool.run(count_pages, file_path)
+            page_ranges = split_pages(page_count, settings.parser_workers, settings.parser_min_pages_per_task)
+            if len(page_ranges) <= 1:
+                return await pdf_worker_pool.run(extract_tables, file_path)
+
+            self.logger.info(f"Extracting {page_count} pages in {len(page_ranges)} parallel ranges")
+            range_tables = await asyncio.gather(*(
+                pdf_worker_pool.run(extract_page_tables, file_path, first_page, last_page)
+                for first_page, last_page in page_ranges
+            ))
+            # gather keeps the order of the ranges, so tables stay in page order
+            return [table for tables in range_tables for table in tables]
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             self.logger.error(f"Failed to extract tables from PDF: {e}")
             raise
-            
-        return tables
     
+    async def iter_transactions(self, file_path: str) -> AsyncIterator[Tuple[List[ParsedTransaction], int, int]]:
+        """
+        Parse the PDF incrementally, yielding (transactions, pages_processed, total_pages)
+        for each small page range in page order. Only a few ranges are held in memory at a time.
+        """
+        async for pages_processed, total_pages, tables in self._iter_page_tables(file_path):
+            transaction_tables = self._find_transaction_tables(tables)
+            transactions = self._extract_transactions_from_tables(transaction_tables) if transaction_tables else []
+            yield transactions, pages_processed, total_pages
+
+    async def _iter_page_tables(self, file_path: str) -> AsyncIterator[Tuple[int, int, List[List[List[str]]]]]:
+        """Extract tables range by range, keeping up to parser_workers ranges in flight"""
+        page_count = await pdf_worker_pool.run(count_pages, file_path)
+        step = max(settings.parser_stream_pages_per_task, 1)
+        page_ranges = [
+            (first_page, min(first_page + step - 1, page_count))
+            for first_page in range(1, page_count + 1, step)
+        ]
+
+        in_flight = deque()
+        next_range = 0
+        try:
+            while next_range < len(page_ranges) or in_flight:
+                while next_range < len(page_ranges) and len(in_flight) < settings.parser_workers:
+                    first_page, last_page = page_ranges[next_range]
+                    task = asyncio.ensure_future(asyncio.wait_for(
+                        pdf_worker_pool.run(extract_page_tables, file_path, first_page, last_page),
+                        timeout=settings.parse_timeout
+                    ))
+                    in_flight.append((last_page, task))
+                    next_range += 1
+
+                last_page, task = in_flight.popleft()
+                yield last_page, page_count, await task
+        finally:
+            # Consumer stopped early (client disconnect or error): drop the remaining ranges.
+            # Cancelling a range kills its worker process; wait for the cancellations so no
+            # task outlives the generator.
+            pending = [task for _, task in in_flight]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
     def _find_transaction_tables(self, tables: List[List[List[str]]]) -> List[List[List[str]]]:
         """Find all tables containing transactions"""
         transaction_tables = []
@@ -140,16 +225,10 @@ class BasePDFParser(ABC):
         if not cell:
             return False
             
-        cell_lower = str(cell).lower()
-        
-        # Get bank-specific headers
-        bank_headers_ua = get_headers_for_bank(self.bank_type.value, "ua")
-        bank_headers_en = get_headers_for_bank(self.bank_type.value, "en")
-        
-        # Combine all headers for this bank
-        all_headers = bank_headers_ua + bank_headers_en
-        
-        return any(indicator in cell_lower for indicator in all_headers)
+        if self.header_pattern is None:
+            return False
+
+        return self.header_pattern.search(str(cell).lower()) is not None
     
     def _clean_description(self, description: str) -> str:
         """Clean and normalize transaction description"""
@@ -157,15 +236,10 @@ class BasePDFParser(ABC):
             return ""
             
         # Remove extra whitespace
-        cleaned = re.sub(r'\s+', ' ', str(description).strip())
+        cleaned = self.whitespace_pattern.sub(' ', str(description).strip())
         
         # Remove common prefixes/suffixes that don't add value
-        prefixes_to_remove = [
-            r'^[A-Z]{2,}\s*\|',  # Remove "ZMIST |" type prefixes
-            r'^\d+\s*',  # Remove leading numbers
-        ]
-        
-        for pattern in prefixes_to_remove:
-            cleaned = re.sub(pattern, '', cleaned).strip()
+        for pattern in self.description_prefix_patterns:
+            cleaned = pattern.sub('', cleaned).strip()
             
         return cleaned
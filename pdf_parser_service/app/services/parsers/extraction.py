@@ -0,0 +1,63 @@
+"""
+Table extraction functions executed in worker processes.
+
+Kept free of service state so they can be pickled and imported cheaply by the workers.
+Each call opens the file itself from the shared path, so page ranges of one statement
+can be extracted by several workers at once.
+"""
+
+from typing import List, Tuple
+
+import pdfplumber
+from pdfminer.pdftypes import resolve1
+
+
+def count_pages(file_path: str) -> int:
+    """Number of pages, read from the page tree without parsing page contents"""
+    with pdfplumber.open(file_path) as pdf:
+        try:
+            return int(resolve1(resolve1(pdf.doc.catalog["Pages"])["Count"]))
+        except (KeyError, TypeError, ValueError):
+            return len(pdf.pages)
+
+
+def extract_first_page_text(file_path: str) -> str:
+    """Text of the first page only (used for bank detection before full extraction)"""
+    with pdfplumber.open(file_path, pages=[1]) as pdf:
+        if not pdf.pages:
+            return ""
+        return pdf.pages[0].extract_text() or ""
+
+
+def extract_tables(file_path: str) -> List[List[List[str]]]:
+    """Extract all tables from a PDF file, in page order"""
+    return extract_page_tables(file_path, 1, None)
+
+
+def extract_page_tables(file_path: str, first_page: int, last_page: int = None) -> List[List[List[str]]]:
+    """Extract tables from pages first_page..last_page (1-based, inclusive; None = to the end)"""
+    pages = None if last_page is None else list(range(first_page, last_page + 1))
+    tables = []
+    with pdfplumber.open(file_path, pages=pages) as pdf:
+        for page in pdf.pages:
+            if page.page_number < first_page:
+                continue
+            page_tables = page.extract_tables()
+            if page_tables:
+                tables.extend(page_tables)
+    return tables
+
+
+def split_pages(page_count: int, workers: int, min_pages: int) -> List[Tuple[int, int]]:
+    """Split pages 1..page_count into at most `workers` contiguous ranges of at least min_pages pages"""
+    if page_count <= 0:
+        return []
+    parts = max(1, min(workers, page_count // max(min_pages, 1)))
+    size, extra = divmod(page_count, parts)
+    ranges = []
+    first_page = 1
+    for part in range(parts):
+        last_page = first_page + size - 1 + (1 if part < extra else 0)
+        ranges.append((first_page, last_page))
+        first_page = last_page + 1
+    return ranges
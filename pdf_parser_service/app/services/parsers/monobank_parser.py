@@ -5,6 +5,19 @@ from .base_parser import BasePDFParser
 
 class MonobankParser(BasePDFParser):
     """Parser for Monobank PDF statements"""
+
+    # The issuer name alone is enough; specific column titles need to appear together
+    detection_markers = {
+        "monobank": 3,
+        "universal bank": 3,
+        "універсал банк": 3,
+        "дата i час операції": 1,
+        "деталі операції": 1,
+        "сума в валюті картки (uah)": 1,
+        "сума комісій (uah)": 1,
+        "сума кешбеку/миль": 1,
+        "залишок після операції": 1,
+    }
     
     def __init__(self):
         super().__init__(BankType.MONOBANK)
@@ -12,7 +25,7 @@ class MonobankParser(BasePDFParser):
     async def parse_pdf(self, file_path: str) -> List[ParsedTransaction]:
         """Parse Monobank PDF and extract transactions"""
         try:
-            tables = self._extract_tables_from_pdf(file_path)
+            tables = await self._extract_tables_from_pdf(file_path)
             transaction_tables = self._find_transaction_tables(tables)
             
             if not transaction_tables:
@@ -0,0 +1,69 @@
+from typing import Dict, List, Optional, Type
+
+from app.exceptions import UnsupportedBankError
+from app.models.transaction import BankType
+from .base_parser import BasePDFParser
+from .monobank_parser import MonobankParser
+
+
+class ParserRegistry:
+    """
+    Parser classes by bank type.
+
+    Parsers are instantiated on first use, so a registered bank costs nothing until
+    a statement is parsed or detected with it.
+    """
+
+    def __init__(self):
+        self._parser_classes: Dict[BankType, Type[BasePDFParser]] = {}
+        self._parsers: Dict[BankType, BasePDFParser] = {}
+
+    def register(self, bank_type: BankType, parser_class: Type[BasePDFParser]) -> None:
+        self._parser_classes[bank_type] = parser_class
+        self._parsers.pop(bank_type, None)
+
+    def supported_banks(self) -> List[BankType]:
+        return list(self._parser_classes)
+
+    def is_supported(self, bank_type: BankType) -> bool:
+        return bank_type in self._parser_classes
+
+    def get(self, bank_type: BankType) -> BasePDFParser:
+        """Parser for a bank type; raises UnsupportedBankError for unregistered banks"""
+        if bank_type not in self._parser_classes:
+            raise UnsupportedBankError(bank_type.value, [bank.value for bank in self._parser_classes])
+        if bank_type not in self._parsers:
+            self._parsers[bank_type] = self._parser_classes[bank_type]()
+        return self._parsers[bank_type]
+
+    @property
+    def version(self) -> str:
+        """Combined parser versions, for results of auto-detected parses"""
+        return "+".join(f"{bank.value}.{parser_class.version}" for bank, parser_class in self._parser_classes.items())
+
+    def version_for(self, bank_type: Optional[BankType]) -> str:
+        if bank_type is None:
+            return self.version
+        return self._parser_classes[bank_type].version
+
+    def default_bank(self) -> Optional[BankType]:
+        """Bank used when detection finds nothing: the only registered parser, else Monobank"""
+        if len(self._parser_classes) == 1:
+            return next(iter(self._parser_classes))
+        if BankType.MONOBANK in self._parser_classes:
+            return BankType.MONOBANK
+        return None
+
+    def detect(self, first_page_text: str, min_score: int) -> Optional[BankType]:
+        """Bank whose parser scores highest on the first page text, or None below min_score"""
+        best_bank, best_score = None, 0
+        for bank_type in self._parser_classes:
+            score = self.get(bank_type).detection_score(first_page_text)
+            if score > best_score:
+                best_bank, best_score = bank_type, score
+        return best_bank if best_score >= min_score else None
+
+
+# Shared registry; register new bank parsers here
+parser_registry = ParserRegistry()
+parser_registry.register(BankType.MONOBANK, MonobankParser)
@@ -1,65 +1,250 @@
 import os
 import asyncio
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from app.models.transaction import (
-    ParsedTransaction, 
-    BankType, 
+    ParsedTransaction,
+    BankType,
     TransactionType,
     PDFParseResponse
 )
 from app.exceptions import (
     PDFParsingError,
     UnsupportedBankError,
+    BankDetectionError,
     FileProcessingError,
     InvalidPDFError,
     ParsingTimeoutError
 )
+from app.config import settings
 from app.utils.logger import get_logger
-from app.services.parsers import MonobankParser
+from app.services.parsers import BasePDFParser, parser_registry
+from app.services.parsers.extraction import extract_first_page_text
+from app.services.result_cache import parse_result_cache
+from app.services.worker_pool import pdf_worker_pool
 
 logger = get_logger(__name__)
 
 class PDFParserService:
     """Service for parsing bank PDFs and extracting transaction data"""
-    
+
     def __init__(self):
-        self.monobank_parser = MonobankParser()
-    
-    async def parse_pdf(self, file_path: str, bank_type: Optional[BankType] = None) -> PDFParseResponse:
-        """Parse PDF file and extract transactions (Monobank only)"""
+        self.bank_parsers = parser_registry
+
+    def validate_request(self, file_path: str, bank_type: Optional[BankType]) -> None:
+        """Validate file and bank type before parsing"""
+        # Validate file exists
+        if not os.path.exists(file_path):
+            raise FileProcessingError(f"File not found: {file_path}")
+
+        if bank_type and not self.bank_parsers.is_supported(bank_type):
+            raise UnsupportedBankError(bank_type.value, [bank.value for bank in self.bank_parsers.supported_banks()])
+
+    async def select_parser(self, file_path: str, bank_type: Optional[BankType] = None) -> Tuple[BasePDFParser, str]:
+        """
+        Parser for the requested bank, or the one detected from the first page text,
+        together with how it was chosen ("requested", "auto" or "default").
+        Detection reads a single page, before any table extraction runs. When no bank is
+        detected the default parser is used; the caller applies the timeout.
+        """
+        if bank_type:
+            return self.bank_parsers.get(bank_type), "requested"
+
+        first_page_text = await pdf_worker_pool.run(extract_first_page_text, file_path)
+        detected = self.bank_parsers.detect(first_page_text, settings.bank_detection_min_score)
+        if detected is not None:
+            logger.info(f"Detected bank {detected.value} from first page")
+            return self.bank_parsers.get(detected), "auto"
+
+        default_bank = self.bank_parsers.default_bank()
+        if default_bank is None:
+            raise BankDetectionError([bank.value for bank in self.bank_parsers.supported_banks()])
+        logger.warning(f"Could not detect bank from first page, falling back to {default_bank.value}")
+        return self.bank_parsers.get(default_bank), "default"
+
+    async def _select_and_parse(
+        self,
+        file_path: str,
+        bank_type: Optional[BankType]
+    ) -> Tuple[BasePDFParser, str, List[ParsedTransaction]]:
+        parser, bank_detection = await self.select_parser(file_path, bank_type)
+        return parser, bank_detection, await parser.parse_pdf(file_path)
+
+    async def parse_pdf(
+        self,
+        file_path: str,
+        bank_type: Optional[BankType] = None,
+        content_hash: Optional[str] = None
+    ) -> PDFParseResponse:
+        """Parse PDF file with the requested or auto-detected bank parser"""
         try:
-            # Validate file exists
-            if not os.path.exists(file_path):
-                raise FileProcessingError(f"File not found: {file_path}")
-            
-            # Only support Monobank for now
-            if bank_type and bank_type != BankType.MONOBANK:
-                raise UnsupportedBankError(bank_type.value, ["monobank"])
-            
-            # Parse PDF with timeout
+            self.validate_request(file_path, bank_type)
+
+            cache_name = self._cache_name(content_hash, bank_type)
+            cached_events = parse_result_cache.get(cache_name) if cache_name else None
+            if cached_events is not None:
+                logger.info(f"Returning cached parse result for {content_hash}")
+                return self._response_from_events(cached_events)
+
+            # Detect and parse within one timeout (a timed-out extraction has its worker process killed)
             try:
-                transactions = await asyncio.wait_for(
-                    self.monobank_parser.parse_pdf(file_path),
-                    timeout=30.0  # 30 second timeout
+                parser, bank_detection, transactions = await asyncio.wait_for(
+                    self._select_and_parse(file_path, bank_type),
+                    timeout=settings.parse_timeout
                 )
             except asyncio.TimeoutError:
-                raise ParsingTimeoutError(30)
-            
-            return PDFParseResponse(
+                raise ParsingTimeoutError(settings.parse_timeout)
+
+            response = PDFParseResponse(
                 transactions=transactions,
-                bank_detected=BankType.MONOBANK,
+                bank_detected=parser.bank_type,
                 total_transactions=len(transactions),
                 successful_parses=len(transactions),
                 failed_parses=0,
-                parsing_metadata={
-                    "file_size": os.path.getsize(file_path),
-                    "parsing_method": "monobank_parser",
-                    "confidence_threshold": 0.7
-                }
+                parsing_metadata=self._parsing_metadata(file_path, parser, bank_detection)
             )
-            
+
+            if cache_name:
+                self._store_response(cache_name, response)
+
+            return response
+
         except Exception as e:
             if isinstance(e, (PDFParsingError, UnsupportedBankError, FileProcessingError, ParsingTimeoutError)):
                 raise
             logger.error(f"Unexpected error parsing PDF: {e}")
-            raise PDFParsingError(f"Failed to parse PDF: {str(e)}")
\ No newline at end of file
+            raise PDFParsingError(f"Failed to parse PDF: {str(e)}")
+
+    async def stream_pdf(
+        self,
+        file_path: str,
+        bank_type: Optional[BankType] = None,
+        content_hash: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Validate the request and select the parser, then return an iterator of parse events:
+        "transaction" for each parsed transaction, "progress" after each page range
+        and a final "summary". Each page range must finish within parse_timeout.
+        A cached result is replayed without progress events.
+        """
+        self.validate_request(file_path, bank_type)
+
+        cache_name = self._cache_name(content_hash, bank_type)
+        cached_events = parse_result_cache.get(cache_name) if cache_name else None
+        if cached_events is not None:
+            logger.info(f"Replaying cached parse result for {content_hash}")
+            return self._replay_events(cached_events)
+
+        try:
+            parser, bank_detection = await asyncio.wait_for(
+                self.select_parser(file_path, bank_type),
+                timeout=settings.parse_timeout
+            )
+        except asyncio.TimeoutError:
+            raise ParsingTimeoutError(settings.parse_timeout)
+        except Exception as e:
+            if isinstance(e, PDFParsingError):
+                raise
+            logger.error(f"Unexpected error detecting bank: {e}")
+            raise PDFParsingError(f"Failed to parse PDF: {str(e)}")
+        return self._stream_events(file_path, parser, bank_detection, cache_name)
+
+    async def _replay_events(self, events: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        for event in events:
+            if event["type"] == "summary":
+                event = {**event, "parsing_metadata": {**event["parsing_metadata"], "cached": True}}
+            yield event
+
+    async def _stream_events(
+        self,
+        file_path: str,
+        parser: BasePDFParser,
+        bank_detection: str,
+        cache_name: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        # Transaction and summary events are written to the cache as they are produced
+        cache_writer = parse_result_cache.writer(cache_name) if cache_name else None
+        committed = False
+        total_transactions = 0
+        try:
+            try:
+                async for transactions, pages_processed, total_pages in parser.iter_transactions(file_path):
+                    for transaction in transactions:
+                        event = {"type": "transaction", "data": transaction.model_dump(mode="json")}
+                        if cache_writer:
+                            cache_writer.write(event)
+                        yield event
+                    total_transactions += len(transactions)
+                    yield {"type": "progress", "pages_processed": pages_processed, "total_pages": total_pages}
+            except asyncio.TimeoutError:
+                raise ParsingTimeoutError(settings.parse_timeout)
+            except Exception as e:
+                if isinstance(e, (PDFParsingError, UnsupportedBankError, FileProcessingError, ParsingTimeoutError)):
+                    raise
+                logger.error(f"Unexpected error streaming PDF: {e}")
+                raise PDFParsingError(f"Failed to parse PDF: {str(e)}")
+
+            summary = {
+                "type": "summary",
+                "bank_detected": parser.bank_type.value,
+                "total_transactions": total_transactions,
+                "successful_parses": total_transactions,
+                "failed_parses": 0,
+                "parsing_metadata": self._parsing_metadata(file_path, parser, bank_detection)
+            }
+            if cache_writer:
+                cache_writer.write(summary)
+                cache_writer.commit()
+                committed = True
+            yield summary
+        finally:
+            if cache_writer and not committed:
+                cache_writer.discard()
+
+    def _parsing_metadata(self, file_path: str, parser: BasePDFParser, bank_detection: str) -> Dict[str, Any]:
+        return {
+            "file_size": os.path.getsize(file_path),
+            "parsing_method": f"{parser.bank_type.value}_parser",
+            "bank_detection": bank_detection,
+            "confidence_threshold": 0.7,
+            "cached": False
+        }
+
+    def _cache_name(self, content_hash: Optional[str], bank_type: Optional[BankType]) -> Optional[str]:
+        """Cache entry for an upload, or None when caching does not apply"""
+        if not settings.result_cache_enabled or not content_hash:
+            return None
+        return parse_result_cache.entry_name(
+            content_hash,
+            bank_type.value if bank_type else None,
+            self.bank_parsers.version_for(bank_type)
+        )
+
+    def _store_response(self, cache_name: str, response: PDFParseResponse) -> None:
+        events: List[Dict[str, Any]] = [
+            {"type": "transaction", "data": transaction.model_dump(mode="json")}
+            for transaction in response.transactions
+        ]
+        events.append({
+            "type": "summary",
+            "bank_detected": response.bank_detected.value,
+            "total_transactions": response.total_transactions,
+            "successful_parses": response.successful_parses,
+            "failed_parses": response.failed_parses,
+            "parsing_metadata": response.parsing_metadata
+        })
+        try:
+            parse_result_cache.put(cache_name, events)
+        except OSError as e:
+            logger.warning(f"Failed to cache parse result: {e}")
+
+    def _response_from_events(self, events: List[Dict[str, Any]]) -> PDFParseResponse:
+        transactions = [ParsedTransaction.model_validate(event["data"]) for event in events if event["type"] == "transaction"]
+        summary = events[-1]
+        return PDFParseResponse(
+            transactions=transactions,
+            bank_detected=summary["bank_detected"],
+            total_transactions=summary["total_transactions"],
+            successful_parses=summary["successful_parses"],
+            failed_parses=summary["failed_parses"],
+            parsing_metadata={**summary["parsing_metadata"], "cached": True}
+        )
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_ENTRY_SUFFIX = ".ndjson"
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path: str) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CacheWriter:
+    """Writes parse events to a temporary file that becomes a cache entry on commit"""
+
+    def __init__(self, cache: "ParseResultCache", name: str):
+        self.cache = cache
+        self.name = name
+        fd, self.temp_path = tempfile.mkstemp(dir=cache.directory, suffix=".tmp")
+        self._file = os.fdopen(fd, "w", encoding="utf-8")
+
+    def write(self, event: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+    def commit(self) -> None:
+        self._file.close()
+        self.cache._add(self.name, self.temp_path)
+
+    def discard(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+class ParseResultCache:
+    """
+    Disk cache of parse results keyed by (content hash, bank type, parser version).
+
+    An entry is the NDJSON event log of a parse (transaction events and the summary),
+    so it can be written while streaming and replayed by both the streaming and the
+    regular endpoints. Entries are evicted least recently used first once the total
+    size exceeds max_bytes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries: Optional["OrderedDict[str, int]"] = None
+        self._total_bytes = 0
+
+    @staticmethod
+    def entry_name(content_hash: str, bank_type: Optional[str], parser_version: str) -> str:
+        return f"{content_hash}-{bank_type or 'auto'}-v{parser_version}{_ENTRY_SUFFIX}"
+
+    def get(self, name: str) -> Optional[List[Dict[str, Any]]]:
+        """Cached events for an entry, or None on a miss"""
+        entries = self._index()
+        if name not in entries:
+            return None
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                events = [json.loads(line) for line in f if line.strip()]
+            os.utime(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable parse cache entry {name}: {e}")
+            self._remove(name)
+            return None
+        entries.move_to_end(name)
+        return events
+
+    def put(self, name: str, events: List[Dict[str, Any]]) -> None:
+        """Store a complete event log"""
+        writer = self.writer(name)
+        try:
+            for event in events:
+                writer.write(event)
+            writer.commit()
+        except Exception:
+            writer.discard()
+            raise
+
+    def writer(self, name: str) -> CacheWriter:
+        self._index()
+        return CacheWriter(self, name)
+
+    def _index(self) -> "OrderedDict[str, int]":
+        """Entries in least recently used order, loaded from disk on first use"""
+        if self._entries is None:
+            os.makedirs(self.directory, exist_ok=True)
+            found = []
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.endswith(_ENTRY_SUFFIX):
+                    stat = entry.stat()
+                    found.append((stat.st_mtime, entry.name, stat.st_size))
+            self._entries = OrderedDict((name, size) for _, name, size in sorted(found))
+            self._total_bytes = sum(self._entries.values())
+        return self._entries
+
+    def _add(self, name: str, temp_path: str) -> None:
+        entries = self._index()
+        if name in entries:
+            self._total_bytes -= entries.pop(name)
+        os.replace(temp_path, os.path.join(self.directory, name))
+        size = os.path.getsize(os.path.join(self.directory, name))
+        entries[name] = size
+        self._total_bytes += size
+
+        while self._total_bytes > self.max_bytes and len(entries) > 1:
+            self._remove(next(iter(entries)))
+
+    def _remove(self, name: str) -> None:
+        entries = self._index()
+        self._total_bytes -= entries.pop(name, 0)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
+
+
+# Shared result cache
+parse_result_cache = ParseResultCache(settings.result_cache_directory, settings.result_cache_max_bytes)
@@ -0,0 +1,124 @@
+import asyncio
+import multiprocessing
+from multiprocessing.connection import Connection
+from typing import Any, Callable, List, Set, Tuple
+
+from app.config import settings
+from app.exceptions import PDFParsingError
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# spawn: forking a process that runs an event loop and logging threads is unsafe
+_context = multiprocessing.get_context("spawn")
+
+
+def _worker_main(connection: Connection) -> None:
+    """Worker process loop: run (func, args) jobs received over the pipe until it is closed"""
+    while True:
+        try:
+            func, args = connection.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            reply: Tuple[bool, Any] = (True, func(*args))
+        except Exception as e:
+            reply = (False, e)
+        try:
+            connection.send(reply)
+        except Exception as e:
+            # Result or exception could not be pickled
+            connection.send((False, PDFParsingError(f"Worker could not return the result: {e}")))
+
+
+class _Worker:
+    """One worker process and the parent end of its pipe"""
+
+    def __init__(self):
+        self.connection, child_connection = _context.Pipe()
+        self.process = _context.Process(target=_worker_main, args=(child_connection,), daemon=True)
+        self.process.start()
+        child_connection.close()
+
+    def call(self, func: Callable[..., Any], args: Tuple[Any, ...]) -> Tuple[bool, Any]:
+        """Send a job and wait for its reply (blocking, call through asyncio.to_thread)"""
+        self.connection.send((func, args))
+        return self.connection.recv()
+
+    def stop(self) -> None:
+        """Kill the process and reap it (blocking)"""
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+
+
+class PDFWorkerPool:
+    """
+    Bounded pool of worker processes for CPU-heavy PDF work.
+
+    Keeps pdfplumber off the event loop. At most `max_pending` jobs are admitted at once
+    and at most `max_workers` run at the same time, each in its own worker process; idle
+    workers are reused. A job that is cancelled or times out while running has its worker
+    killed, so it frees its slot immediately; a new worker is started on demand. Jobs lost
+    to a crashed worker are resubmitted once.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._slots = asyncio.Semaphore(max_pending)
+        self._capacity = asyncio.Semaphore(max_workers)
+        self._idle: List[_Worker] = []
+        self._workers: Set[_Worker] = set()
+
+    def _take_worker(self) -> _Worker:
+        """An idle worker, or a new one (caller holds a capacity slot)"""
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.process.is_alive():
+                return worker
+            self._workers.discard(worker)
+        worker = _Worker()
+        self._workers.add(worker)
+        return worker
+
+    def _kill(self, worker: _Worker) -> None:
+        """Drop a worker and reap its process in the background"""
+        self._workers.discard(worker)
+        worker.process.kill()
+        asyncio.get_running_loop().run_in_executor(None, worker.stop)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run func(*args) in a worker process; cancelling the awaiting task kills the job"""
+        async with self._slots, self._capacity:
+            for attempt in range(2):
+                worker = self._take_worker()
+                try:
+                    succeeded, value = await asyncio.to_thread(worker.call, func, args)
+                except (EOFError, OSError):
+                    self._kill(worker)
+                    if attempt == 0:
+                        logger.warning("PDF worker process died, resubmitting job")
+                        continue
+                    raise PDFParsingError("PDF worker process terminated unexpectedly")
+                except asyncio.CancelledError:
+                    # Timeout or client disconnect: stop the job by killing its worker
+                    logger.warning("Killing PDF worker of a cancelled job")
+                    self._kill(worker)
+                    raise
+
+                self._idle.append(worker)
+                if not succeeded:
+                    raise value
+                return value
+
+    def shutdown(self) -> None:
+        """Stop all worker processes"""
+        for worker in self._workers:
+            worker.stop()
+        self._workers.clear()
+        self._idle.clear()
+
+
+# Shared pool (processes are started on first use)
+pdf_worker_pool = PDFWorkerPool(settings.parser_workers, settings.parser_max_pending_jobs)
@@ -0,0 +1,6 @@
+import os
+
+# Settings required to import app.config
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("CORS_ORIGINS", "*")
@@ -0,0 +1,142 @@
+import asyncio
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from app.config import settings
+from app.exceptions import BankDetectionError, ParsingTimeoutError, UnsupportedBankError
+from app.models.transaction import BankType, ParsedTransaction
+from app.services import pdf_parser
+from app.services.parsers import BasePDFParser, MonobankParser, ParserRegistry, parser_registry
+from app.services.pdf_parser import PDFParserService
+
+MIN_SCORE = 3
+
+MONOBANK_FIRST_PAGE = """
+АТ «Універсал Банк»
+Виписка по рахунку
+Дата i час операції Деталі операції MCC Сума в валюті картки (UAH)
+"""
+
+MONOBANK_COLUMNS_ONLY = """
+Дата i час операції   Деталі операції   Сума в валюті картки (UAH)   Залишок після операції
+"""
+
+
+class PrivatbankParser(BasePDFParser):
+    detection_markers = {"privatbank": 3}
+
+    def __init__(self):
+        super().__init__(BankType.PRIVATBANK)
+
+    async def parse_pdf(self, file_path: str) -> List[ParsedTransaction]:
+        return []
+
+    def _extract_transactions_from_table(self, table):
+        return []
+
+
+class FakeWorkerPool:
+    def __init__(self, first_page_text: str, delay: float = 0):
+        self.first_page_text = first_page_text
+        self.delay = delay
+
+    async def run(self, func, *args):
+        await asyncio.sleep(self.delay)
+        return self.first_page_text
+
+
+def select(first_page_text, bank_type=None, registry=None):
+    service = PDFParserService()
+    if registry is not None:
+        service.bank_parsers = registry
+    with patch.object(pdf_parser, "pdf_worker_pool", FakeWorkerPool(first_page_text)):
+        return asyncio.run(service.select_parser("statement.pdf", bank_type))
+
+
+class TestDetect:
+
+    @pytest.mark.parametrize("text", [MONOBANK_FIRST_PAGE, MONOBANK_COLUMNS_ONLY, "Statement issued by monobank"])
+    def test_monobank_statement_is_detected(self, text):
+        assert parser_registry.detect(text, MIN_SCORE) == BankType.MONOBANK
+
+    @pytest.mark.parametrize("text", [
+        "Date Description Amount Currency Balance",
+        "Date and time Operation Amount Currency Balance MCC Commission Cashback",
+        "Дата i час операції Деталі операції",  # two specific columns are not enough
+        "",
+    ])
+    def test_generic_statement_is_not_detected(self, text):
+        assert parser_registry.detect(text, MIN_SCORE) is None
+
+    def test_highest_score_wins(self):
+        registry = ParserRegistry()
+        registry.register(BankType.MONOBANK, MonobankParser)
+        registry.register(BankType.PRIVATBANK, PrivatbankParser)
+
+        assert registry.detect("PrivatBank statement", MIN_SCORE) == BankType.PRIVATBANK
+        assert registry.detect(MONOBANK_FIRST_PAGE, MIN_SCORE) == BankType.MONOBANK
+
+
+class TestSelectParser:
+
+    def test_detected_bank(self):
+        parser, bank_detection = select(MONOBANK_FIRST_PAGE)
+
+        assert parser.bank_type == BankType.MONOBANK
+        assert bank_detection == "auto"
+
+    def test_falls_back_to_monobank_with_warning(self):
+        with patch.object(pdf_parser.logger, "warning") as warning:
+            parser, bank_detection = select("Date Description Amount Currency Balance")
+
+        assert parser.bank_type == BankType.MONOBANK
+        assert bank_detection == "default"
+        warning.assert_called_once()
+
+    def test_falls_back_to_only_registered_parser(self):
+        registry = ParserRegistry()
+        registry.register(BankType.PRIVATBANK, PrivatbankParser)
+
+        parser, bank_detection = select("Some other bank", registry=registry)
+
+        assert parser.bank_type == BankType.PRIVATBANK
+        assert bank_detection == "default"
+
+    def test_no_default_raises(self):
+        registry = ParserRegistry()
+        registry.register(BankType.PRIVATBANK, PrivatbankParser)
+        registry.register(BankType.OTP, PrivatbankParser)
+
+        with pytest.raises(BankDetectionError):
+            select("Some other bank", registry=registry)
+
+    def test_requested_bank_skips_detection(self):
+        parser, bank_detection = select("", bank_type=BankType.MONOBANK)
+
+        assert parser.bank_type == BankType.MONOBANK
+        assert bank_detection == "requested"
+
+    def test_unsupported_requested_bank_raises(self):
+        with pytest.raises(UnsupportedBankError):
+            select(MONOBANK_FIRST_PAGE, bank_type=BankType.OTP)
+
+
+class TestParseDeadline:
+
+    def test_detection_and_parsing_share_one_timeout(self, tmp_path):
+        path = tmp_path / "statement.pdf"
+        path.write_bytes(b"%PDF-1.4")
+
+        async def slow_parse(file_path):
+            await asyncio.sleep(0.3)
+            return []
+
+        # Each step alone fits in the timeout, together they do not
+        with patch.object(pdf_parser, "pdf_worker_pool", FakeWorkerPool(MONOBANK_FIRST_PAGE, delay=0.3)), \
+             patch.object(MonobankParser, "parse_pdf", side_effect=slow_parse, autospec=False), \
+             patch.object(settings, "parse_timeout", 0.5), \
+             patch.object(settings, "result_cache_enabled", False):
+            with pytest.raises(ParsingTimeoutError):
+                asyncio.run(PDFParserService().parse_pdf(str(path)))
@@ -0,0 +1,51 @@
+from datetime import date
+
+import pytest
+
+from app.services.parsers.base_parser import BasePDFParser
+from app.services.parsers.monobank_parser import MonobankParser
+
+
+class TestHeaderPattern:
+
+    def test_no_headers_compile_to_none(self):
+        assert BasePDFParser._compile_header_pattern([]) is None
+
+    def test_longest_indicator_wins_and_is_escaped(self):
+        pattern = BasePDFParser._compile_header_pattern(["сума", "сума комісій (uah)", "a.b"])
+
+        assert pattern.search("сума комісій (uah)").group(0) == "сума комісій (uah)"
+        assert pattern.search("axb") is None
+
+    @pytest.mark.parametrize("cell, expected", [
+        ("Дата i час операції", True),
+        ("MCC", True),
+        ("Кава", False),
+        ("", False),
+    ])
+    def test_is_transaction_header(self, cell, expected):
+        assert MonobankParser()._is_transaction_header(cell) is expected
+
+
+class TestParseHelpers:
+
+    @pytest.mark.parametrize("value, expected", [
+        ("01.02.2024 10:15:00", date(2024, 2, 1)),
+        ("Дата: 31.12.2023", date(2023, 12, 31)),
+        ("31.02.2023", None),
+        ("2024-02-01", None),
+        ("", None),
+    ])
+    def test_parse_date(self, value, expected):
+        assert MonobankParser()._parse_date(value) == expected
+
+    def test_parse_date_with_custom_format(self):
+        assert MonobankParser()._parse_date("on 05.06.2024", r"on (\d{2}\.\d{2}\.\d{4})") == date(2024, 6, 5)
+
+    @pytest.mark.parametrize("value, expected", [
+        ("  Кава   з   собою ", "Кава з собою"),
+        ("ZMIST | Оплата послуг", "Оплата послуг"),
+        ("123 Сільпо", "Сільпо"),
+    ])
+    def test_clean_description(self, value, expected):
+        assert MonobankParser()._clean_description(value) == expected
@@ -0,0 +1,29 @@
+import pytest
+
+from app.services.parsers.extraction import split_pages
+
+
+class TestSplitPages:
+
+    @pytest.mark.parametrize("page_count, workers, min_pages, expected", [
+        (0, 2, 8, []),
+        (5, 2, 8, [(1, 5)]),  # shorter than min_pages: one range
+        (16, 2, 8, [(1, 8), (9, 16)]),
+        (17, 2, 8, [(1, 9), (10, 17)]),
+        (20, 4, 8, [(1, 10), (11, 20)]),  # limited by min_pages, not by workers
+        (10, 3, 1, [(1, 4), (5, 7), (8, 10)]),  # extra pages go to the first ranges
+        (3, 8, 0, [(1, 1), (2, 2), (3, 3)]),
+    ])
+    def test_ranges(self, page_count, workers, min_pages, expected):
+        assert split_pages(page_count, workers, min_pages) == expected
+
+    @pytest.mark.parametrize("page_count", [1, 7, 8, 9, 63, 64, 65, 1000])
+    @pytest.mark.parametrize("workers", [1, 2, 3, 8])
+    def test_ranges_cover_every_page_once_in_order(self, page_count, workers):
+        ranges = split_pages(page_count, workers, 8)
+
+        pages = [page for first_page, last_page in ranges for page in range(first_page, last_page + 1)]
+        assert pages == list(range(1, page_count + 1))
+        assert 1 <= len(ranges) <= workers
+        if len(ranges) > 1:
+            assert min(last_page - first_page + 1 for first_page, last_page in ranges) >= 8
@@ -0,0 +1,132 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.config import settings
+from app.exceptions import PDFParsingError
+from app.models.transaction import BankType, PDFJobStatus
+from app.services.job_queue import PDFJobQueue
+
+SUMMARY = {
+    "type": "summary",
+    "bank_detected": BankType.MONOBANK.value,
+    "total_transactions": 0,
+    "successful_parses": 0,
+    "failed_parses": 0,
+    "parsing_metadata": {"cached": False}
+}
+
+
+class FakeParserService:
+    """Replays the given events, then raises `error` if set"""
+
+    def __init__(self, events=(), error=None, block=False):
+        self.events = list(events)
+        self.error = error
+        self.block = block
+
+    async def stream_pdf(self, file_path, bank_type=None, content_hash=None):
+        return self._events()
+
+    async def _events(self):
+        for event in self.events:
+            yield event
+        if self.block:
+            await asyncio.Event().wait()
+        if self.error is not None:
+            raise self.error
+
+
+@pytest.fixture
+def upload(tmp_path):
+    path = tmp_path / "statement.pdf"
+    path.write_bytes(b"%PDF-1.4")
+    return path
+
+
+def run_job(tmp_path, upload, parser_service):
+    """Submit one job, run it to the end and return (job, file still exists)"""
+    async def scenario():
+        queue = PDFJobQueue(str(tmp_path / "jobs.db"), workers=1, max_queued=10)
+        queue.parser_service = parser_service
+        try:
+            job_id = await queue.submit(1, str(upload), "statement.pdf", None)
+            await queue._run_job(job_id)
+            return await queue.get(job_id, 1)
+        finally:
+            await queue.stop()
+
+    with patch.object(settings, "result_cache_enabled", False):
+        job = asyncio.run(scenario())
+    return job, upload.exists()
+
+
+class TestPDFJobQueue:
+
+    def test_completed_job_removes_file(self, tmp_path, upload):
+        job, file_exists = run_job(tmp_path, upload, FakeParserService([
+            {"type": "progress", "pages_processed": 1, "total_pages": 1},
+            SUMMARY
+        ]))
+
+        assert job.status == PDFJobStatus.COMPLETED
+        assert job.result.bank_detected == BankType.MONOBANK
+        assert not file_exists
+
+    def test_parsing_error_fails_job(self, tmp_path, upload):
+        job, file_exists = run_job(tmp_path, upload, FakeParserService(error=PDFParsingError("Broken table")))
+
+        assert job.status == PDFJobStatus.FAILED
+        assert job.error == "Broken table"
+        assert not file_exists
+
+    def test_unexpected_error_fails_job_and_removes_file(self, tmp_path, upload):
+        job, file_exists = run_job(tmp_path, upload, FakeParserService(error=RuntimeError("boom")))
+
+        assert job.status == PDFJobStatus.FAILED
+        assert "boom" in job.error
+        assert job.finished_at is not None
+        assert not file_exists
+
+    def test_stream_without_summary_fails_job(self, tmp_path, upload):
+        job, file_exists = run_job(tmp_path, upload, FakeParserService([
+            {"type": "progress", "pages_processed": 1, "total_pages": 2}
+        ]))
+
+        assert job.status == PDFJobStatus.FAILED
+        assert not file_exists
+
+    def test_stopped_job_keeps_file_for_requeue(self, tmp_path, upload):
+        async def scenario():
+            queue = PDFJobQueue(str(tmp_path / "jobs.db"), workers=1, max_queued=10)
+            queue.parser_service = FakeParserService(block=True)
+            await queue.start()
+            job_id = await queue.submit(1, str(upload), "statement.pdf", None)
+            await asyncio.sleep(0.2)
+            await queue.stop()
+
+            restarted = PDFJobQueue(str(tmp_path / "jobs.db"), workers=1, max_queued=10)
+            restarted.parser_service = FakeParserService([SUMMARY])
+            await restarted.start()
+            await restarted._queue.join()
+            job = await restarted.get(job_id, 1)
+            await restarted.stop()
+            return job
+
+        with patch.object(settings, "result_cache_enabled", False):
+            job = asyncio.run(scenario())
+
+        assert job.status == PDFJobStatus.COMPLETED
+        assert not upload.exists()
+
+    def test_jobs_of_other_users_are_hidden(self, tmp_path, upload):
+        async def scenario():
+            queue = PDFJobQueue(str(tmp_path / "jobs.db"), workers=1, max_queued=10)
+            try:
+                job_id = await queue.submit(1, str(upload), "statement.pdf", None)
+                return await queue.get(job_id, 2)
+            finally:
+                await queue.stop()
+
+        assert asyncio.run(scenario()) is None
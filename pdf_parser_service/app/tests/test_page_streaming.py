@@ -0,0 +1,82 @@
+import asyncio
+from unittest.mock import patch
+
+from app.config import settings
+from app.services.parsers import base_parser
+from app.services.parsers.monobank_parser import MonobankParser
+
+
+class FakeWorkerPool:
+    """Runs extraction calls on the event loop and records which page ranges were started and finished"""
+
+    def __init__(self, page_count: int, delay: float = 0.02):
+        self.page_count = page_count
+        self.delay = delay
+        self.started = []
+        self.finished = []
+        self.cancelled = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self.in_flight_after_close = None
+
+    async def run(self, func, *args):
+        if func is base_parser.count_pages:
+            return self.page_count
+        _, first_page, last_page = args
+        self.started.append(first_page)
+        self._in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            # Later ranges take longer, so a range started next to the first one is still running
+            await asyncio.sleep(self.delay * first_page)
+        except asyncio.CancelledError:
+            self.cancelled.append(first_page)
+            raise
+        finally:
+            self._in_flight -= 1
+        self.finished.append(first_page)
+        return [[["page", str(first_page)]]]
+
+
+def collect(parser, pool, limit=None):
+    async def scenario():
+        results = []
+        pages = parser._iter_page_tables("statement.pdf")
+        try:
+            async for pages_processed, total_pages, tables in pages:
+                results.append((pages_processed, total_pages, tables))
+                if limit is not None and len(results) == limit:
+                    break
+        finally:
+            await pages.aclose()
+        pool.in_flight_after_close = pool._in_flight
+        return results
+
+    with patch.object(base_parser, "pdf_worker_pool", pool), \
+         patch.object(settings, "parser_workers", 2), \
+         patch.object(settings, "parser_stream_pages_per_task", 2):
+        return asyncio.run(scenario())
+
+
+class TestIterPageTables:
+
+    def test_ranges_are_yielded_in_page_order(self):
+        pool = FakeWorkerPool(page_count=7)
+
+        results = collect(MonobankParser(), pool)
+
+        assert [(processed, total) for processed, total, _ in results] == [(2, 7), (4, 7), (6, 7), (7, 7)]
+        assert [tables[0][0][1] for _, _, tables in results] == ["1", "3", "5", "7"]
+        assert pool.max_in_flight == 2
+
+    def test_early_stop_drops_remaining_ranges(self):
+        pool = FakeWorkerPool(page_count=20)
+
+        results = collect(MonobankParser(), pool, limit=1)
+
+        assert len(results) == 1
+        # The range in flight next to the consumed one is dropped, no further ranges are started
+        assert pool.started == [1, 3]
+        # Closing the generator waits until the dropped range is cancelled
+        assert pool.cancelled == [3]
+        assert pool.in_flight_after_close == 0
@@ -0,0 +1,82 @@
+import os
+
+from app.services.result_cache import ParseResultCache, hash_file
+
+
+def events(size: int):
+    """Event log whose NDJSON entry is exactly `size` bytes"""
+    padding = size - len('{"type": "summary", "pad": ""}\n')
+    return [{"type": "summary", "pad": "x" * padding}]
+
+
+def entry_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".ndjson"))
+
+
+class TestParseResultCache:
+
+    def test_round_trip(self, tmp_path):
+        cache = ParseResultCache(str(tmp_path), max_bytes=10_000)
+        stored = [{"type": "transaction", "data": {"description": "Кава"}}, {"type": "summary"}]
+
+        cache.put("a.ndjson", stored)
+
+        assert cache.get("a.ndjson") == stored
+        assert cache.get("missing.ndjson") is None
+
+    def test_evicts_least_recently_used_over_byte_budget(self, tmp_path):
+        cache = ParseResultCache(str(tmp_path), max_bytes=250)
+        cache.put("a.ndjson", events(100))
+        cache.put("b.ndjson", events(100))
+        cache.get("a.ndjson")  # b is now least recently used
+
+        cache.put("c.ndjson", events(100))
+
+        assert entry_files(tmp_path) == ["a.ndjson", "c.ndjson"]
+        assert cache._total_bytes == 200
+        assert cache.get("b.ndjson") is None
+
+    def test_replacing_entry_does_not_count_it_twice(self, tmp_path):
+        cache = ParseResultCache(str(tmp_path), max_bytes=250)
+        cache.put("a.ndjson", events(100))
+        cache.put("b.ndjson", events(100))
+
+        cache.put("a.ndjson", events(120))
+
+        assert entry_files(tmp_path) == ["a.ndjson", "b.ndjson"]
+        assert cache._total_bytes == 220
+
+    def test_entry_larger_than_budget_is_kept_alone(self, tmp_path):
+        cache = ParseResultCache(str(tmp_path), max_bytes=150)
+        cache.put("a.ndjson", events(100))
+
+        cache.put("big.ndjson", events(400))
+
+        assert entry_files(tmp_path) == ["big.ndjson"]
+
+    def test_index_is_rebuilt_from_disk(self, tmp_path):
+        first = ParseResultCache(str(tmp_path), max_bytes=250)
+        first.put("a.ndjson", events(100))
+        first.put("b.ndjson", events(100))
+        os.utime(tmp_path / "a.ndjson", (1, 1))  # oldest on disk
+
+        second = ParseResultCache(str(tmp_path), max_bytes=250)
+        second.put("c.ndjson", events(100))
+
+        assert entry_files(tmp_path) == ["b.ndjson", "c.ndjson"]
+
+    def test_discarded_writer_leaves_no_files(self, tmp_path):
+        cache = ParseResultCache(str(tmp_path), max_bytes=1000)
+        writer = cache.writer("a.ndjson")
+        writer.write({"type": "transaction"})
+
+        writer.discard()
+
+        assert os.listdir(tmp_path) == []
+        assert cache.get("a.ndjson") is None
+
+    def test_hash_file(self, tmp_path):
+        path = tmp_path / "statement.pdf"
+        path.write_bytes(b"abc")
+
+        assert hash_file(str(path)) == "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
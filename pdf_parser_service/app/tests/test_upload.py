@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.exception_handlers import http_exception_handler
+from app.middleware import UploadSizeLimitMiddleware
+from app.routers.pdf_parser import _save_upload, _validate_upload
+
+
+class CountingUpload(UploadFile):
+    """UploadFile that records how many bytes were read from the client"""
+
+    bytes_read = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        chunk = await super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def make_upload(content: bytes, size=None) -> CountingUpload:
+    return CountingUpload(
+        file=io.BytesIO(content),
+        filename="statement.pdf",
+        size=size,
+        headers={"content-type": "application/pdf"}
+    )
+
+
+def save(tmp_path, upload):
+    with patch.object(settings, "upload_directory", str(tmp_path)), \
+         patch.object(settings, "upload_chunk_size", 4), \
+         patch.object(settings, "max_file_size", 10):
+        return asyncio.run(_save_upload(upload))
+
+
+class TestSaveUpload:
+
+    def test_saves_file_and_returns_hash(self, tmp_path):
+        content = b"%PDF-1.4\n"
+
+        path, content_hash = save(tmp_path, make_upload(content))
+
+        with open(path, "rb") as f:
+            assert f.read() == content
+        assert content_hash == hashlib.sha256(content).hexdigest()
+
+    def test_oversized_upload_is_rejected_mid_stream(self, tmp_path):
+        # No declared size: the limit is only known to be exceeded while reading
+        upload = make_upload(b"x" * 1000)
+
+        with pytest.raises(HTTPException) as exc_info:
+            save(tmp_path, upload)
+
+        assert exc_info.value.status_code == 400
+        # Reading stops at the first chunk past the limit and the partial file is removed
+        assert upload.bytes_read == 12
+        assert os.listdir(tmp_path) == []
+
+    def test_upload_of_exactly_max_size_is_accepted(self, tmp_path):
+        path, _ = save(tmp_path, make_upload(b"x" * 10))
+
+        assert os.path.getsize(path) == 10
+
+
+class TestValidateUpload:
+
+    def test_declared_size_over_limit_is_rejected(self):
+        with patch.object(settings, "max_file_size", 10):
+            with pytest.raises(HTTPException) as exc_info:
+                _validate_upload(make_upload(b"", size=11))
+        assert exc_info.value.status_code == 400
+
+    def test_non_pdf_is_rejected(self):
+        upload = UploadFile(file=io.BytesIO(b""), filename="a.txt", headers={"content-type": "text/plain"})
+
+        with pytest.raises(HTTPException):
+            _validate_upload(upload)
+
+
+class TestUploadSizeLimitMiddleware:
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.add_exception_handler(HTTPException, http_exception_handler)
+        app.add_middleware(UploadSizeLimitMiddleware, max_body_size=1000)
+        app.state.uploads = []
+
+        @app.post("/upload")
+        async def upload(file: UploadFile = File(...)):
+            app.state.uploads.append(await file.read())
+            return {"size": len(app.state.uploads[-1])}
+
+        return TestClient(app)
+
+    def test_small_upload_passes(self, client):
+        response = client.post("/upload", files={"file": ("a.pdf", b"x" * 100, "application/pdf")})
+
+        assert response.status_code == 200
+        assert response.json() == {"size": 100}
+
+    def test_declared_oversized_body_is_rejected_before_reading(self, client):
+        response = client.post(
+            "/upload",
+            content=b"x" * 5000,
+            headers={"Content-Type": "multipart/form-data; boundary=b"}
+        )
+
+        assert response.status_code == 413
+        assert client.app.state.uploads == []
+
+    def test_streamed_body_is_cut_off_at_the_limit(self, client):
+        # No Content-Length: the body arrives in chunks and only received bytes are counted
+        chunks = [b'--b\r\nContent-Disposition: form-data; name="file"; filename="a.pdf"\r\n\r\n']
+        chunks += [b"x" * 500] * 100
+        received = []
+        sent = []
+
+        async def receive():
+            received.append(1)
+            return {"type": "http.request", "body": chunks[len(received) - 1], "more_body": len(received) < len(chunks)}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+            "scheme": "http", "path": "/upload", "raw_path": b"/upload", "query_string": b"",
+            "root_path": "", "server": ("testserver", 80), "client": ("testclient", 1),
+            "headers": [(b"content-type", b"multipart/form-data; boundary=b")],
+        }
+        asyncio.run(client.app(scope, receive, send))
+
+        assert sent[0]["status"] == 413
+        assert b"Request body exceeds maximum allowed size of 1000 bytes" in sent[1]["body"]
+        assert client.app.state.uploads == []
+        # Reading stopped at the first chunk past the limit
+        assert len(received) == 3
@@ -0,0 +1,87 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.exceptions import PDFParsingError
+from app.services.worker_pool import PDFWorkerPool
+
+
+class TestPDFWorkerPool:
+
+    def test_runs_function_in_worker(self):
+        async def scenario():
+            pool = PDFWorkerPool(max_workers=1, max_pending=2)
+            try:
+                return await pool.run(pow, 2, 10)
+            finally:
+                pool.shutdown()
+
+        assert asyncio.run(scenario()) == 1024
+
+    def test_worker_exception_is_raised_and_worker_reused(self):
+        async def scenario():
+            pool = PDFWorkerPool(max_workers=1, max_pending=2)
+            try:
+                with pytest.raises(ValueError):
+                    await pool.run(int, "not a number")
+                assert await pool.run(pow, 2, 3) == 8
+                assert len(pool._workers) == 1
+            finally:
+                pool.shutdown()
+
+        asyncio.run(scenario())
+
+    def test_hanging_job_is_killed_and_later_job_completes(self):
+        async def scenario():
+            pool = PDFWorkerPool(max_workers=1, max_pending=2)
+            try:
+                await pool.run(abs, -1)
+                (hung_worker,) = pool._workers
+
+                with pytest.raises(asyncio.TimeoutError):
+                    await asyncio.wait_for(pool.run(time.sleep, 60), timeout=0.5)
+
+                # The only worker was killed with its job and the slot is free right away
+                assert pool._slots._value == 2
+                hung_worker.process.join(timeout=5)
+                assert not hung_worker.process.is_alive()
+
+                assert await asyncio.wait_for(pool.run(pow, 3, 2), timeout=30) == 9
+                assert hung_worker not in pool._workers
+            finally:
+                pool.shutdown()
+
+        asyncio.run(scenario())
+
+    def test_cancelled_running_job_does_not_stop_other_jobs(self):
+        async def scenario():
+            pool = PDFWorkerPool(max_workers=2, max_pending=2)
+            try:
+                # Start the worker processes before timing anything
+                await asyncio.gather(pool.run(time.sleep, 0.1), pool.run(time.sleep, 0.1))
+
+                other = asyncio.create_task(pool.run(time.sleep, 1.0))
+                with pytest.raises(asyncio.TimeoutError):
+                    await asyncio.wait_for(pool.run(time.sleep, 60), timeout=0.3)
+
+                # The job running next to the killed one completes in its own worker
+                assert await other is None
+                assert await pool.run(pow, 3, 2) == 9
+            finally:
+                pool.shutdown()
+
+        asyncio.run(scenario())
+
+    def test_crashed_worker_job_is_resubmitted_once(self):
+        async def scenario():
+            pool = PDFWorkerPool(max_workers=1, max_pending=1)
+            try:
+                with pytest.raises(PDFParsingError):
+                    await pool.run(os._exit, 1)
+                assert await pool.run(pow, 2, 2) == 4
+            finally:
+                pool.shutdown()
+
+        asyncio.run(scenario())
@@ -9,7 +9,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import Base
-from app.models import RecurringPayment, PaymentSchedule
+from app.models import RecurringPayment, PaymentSchedule, ExecutionCheckpoint, SchedulerRun
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,35 @@
+"""Add execution checkpoints for resumable scheduler runs
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-02-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('execution_checkpoints',
+        sa.Column('execution_date', sa.Date(), nullable=False),
+        sa.Column('last_payment_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('processed_count', sa.Integer(), nullable=False),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('execution_date')
+    )
+    # Keyset-обход ожидающих платежей: WHERE status = 'active' AND next_execution <= :date ORDER BY id
+    op.create_index('ix_recurring_payments_status_next_execution', 'recurring_payments', ['status', 'next_execution'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recurring_payments_status_next_execution', table_name='recurring_payments')
+    op.drop_table('execution_checkpoints')
@@ -0,0 +1,30 @@
+"""Key execution checkpoints by worker partition
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-02-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('execution_checkpoints',
+        sa.Column('partition_key', sa.String(length=32), nullable=False, server_default='all')
+    )
+    op.drop_constraint('execution_checkpoints_pkey', 'execution_checkpoints', type_='primary')
+    op.create_primary_key('execution_checkpoints_pkey', 'execution_checkpoints', ['execution_date', 'partition_key'])
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM execution_checkpoints WHERE partition_key <> 'all'")
+    op.drop_constraint('execution_checkpoints_pkey', 'execution_checkpoints', type_='primary')
+    op.create_primary_key('execution_checkpoints_pkey', 'execution_checkpoints', ['execution_date'])
+    op.drop_column('execution_checkpoints', 'partition_key')
@@ -0,0 +1,33 @@
+"""Unique payment schedule per (recurring_payment_id, execution_date)
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-03-01 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Удалить дубликаты: оставить выполненную запись, иначе самую позднюю
+    op.execute("""
+        DELETE FROM payment_schedules a
+        USING payment_schedules b
+        WHERE a.recurring_payment_id = b.recurring_payment_id
+          AND a.execution_date = b.execution_date
+          AND (CASE a.status WHEN 'executed' THEN 2 WHEN 'pending' THEN 1 ELSE 0 END, a.created_at, a.id)
+            < (CASE b.status WHEN 'executed' THEN 2 WHEN 'pending' THEN 1 ELSE 0 END, b.created_at, b.id)
+    """)
+    op.create_unique_constraint(
+        'uq_payment_schedules_payment_date', 'payment_schedules', ['recurring_payment_id', 'execution_date']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_payment_schedules_payment_date', 'payment_schedules', type_='unique')
@@ -0,0 +1,28 @@
+"""Composite index for payment schedule statistics
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-03-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_payment_schedules_payment_status_executed',
+        'payment_schedules',
+        ['recurring_payment_id', 'status', 'executed_at'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payment_schedules_payment_status_executed', table_name='payment_schedules')
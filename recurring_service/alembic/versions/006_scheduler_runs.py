@@ -0,0 +1,43 @@
+"""Add scheduler run reports
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-04-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('scheduler_runs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('execution_date', sa.Date(), nullable=False),
+        sa.Column('partition_key', sa.String(length=32), nullable=False),
+        sa.Column('trigger', sa.String(length=20), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('due_count', sa.Integer(), nullable=False),
+        sa.Column('executed_count', sa.Integer(), nullable=False),
+        sa.Column('failed_count', sa.Integer(), nullable=False),
+        sa.Column('skipped_count', sa.Integer(), nullable=False),
+        sa.Column('latency_p50_ms', sa.Float(), nullable=True),
+        sa.Column('latency_p95_ms', sa.Float(), nullable=True),
+        sa.Column('error_breakdown', sa.JSON(), nullable=False),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_scheduler_runs_started_at', 'scheduler_runs', ['started_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scheduler_runs_started_at', table_name='scheduler_runs')
+    op.drop_table('scheduler_runs')
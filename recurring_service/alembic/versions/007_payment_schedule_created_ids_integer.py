@@ -0,0 +1,44 @@
+"""Store created expense/income ids as integers
+
+Revision ID: 007
+Revises: 006
+Create Date: 2024-04-15 00:00:00.000000
+
+ВНИМАНИЕ: потеря данных. ID в expense_service/income_service целочисленные,
+а колонки были UUID, поэтому существующие значения created_expense_id и
+created_income_id нельзя преобразовать — они обнуляются. Downgrade также
+обнуляет их. Перед миграцией сохраните payment_schedules, если ссылки нужны.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ('created_expense_id', 'created_income_id')
+
+
+def _column_types() -> dict:
+    inspector = sa.inspect(op.get_bind())
+    return {column['name']: column['type'] for column in inspector.get_columns('payment_schedules')}
+
+
+def upgrade() -> None:
+    types = _column_types()
+    for column in COLUMNS:
+        # Базы, где колонка уже целочисленная, не трогаем
+        if isinstance(types[column], sa.Integer):
+            continue
+        op.alter_column('payment_schedules', column,
+            type_=sa.Integer(), existing_type=postgresql.UUID(as_uuid=True), postgresql_using='NULL')
+
+
+def downgrade() -> None:
+    for column in reversed(COLUMNS):
+        op.alter_column('payment_schedules', column,
+            type_=postgresql.UUID(as_uuid=True), existing_type=sa.Integer(), postgresql_using='NULL')
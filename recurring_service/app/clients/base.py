@@ -1,3 +1,4 @@
+import asyncio
 import httpx
 from typing import Dict, Any, Optional
 from app.config import settings
@@ -5,6 +6,47 @@ from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Методы, которые безопасно повторять (POST повторяется только с Idempotency-Key)
+IDEMPOTENT_METHODS = {"GET", "PUT", "DELETE"}
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+# Общие клиенты и ограничители параллелизма на время жизни приложения (по base URL)
+_http_clients: Dict[str, httpx.AsyncClient] = {}
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def get_http_client(base_url: str) -> httpx.AsyncClient:
+    """Получить общий клиент с пулом keep-alive соединений для сервиса"""
+    client = _http_clients.get(base_url)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+        _http_clients[base_url] = client
+    return client
+
+
+def get_host_semaphore(base_url: str) -> asyncio.Semaphore:
+    """Ограничитель одновременных запросов к одному сервису"""
+    semaphore = _host_semaphores.get(base_url)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(settings.HTTP_MAX_CONCURRENCY_PER_HOST)
+        _host_semaphores[base_url] = semaphore
+    return semaphore
+
+
+async def close_http_clients() -> None:
+    """Закрыть общие клиенты (при остановке приложения)"""
+    for client in _http_clients.values():
+        await client.aclose()
+    _http_clients.clear()
+    _host_semaphores.clear()
+
 
 class BaseServiceClient:
     """Базовый клиент для взаимодействия с другими сервисами"""
@@ -19,28 +61,49 @@ class BaseServiceClient:
         endpoint: str,
         data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
-        headers: Optional[Dict[str, str]] = None
+        headers: Optional[Dict[str, str]] = None,
+        idempotent: Optional[bool] = None,
+        timeout: Optional[float] = None
     ) -> Dict[str, Any]:
-        """Выполнить HTTP запрос к сервису"""
+        """Выполнить HTTP запрос к сервису (идемпотентные запросы повторяются с backoff)"""
         url = f"{self.base_url}{endpoint}"
         
-        if headers is None:
-            headers = {"Content-Type": "application/json", "X-Internal-Token": settings.INTERNAL_SECRET_TOKEN}
+        request_headers = {"Content-Type": "application/json", "X-Internal-Token": settings.INTERNAL_SECRET_TOKEN}
+        if headers:
+            request_headers.update(headers)
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS or "Idempotency-Key" in request_headers
+        attempts = max(1, settings.HTTP_RETRY_ATTEMPTS) if idempotent else 1
+
+        client = get_http_client(self.base_url)
+        for attempt in range(1, attempts + 1):
             try:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    json=data,
-                    params=params,
-                    headers=headers
-                )
+                async with get_host_semaphore(self.base_url):
+                    response = await client.request(
+                        method=method,
+                        url=endpoint,
+                        json=data,
+                        params=params,
+                        headers=request_headers,
+                        timeout=timeout or self.timeout
+                    )
+                if response.status_code in RETRYABLE_STATUS_CODES and attempt < attempts:
+                    logger.warning(f"HTTP {response.status_code} for {method} {url}, retry {attempt}/{attempts - 1}")
+                    await asyncio.sleep(settings.HTTP_RETRY_BACKOFF * 2 ** (attempt - 1))
+                    continue
                 response.raise_for_status()
                 return response.json()
             except httpx.HTTPStatusError as e:
                 logger.error(f"HTTP error {e.response.status_code} for {method} {url}: {e.response.text}")
                 raise
+            except httpx.TransportError as e:
+                if attempt < attempts:
+                    logger.warning(f"Request error for {method} {url}: {str(e)}, retry {attempt}/{attempts - 1}")
+                    await asyncio.sleep(settings.HTTP_RETRY_BACKOFF * 2 ** (attempt - 1))
+                    continue
+                logger.error(f"Request error for {method} {url}: {str(e)}")
+                raise
             except httpx.RequestError as e:
                 logger.error(f"Request error for {method} {url}: {str(e)}")
                 raise
@@ -52,9 +115,19 @@ class BaseServiceClient:
         """GET запрос"""
         return await self._make_request("GET", endpoint, params=params)
 
-    async def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def post(
+        self,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        idempotent: Optional[bool] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
         """POST запрос"""
-        return await self._make_request("POST", endpoint, data=data)
+        return await self._make_request(
+            "POST", endpoint, data=data, params=params, headers=headers, idempotent=idempotent, timeout=timeout
+        )
 
     async def put(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """PUT запрос"""
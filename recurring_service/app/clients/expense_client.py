@@ -1,4 +1,4 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from uuid import UUID
 
 from app.config import settings
@@ -11,9 +11,21 @@ class ExpenseServiceClient(BaseServiceClient):
     def __init__(self):
         super().__init__(settings.EXPENSE_SERVICE_URL)
 
-    async def create_expense(self, expense_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Создать новый расход"""
-        return await self.post("/internal", data=expense_data)
+    async def create_expense(
+        self,
+        expense_data: Dict[str, Any],
+        user_id: int,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Создать новый расход от имени пользователя (повтор с тем же ключом не создает дубликат)"""
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+        return await self.post("/internal/", data=expense_data, params={"user_id": user_id}, headers=headers)
+
+    async def create_expenses_bulk(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Создать несколько расходов одним запросом (элементы: user_id, idempotency_key, expense)"""
+        return await self.post(
+            "/internal/bulk", data={"items": items}, idempotent=True, timeout=settings.EXECUTOR_BATCH_TIMEOUT
+        )
 
     async def get_expense(self, expense_id: UUID) -> Dict[str, Any]:
         """Получить расход по ID"""
@@ -1,4 +1,4 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from uuid import UUID
 
 from app.config import settings
@@ -11,9 +11,21 @@ class IncomeServiceClient(BaseServiceClient):
     def __init__(self):
         super().__init__(settings.INCOME_SERVICE_URL)
 
-    async def create_income(self, income_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Создать новый доход"""
-        return await self.post("/api/v1/incomes", data=income_data)
+    async def create_income(
+        self,
+        income_data: Dict[str, Any],
+        user_id: int,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Создать новый доход от имени пользователя (повтор с тем же ключом не создает дубликат)"""
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+        return await self.post("/internal/incomes", data=income_data, params={"user_id": user_id}, headers=headers)
+
+    async def create_incomes_bulk(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Создать несколько доходов одним запросом (элементы: user_id, idempotency_key, income)"""
+        return await self.post(
+            "/internal/incomes/bulk", data={"items": items}, idempotent=True, timeout=settings.EXECUTOR_BATCH_TIMEOUT
+        )
 
     async def get_income(self, income_id: UUID) -> Dict[str, Any]:
         """Получить доход по ID"""
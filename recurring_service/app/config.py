@@ -8,6 +8,13 @@ class Settings(BaseSettings):
     # Database - No default, must be provided via environment variable
     DATABASE_URL: str
 
+    # Connection pool (Postgres; SQLite tests use a single static connection)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
     # Service URLs
     EXPENSE_SERVICE_URL: str = "http://expense_service:8000"
     INCOME_SERVICE_URL: str = "http://income_service:8000"
@@ -27,6 +34,37 @@ class Settings(BaseSettings):
     
     # Logging
     LOG_LEVEL: str = "INFO"
+
+    # Executor
+    EXECUTOR_CONCURRENCY: int = 20
+    PAYMENT_EXECUTION_TIMEOUT: float = 30.0
+    # Deadline for one bulk create request of up to EXECUTOR_BATCH_SIZE items, retries included
+    EXECUTOR_BATCH_TIMEOUT: float = 120.0
+    EXECUTOR_CHUNK_SIZE: int = 500
+    EXECUTOR_BATCH_SIZE: int = 200
+    # Catch-up: execute every missed occurrence since next_execution in one run
+    EXECUTOR_CATCH_UP: bool = False
+    CATCH_UP_MAX_OCCURRENCES: int = 366
+    # Runs still "running" this long after start are marked interrupted on startup
+    SCHEDULER_RUN_STALE_AFTER: int = 6 * 3600
+
+    # Forecast: per-user cache of projected schedules
+    FORECAST_CACHE_TTL: int = 300
+    FORECAST_CACHE_MAX_USERS: int = 10000
+
+    # Outbound HTTP (shared client per service)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_MAX_CONCURRENCY_PER_HOST: int = 50
+    HTTP_RETRY_ATTEMPTS: int = 3
+    HTTP_RETRY_BACKOFF: float = 0.5
+
+    # Scheduler distribution: single | leader | partitioned
+    SCHEDULER_MODE: str = "single"
+    SCHEDULER_LOCK_KEY: int = 804211
+    WORKER_COUNT: int = 1
+    WORKER_INDEX: int = 0
     
     @property
     def cors_origins_list(self) -> list[str]:
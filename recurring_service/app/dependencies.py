@@ -31,6 +31,22 @@ def verify_internal_token(request: Request) -> None:
             detail="Unauthorized internal access"
         )
 
+def verify_metrics_token(request: Request) -> None:
+    """
+    Verify internal token for the metrics scrape.
+    Prometheus cannot send custom headers, so the token is also accepted as a Bearer token.
+    """
+    auth_header = request.headers.get("Authorization", "")
+    if auth_header.startswith(BEARER_PREFIX) and not request.headers.get("X-Internal-Token"):
+        if auth_header[len(BEARER_PREFIX):].strip() != settings.INTERNAL_SECRET_TOKEN:
+            log_security_event(logger, "Invalid metrics token", details="Token mismatch")
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Unauthorized internal access"
+            )
+        return
+    verify_internal_token(request)
+
 def decode_token(token: str) -> int:
     """Decode JWT token and extract user ID"""
     try:
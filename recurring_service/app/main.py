@@ -4,9 +4,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.config import settings
-from app.database import engine, Base
+from datetime import timedelta
+
+from app.database import engine, Base, SessionLocal
 from app.routers import recurring_router, internal_router
 from app.services.scheduler_service import scheduler_service
+from app.services.executor import PaymentExecutor
+from app.clients.base import close_http_clients
 from app.exception_handlers import (
     recurring_payment_not_found_handler,
     invalid_schedule_config_handler,
@@ -105,6 +109,13 @@ async def lifespan(app: FastAPI):
     # Создать таблицы в базе данных
     Base.metadata.create_all(bind=engine)
     logger.info("Database tables created")
+
+    # Закрыть запуски, прерванные остановкой процесса (иначе они навсегда остаются running)
+    db = SessionLocal()
+    try:
+        PaymentExecutor.mark_interrupted_runs(db, timedelta(seconds=settings.SCHEDULER_RUN_STALE_AFTER))
+    finally:
+        db.close()
     
     # Запустить встроенный шедулер
     scheduler_service.start()
@@ -116,6 +127,8 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down Recurring Payments Service")
     scheduler_service.stop()
     logger.info("Built-in scheduler stopped")
+    await close_http_clients()
+    logger.info("HTTP clients closed")
 
 
 # Создать приложение FastAPI
@@ -1,4 +1,6 @@
 from .recurring_payment import RecurringPayment
 from .payment_schedule import PaymentSchedule
+from .execution_checkpoint import ExecutionCheckpoint
+from .scheduler_run import SchedulerRun
 
-__all__ = ["RecurringPayment", "PaymentSchedule"]
+__all__ = ["RecurringPayment", "PaymentSchedule", "ExecutionCheckpoint", "SchedulerRun"]
@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Dict, Any
+
+from sqlalchemy import Column, DateTime, Date, Integer, String
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+
+from app.database import Base
+
+
+class ExecutionCheckpoint(Base):
+    """Прогресс выполнения платежей за дату и партицию (high-water mark для возобновления после сбоя)"""
+
+    __tablename__ = "execution_checkpoints"
+
+    execution_date = Column(Date, primary_key=True)
+    partition_key = Column(String(32), primary_key=True, default="all")
+    last_payment_id = Column(PostgresUUID(as_uuid=True), nullable=True)
+    processed_count = Column(Integer, nullable=False, default=0)
+    completed_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ExecutionCheckpoint(execution_date='{self.execution_date}', partition_key='{self.partition_key}', last_payment_id={self.last_payment_id})>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "execution_date": self.execution_date.isoformat() if self.execution_date else None,
+            "partition_key": self.partition_key,
+            "last_payment_id": str(self.last_payment_id) if self.last_payment_id else None,
+            "processed_count": self.processed_count,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -3,7 +3,7 @@ from decimal import Decimal
 from typing import Optional, Dict, Any
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column, String, DateTime, Date, Text, JSON, Enum, Numeric, Integer
+from sqlalchemy import Column, String, DateTime, Date, Text, JSON, Enum, Numeric, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.orm import relationship
 
@@ -12,6 +12,9 @@ from app.database import Base
 
 class RecurringPayment(Base):
     __tablename__ = "recurring_payments"
+    __table_args__ = (
+        Index("ix_recurring_payments_status_next_execution", "status", "next_execution"),
+    )
 
     id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid4)
     user_id = Column(Integer, nullable=False, index=True)
@@ -0,0 +1,62 @@
+from datetime import datetime
+from typing import Dict, Any, Optional
+from uuid import uuid4
+
+from sqlalchemy import Column, DateTime, Date, Float, Integer, JSON, String, Text, Index
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+
+from app.database import Base
+
+
+class SchedulerRun(Base):
+    """Отчет об одном запуске выполнения повторяющихся платежей"""
+
+    __tablename__ = "scheduler_runs"
+    __table_args__ = (
+        Index("ix_scheduler_runs_started_at", "started_at"),
+    )
+
+    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid4)
+    execution_date = Column(Date, nullable=False)
+    partition_key = Column(String(32), nullable=False, default="all")
+    trigger = Column(String(20), nullable=False, default="scheduler")
+    status = Column(String(20), nullable=False, default="running")
+    started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+    due_count = Column(Integer, nullable=False, default=0)
+    executed_count = Column(Integer, nullable=False, default=0)
+    failed_count = Column(Integer, nullable=False, default=0)
+    skipped_count = Column(Integer, nullable=False, default=0)
+    latency_p50_ms = Column(Float, nullable=True)
+    latency_p95_ms = Column(Float, nullable=True)
+    error_breakdown = Column(JSON, nullable=False, default=dict)
+    error_message = Column(Text, nullable=True)
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        if self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at).total_seconds()
+
+    def __repr__(self):
+        return f"<SchedulerRun(id={self.id}, execution_date='{self.execution_date}', status='{self.status}')>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": str(self.id),
+            "execution_date": self.execution_date.isoformat() if self.execution_date else None,
+            "partition_key": self.partition_key,
+            "trigger": self.trigger,
+            "status": self.status,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_seconds": self.duration_seconds,
+            "due_count": self.due_count,
+            "executed_count": self.executed_count,
+            "failed_count": self.failed_count,
+            "skipped_count": self.skipped_count,
+            "latency_p50_ms": self.latency_p50_ms,
+            "latency_p95_ms": self.latency_p95_ms,
+            "error_breakdown": self.error_breakdown or {},
+            "error_message": self.error_message,
+        }
@@ -1,17 +1,20 @@
 from datetime import date
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_pool_status
+from app.models.scheduler_run import SchedulerRun
 from app.services.executor import PaymentExecutor
 from app.services.scheduler_service import SchedulerService
 from app.services.scheduler_service import scheduler_service
+from app.services.scheduler_metrics import render_metrics
 from app.clients.expense_client import ExpenseServiceClient
 from app.clients.income_client import IncomeServiceClient
 from app.clients.category_client import CategoryServiceClient
 from app.utils.logger import get_logger
-from app.dependencies import verify_internal_token
+from app.dependencies import verify_internal_token, verify_metrics_token
 
 logger = get_logger(__name__)
 
@@ -35,7 +38,7 @@ async def execute_recurring_payments(
 ):
     """Execute all recurring payments on the specified date (for cron job)"""
     try:
-        executed_count = await executor.execute_pending_payments(db, execution_date)
+        executed_count = await executor.execute_pending_payments(db, execution_date, trigger="api")
         
         logger.info(f"Executed {executed_count} recurring payments for date {execution_date or date.today()}")
         return {
@@ -101,6 +104,34 @@ async def get_scheduler_status(
         raise HTTPException(status_code=500, detail=f"Failed to get scheduler status: {str(e)}")
 
 
+@router.get("/scheduler/runs")
+async def get_scheduler_runs(
+    execution_date: Optional[date] = Query(None, description="Фильтр по дате выполнения"),
+    limit: int = Query(20, ge=1, le=200, description="Количество последних запусков"),
+    db: Session = Depends(get_db),
+    _: None = Depends(verify_internal_token)
+):
+    """Get reports of the latest scheduler runs"""
+    query = db.query(SchedulerRun)
+    if execution_date:
+        query = query.filter(SchedulerRun.execution_date == execution_date)
+    runs = query.order_by(SchedulerRun.started_at.desc()).limit(limit).all()
+
+    return {
+        "runs": [run.to_dict() for run in runs],
+        "count": len(runs)
+    }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(
+    db: Session = Depends(get_db),
+    _: None = Depends(verify_metrics_token)
+):
+    """Scheduler run and connection pool metrics in Prometheus text format"""
+    return PlainTextResponse(render_metrics(db), media_type="text/plain; version=0.0.4")
+
+
 @router.post("/scheduler/execute-now")
 async def execute_payments_now(
     _: None = Depends(verify_internal_token)
@@ -117,6 +148,17 @@ async def execute_payments_now(
         raise HTTPException(status_code=500, detail=f"Failed to trigger manual execution: {str(e)}")
 
 
+@router.get("/db-pool")
+async def get_db_pool_status(
+    _: None = Depends(verify_internal_token)
+):
+    """Get database connection pool usage and checkout wait statistics"""
+    return {
+        "status": "success",
+        "pool": get_pool_status()
+    }
+
+
 @router.get("/health")
 async def health_check():
     """Проверка здоровья сервиса"""
@@ -10,6 +10,7 @@ from app.schemas.recurring_payment import (
     RecurringPaymentUpdate,
     RecurringPaymentResponse,
     RecurringPaymentListResponse,
+    PaymentForecastResponse,
 )
 from app.schemas.payment_schedule import (
     PaymentScheduleListResponse
@@ -54,6 +55,23 @@ async def get_recurring_payments(
     )
 
 
+@router.get("/forecast", response_model=PaymentForecastResponse)
+async def get_payment_forecast(
+    user_id: int = Depends(get_current_user_id),
+    horizon: int = Query(3, ge=1, le=12, description="Горизонт прогноза в месяцах"),
+    group_by: str = Query("month", pattern="^(day|month)$", description="Группировка: day или month"),
+    db: Session = Depends(get_db)
+):
+    """Get forecast of upcoming recurring payments"""
+    try:
+        return recurring_payment_service.get_payment_forecast(user_id, db, horizon, group_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to get payment forecast: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to get payment forecast")
+
+
 @router.get("/{payment_id}", response_model=RecurringPaymentResponse)
 async def get_recurring_payment(
     payment_id: UUID,
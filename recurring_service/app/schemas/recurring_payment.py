@@ -90,3 +90,20 @@ class RecurringPaymentListResponse(BaseModel):
 
 class RecurringPaymentStatusUpdate(BaseModel):
     status: str = Field(..., pattern="^(active|paused|completed|cancelled)$")
+
+
+class PaymentForecastItem(BaseModel):
+    period: str = Field(..., description="День (YYYY-MM-DD) или месяц (YYYY-MM)")
+    currency: str
+    expenses: Decimal
+    incomes: Decimal
+    net: Decimal
+    payments_count: int
+
+
+class PaymentForecastResponse(BaseModel):
+    date_from: date
+    date_to: date
+    group_by: str
+    items: List[PaymentForecastItem]
+    totals: List[PaymentForecastItem]
@@ -0,0 +1,58 @@
+import asyncio
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.clients.category_client import CategoryServiceClient
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CategoryKey = Tuple[int, int]
+
+
+class CategoryValidationCache:
+    """
+    Кэш проверки категорий на время одного запуска шедулера.
+
+    Каждая пара (user_id, category_id) проверяется в category_service не более одного раза:
+    результат (None или текст ошибки) запоминается, а одновременные запросы
+    одной пары ожидают общую задачу.
+    """
+
+    def __init__(self, category_client: CategoryServiceClient, semaphore: asyncio.Semaphore):
+        self.category_client = category_client
+        self.semaphore = semaphore
+        self._results: Dict[CategoryKey, "asyncio.Task[Optional[str]]"] = {}
+
+    async def validate(self, user_id: int, category_id: int) -> Optional[str]:
+        """Проверить категорию пользователя; возвращает текст ошибки или None"""
+        key = (user_id, category_id)
+        task = self._results.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(user_id, category_id))
+            self._results[key] = task
+        return await task
+
+    async def prefetch(self, keys: Iterable[CategoryKey]) -> None:
+        """Параллельно проверить все еще не проверенные пары (user_id, category_id)"""
+        missing = {key for key in keys if key not in self._results}
+        if missing:
+            logger.info(f"Prefetching {len(missing)} categories")
+            await asyncio.gather(*(self.validate(user_id, category_id) for user_id, category_id in missing))
+
+    @property
+    def size(self) -> int:
+        return len(self._results)
+
+    async def _fetch(self, user_id: int, category_id: int) -> Optional[str]:
+        async with self.semaphore:
+            try:
+                await asyncio.wait_for(
+                    self.category_client.get_category(category_id, user_id),
+                    timeout=settings.PAYMENT_EXECUTION_TIMEOUT
+                )
+                return None
+            except asyncio.TimeoutError:
+                return f"Category validation timed out after {settings.PAYMENT_EXECUTION_TIMEOUT}s"
+            except Exception as e:
+                return str(e)
@@ -1,11 +1,20 @@
-from datetime import datetime, date
-from typing import Optional, List
+import asyncio
+import time
+from datetime import datetime, date, timedelta
+from typing import Optional, List, Callable, Dict, Any, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
 
+from app.config import settings
+from app.database import SessionLocal
 from app.models.recurring_payment import RecurringPayment
 from app.models.payment_schedule import PaymentSchedule
+from app.models.execution_checkpoint import ExecutionCheckpoint
+from app.models.scheduler_run import SchedulerRun
 from app.services.payment_calculator import PaymentCalculator
+from app.services.category_cache import CategoryValidationCache
+from app.services.forecast_cache import forecast_cache
+from app.services.run_stats import RunStats
 from app.clients.expense_client import ExpenseServiceClient
 from app.clients.income_client import IncomeServiceClient
 from app.clients.category_client import CategoryServiceClient
@@ -21,37 +30,379 @@ class PaymentExecutor:
         self,
         expense_client: ExpenseServiceClient,
         income_client: IncomeServiceClient,
-        category_client: CategoryServiceClient
+        category_client: CategoryServiceClient,
+        session_factory: Callable[[], Session] = SessionLocal
     ):
         self.expense_client = expense_client
         self.income_client = income_client
         self.category_client = category_client
+        self.session_factory = session_factory
 
-    async def execute_pending_payments(self, db: Session, execution_date: Optional[date] = None) -> int:
-        """Выполнить все ожидающие платежи на указанную дату"""
+        # В режиме partitioned реплика обрабатывает только платежи своих пользователей
+        if settings.SCHEDULER_MODE == "partitioned":
+            self.worker_count = settings.WORKER_COUNT
+            self.worker_index = settings.WORKER_INDEX
+        else:
+            self.worker_count = 1
+            self.worker_index = 0
+        if not 0 <= self.worker_index < self.worker_count:
+            raise ValueError(f"Invalid worker partition {self.worker_index}/{self.worker_count}")
+
+    @property
+    def partition_key(self) -> str:
+        """Ключ партиции для checkpoint'ов"""
+        if self.worker_count == 1:
+            return "all"
+        return f"{self.worker_index}/{self.worker_count}"
+
+    async def execute_pending_payments(
+        self,
+        db: Session,
+        execution_date: Optional[date] = None,
+        trigger: str = "scheduler"
+    ) -> int:
+        """Выполнить все ожидающие платежи на указанную дату и сохранить отчет о запуске"""
         if execution_date is None:
             execution_date = date.today()
 
-        # Найти все активные повторяющиеся платежи, которые должны выполняться сегодня
-        recurring_payments = db.query(RecurringPayment).filter(
+        run = SchedulerRun(execution_date=execution_date, partition_key=self.partition_key, trigger=trigger)
+        db.add(run)
+        db.commit()
+        stats = RunStats()
+
+        try:
+            executed_count = await self._execute_run(db, execution_date, stats)
+        except Exception as e:
+            db.rollback()
+            self._finish_run(db, run, stats, "failed", str(e))
+            raise
+
+        self._finish_run(db, run, stats, "completed")
+        return executed_count
+
+    async def _execute_run(self, db: Session, execution_date: date, stats: RunStats) -> int:
+        """Обойти ожидающие платежи порциями с продолжением от checkpoint'а"""
+        # Продолжить с high-water mark незавершенного запуска за эту дату
+        checkpoint = self._get_checkpoint(db, execution_date)
+        last_payment_id = checkpoint.last_payment_id
+        if last_payment_id is not None:
+            logger.info(f"Resuming execution for {execution_date} after payment {last_payment_id}")
+
+        # Не более EXECUTOR_CONCURRENCY одновременных запросов к другим сервисам
+        semaphore = asyncio.Semaphore(settings.EXECUTOR_CONCURRENCY)
+        # Категории проверяются не более одного раза за запуск
+        category_cache = CategoryValidationCache(self.category_client, semaphore)
+        executed_count = 0
+
+        while True:
+            payment_ids = self._get_due_payment_ids(db, execution_date, last_payment_id)
+            if not payment_ids:
+                break
+
+            executed_count += await self._execute_chunk(payment_ids, execution_date, semaphore, category_cache, stats)
+
+            last_payment_id = payment_ids[-1]
+            checkpoint.last_payment_id = last_payment_id
+            checkpoint.processed_count += len(payment_ids)
+            db.commit()
+            logger.info(f"Processed chunk of {len(payment_ids)} recurring payments, last id {last_payment_id}")
+
+        checkpoint.completed_at = datetime.utcnow()
+        db.commit()
+
+        return executed_count
+
+    @staticmethod
+    def _finish_run(
+        db: Session,
+        run: SchedulerRun,
+        stats: RunStats,
+        status: str,
+        error_message: Optional[str] = None
+    ) -> None:
+        """Записать итоги запуска"""
+        p50 = stats.latency_percentile(50)
+        p95 = stats.latency_percentile(95)
+        run.status = status
+        run.finished_at = datetime.utcnow()
+        run.due_count = stats.due
+        run.executed_count = stats.executed
+        run.failed_count = stats.failed
+        run.skipped_count = stats.skipped
+        run.latency_p50_ms = p50 * 1000 if p50 is not None else None
+        run.latency_p95_ms = p95 * 1000 if p95 is not None else None
+        run.error_breakdown = stats.error_breakdown
+        run.error_message = error_message
+        db.commit()
+        logger.info(
+            f"Run {run.id} {status}: due={stats.due} executed={stats.executed} "
+            f"failed={stats.failed} skipped={stats.skipped}"
+        )
+
+    @staticmethod
+    def mark_interrupted_runs(db: Session, stale_after: timedelta) -> int:
+        """
+        Закрыть запуски, оставшиеся в статусе running после остановки процесса.
+        Запуски моложе stale_after не трогаются - их может выполнять другая реплика.
+        """
+        now = datetime.utcnow()
+        runs = db.query(SchedulerRun).filter(
+            SchedulerRun.status == "running",
+            SchedulerRun.started_at < now - stale_after
+        ).all()
+        for run in runs:
+            run.status = "interrupted"
+            run.finished_at = now
+            run.error_message = "Run was interrupted before finishing"
+        db.commit()
+        if runs:
+            logger.warning(f"Marked {len(runs)} stale scheduler runs as interrupted")
+        return len(runs)
+
+    def _get_checkpoint(self, db: Session, execution_date: date) -> ExecutionCheckpoint:
+        """Получить checkpoint запуска за дату (завершенный запуск начинается заново)"""
+        checkpoint = db.get(ExecutionCheckpoint, (execution_date, self.partition_key))
+        if checkpoint is None:
+            checkpoint = ExecutionCheckpoint(
+                execution_date=execution_date,
+                partition_key=self.partition_key,
+                processed_count=0
+            )
+            db.add(checkpoint)
+        elif checkpoint.completed_at is not None:
+            checkpoint.last_payment_id = None
+            checkpoint.processed_count = 0
+            checkpoint.completed_at = None
+        db.commit()
+        return checkpoint
+
+    def _due_filter(self, execution_date: date) -> list:
+        """Условия отбора платежей, которые должны выполняться на дату"""
+        conditions = [
             RecurringPayment.status == "active",
             RecurringPayment.next_execution <= execution_date,
             RecurringPayment.end_date.is_(None) | (RecurringPayment.end_date >= execution_date)
-        ).all()
-        logger.info(f"Found {len(recurring_payments)} recurring payments to execute")
+        ]
+        if self.worker_count > 1:
+            conditions.append(RecurringPayment.user_id % self.worker_count == self.worker_index)
+        return conditions
 
-        executed_count = 0
-        for recurring_payment in recurring_payments:
+    def _get_due_payment_ids(
+        self,
+        db: Session,
+        execution_date: date,
+        after_id: Optional[UUID]
+    ) -> List[UUID]:
+        """Получить следующую порцию ID ожидающих платежей (keyset-пагинация по id)"""
+        query = db.query(RecurringPayment.id).filter(*self._due_filter(execution_date))
+        if after_id is not None:
+            query = query.filter(RecurringPayment.id > after_id)
+        return [row.id for row in query.order_by(RecurringPayment.id).limit(settings.EXECUTOR_CHUNK_SIZE)]
+
+    def _claim_payments(self, db: Session, payment_ids: List[UUID], execution_date: date) -> List[RecurringPayment]:
+        """
+        Заблокировать платежи порции до конца транзакции.
+        Строки, уже заблокированные другим исполнителем, пропускаются (SKIP LOCKED),
+        а повторная проверка условий отсекает платежи, выполненные до сбоя.
+        """
+        return db.query(RecurringPayment).filter(
+            RecurringPayment.id.in_(payment_ids),
+            *self._due_filter(execution_date)
+        ).order_by(RecurringPayment.id).with_for_update(skip_locked=True).all()
+
+    async def _execute_chunk(
+        self,
+        payment_ids: List[UUID],
+        execution_date: date,
+        semaphore: asyncio.Semaphore,
+        category_cache: CategoryValidationCache,
+        stats: RunStats
+    ) -> int:
+        """Выполнить порцию платежей: проверка категорий, пакетное создание расходов/доходов, один commit"""
+        db = self.session_factory()
+        try:
+            payments = self._claim_payments(db, payment_ids, execution_date)
+            # Заблокированные другим исполнителем или уже выполненные до сбоя
+            unclaimed = len(payment_ids) - len(payments)
+            stats.due += unclaimed
+            stats.skipped += unclaimed
+            occurrences = {
+                recurring_payment.id: self._occurrence_dates(recurring_payment, execution_date)
+                for recurring_payment in payments
+            }
+            schedules = self._get_or_create_schedules(db, payments, occurrences)
+
+            pending = []
+            for recurring_payment in payments:
+                for occurrence_date in occurrences[recurring_payment.id]:
+                    schedule = schedules[(recurring_payment.id, occurrence_date)]
+                    stats.due += 1
+                    if schedule.status == "executed":
+                        logger.info(f"Recurring payment {recurring_payment.id} already executed for {occurrence_date}, skipping")
+                        stats.skipped += 1
+                    else:
+                        pending.append((recurring_payment, schedule))
+
+            # Проверить все различные категории порции параллельно (уже проверенные берутся из кэша)
+            await category_cache.prefetch(
+                (recurring_payment.user_id, recurring_payment.category_id) for recurring_payment, _ in pending
+            )
+            valid = []
+            for recurring_payment, schedule in pending:
+                error = await category_cache.validate(recurring_payment.user_id, recurring_payment.category_id)
+                if error is None:
+                    valid.append((recurring_payment, schedule))
+                else:
+                    self._mark_failed(recurring_payment, schedule, error)
+                    stats.record_failure("category")
+
+            # Сгруппировать по целевому сервису и отправить пакетами
+            expenses = [item for item in valid if item[0].payment_type == "EXPENSE"]
+            incomes = [item for item in valid if item[0].payment_type != "EXPENSE"]
+            batch_size = settings.EXECUTOR_BATCH_SIZE
+            batches = [
+                ("EXPENSE", expenses[i:i + batch_size]) for i in range(0, len(expenses), batch_size)
+            ] + [
+                ("INCOME", incomes[i:i + batch_size]) for i in range(0, len(incomes), batch_size)
+            ]
+            executed_counts = await asyncio.gather(*(
+                self._execute_batch(payment_type, batch, semaphore, stats)
+                for payment_type, batch in batches
+            ))
+
+            for recurring_payment in payments:
+                self._finish_payment(recurring_payment, [
+                    schedules[(recurring_payment.id, occurrence_date)]
+                    for occurrence_date in occurrences[recurring_payment.id]
+                ])
+
+            db.commit()
+            # next_execution перенесен - прогнозы пользователей порции устарели
+            for user_id in {recurring_payment.user_id for recurring_payment in payments}:
+                forecast_cache.invalidate(user_id)
+            return sum(executed_counts)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def _execute_batch(
+        self,
+        payment_type: str,
+        batch: List[Tuple[RecurringPayment, PaymentSchedule]],
+        semaphore: asyncio.Semaphore,
+        stats: RunStats
+    ) -> int:
+        """Создать расходы или доходы пакетом и сопоставить результаты с расписаниями"""
+        if payment_type == "EXPENSE":
+            items = [
+                {
+                    "user_id": recurring_payment.user_id,
+                    "idempotency_key": self.build_idempotency_key(recurring_payment.id, schedule.execution_date),
+                    "expense": self._build_expense_data(recurring_payment, schedule.execution_date),
+                }
+                for recurring_payment, schedule in batch
+            ]
+            create_batch = self.expense_client.create_expenses_bulk
+        else:
+            items = [
+                {
+                    "user_id": recurring_payment.user_id,
+                    "idempotency_key": self.build_idempotency_key(recurring_payment.id, schedule.execution_date),
+                    "income": self._build_income_data(recurring_payment, schedule.execution_date),
+                }
+                for recurring_payment, schedule in batch
+            ]
+            create_batch = self.income_client.create_incomes_bulk
+
+        service = payment_type.lower()
+        # Вид ошибки для отчета о запуске: отказ по отдельному элементу или сбой всего пакета
+        error_kind = f"{service}_rejected"
+        async with semaphore:
+            started = time.perf_counter()
             try:
-                await self._execute_single_payment(db, recurring_payment, execution_date)
-                executed_count += 1
-                logger.info(f"Successfully executed recurring payment {recurring_payment.id}")
+                # Пакет обрабатывается дольше одиночного запроса: отдельный лимит на весь пакет
+                response = await asyncio.wait_for(create_batch(items), timeout=settings.EXECUTOR_BATCH_TIMEOUT)
+                results = {result["index"]: result for result in response.get("results", [])}
+                stats.record_latency(time.perf_counter() - started)
+            except asyncio.TimeoutError:
+                error = f"Batch create timed out after {settings.EXECUTOR_BATCH_TIMEOUT}s"
+                results = {index: {"error": error} for index in range(len(batch))}
+                error_kind = f"{service}_timeout"
             except Exception as e:
-                logger.error(f"Failed to execute recurring payment {recurring_payment.id}: {str(e)}")
-                await self._create_failed_schedule(db, recurring_payment, execution_date, str(e))
+                results = {index: {"error": str(e)} for index in range(len(batch))}
+                error_kind = f"{service}_error"
 
+        executed_count = 0
+        for index, (recurring_payment, schedule) in enumerate(batch):
+            result = results.get(index) or {"error": "Missing result in batch response"}
+            if result.get("id") is None:
+                self._mark_failed(recurring_payment, schedule, result.get("error") or "Unknown error")
+                stats.record_failure(error_kind)
+                continue
+
+            if payment_type == "EXPENSE":
+                schedule.created_expense_id = result["id"]
+            else:
+                schedule.created_income_id = result["id"]
+            schedule.status = "executed"
+            schedule.executed_at = datetime.utcnow()
+            schedule.error_message = None
+            executed_count += 1
+
+        stats.executed += executed_count
+        logger.info(f"Executed {executed_count} of {len(batch)} {payment_type.lower()} payments in batch")
         return executed_count
 
+    @staticmethod
+    def _occurrence_dates(recurring_payment: RecurringPayment, execution_date: date) -> List[date]:
+        """
+        Даты, за которые платеж выполняется в этом запуске.
+        Запись расписания, ключ идемпотентности и дата расхода/дохода берутся по дате
+        выполнения по расписанию (next_execution), а не по дате запуска: иначе повтор
+        неудачного запуска на следующий день создал бы ту же операцию под другим ключом.
+        """
+        if not settings.EXECUTOR_CATCH_UP:
+            return [recurring_payment.next_execution]
+        # Режим догонки: все пропущенные даты от next_execution до execution_date
+        occurrences = PaymentCalculator.missed_occurrences(
+            recurring_payment, execution_date, settings.CATCH_UP_MAX_OCCURRENCES
+        )
+        return occurrences or [recurring_payment.next_execution]
+
+    def _finish_payment(self, recurring_payment: RecurringPayment, schedules: List[PaymentSchedule]) -> None:
+        """Перевести платеж на следующую дату после выполненных дат запуска"""
+        if not settings.EXECUTOR_CATCH_UP:
+            if schedules[0].status == "executed":
+                self._advance_payment(recurring_payment, schedules[0].executed_at or datetime.utcnow())
+            return
+
+        # Следующая дата - первая невыполненная (повторится в следующий запуск)
+        for schedule in schedules:
+            if schedule.status != "executed":
+                if schedule.execution_date > recurring_payment.next_execution:
+                    recurring_payment.last_executed = datetime.utcnow()
+                    recurring_payment.next_execution = schedule.execution_date
+                return
+
+        last_schedule = schedules[-1]
+        recurring_payment.last_executed = last_schedule.executed_at or datetime.utcnow()
+        recurring_payment.next_execution = PaymentCalculator.next_occurrence(
+            recurring_payment.schedule_type,
+            recurring_payment.schedule_config or {},
+            last_schedule.execution_date
+        )
+        if recurring_payment.end_date and recurring_payment.next_execution > recurring_payment.end_date:
+            recurring_payment.status = "completed"
+
+    @staticmethod
+    def _mark_failed(recurring_payment: RecurringPayment, schedule: PaymentSchedule, error_message: str) -> None:
+        """Отметить выполнение платежа как неудачное"""
+        logger.error(f"Failed to execute recurring payment {recurring_payment.id}: {error_message}")
+        schedule.status = "failed"
+        schedule.error_message = error_message
+
     async def _execute_single_payment(
         self, 
         db: Session, 
@@ -59,14 +410,16 @@ class PaymentExecutor:
         execution_date: date
     ) -> None:
         """Выполнить один повторяющийся платеж"""
-        # Создать запись в расписании
-        schedule = PaymentSchedule(
-            recurring_payment_id=recurring_payment.id,
-            execution_date=execution_date,
-            status="pending"
-        )
-        db.add(schedule)
-        db.flush()
+        # Запись в расписании за эту дату (повторный запуск переиспользует pending/failed запись)
+        schedule = self._get_or_create_schedule(db, recurring_payment, execution_date)
+        if schedule.status == "executed":
+            logger.info(f"Recurring payment {recurring_payment.id} already executed for {execution_date}, skipping")
+            self._advance_payment(recurring_payment, schedule.executed_at or datetime.utcnow())
+            db.commit()
+            forecast_cache.invalidate(recurring_payment.user_id)
+            return
+
+        idempotency_key = self.build_idempotency_key(recurring_payment.id, execution_date)
 
         try:
             # Валидировать категорию
@@ -74,37 +427,30 @@ class PaymentExecutor:
 
             # Создать expense или income
             if recurring_payment.payment_type == "EXPENSE":
-                expense_data = {
-                    "amount": float(recurring_payment.amount),
-                    "category_id": recurring_payment.category_id,
-                    "description": f"Автоматический платеж: {recurring_payment.name}",
-                    "date": execution_date.isoformat(),
-                }
-                expense_response = await self.expense_client.create_expense(expense_data, recurring_payment.user_id)
-                schedule.created_expense_id = UUID(expense_response["id"])
+                expense_response = await self.expense_client.create_expense(
+                    self._build_expense_data(recurring_payment, execution_date),
+                    recurring_payment.user_id,
+                    idempotency_key
+                )
+                schedule.created_expense_id = expense_response["id"]
             else:  # income
-                income_data = {
-                    "amount": float(recurring_payment.amount),
-                    "category_id": recurring_payment.category_id,
-                    "description": f"Автоматический доход: {recurring_payment.name}",
-                    "date": execution_date.isoformat()
-                }
-                income_response = await self.income_client.create_income(income_data, recurring_payment.user_id)
-                schedule.created_income_id = UUID(income_response["id"])
+                income_response = await self.income_client.create_income(
+                    self._build_income_data(recurring_payment, execution_date),
+                    recurring_payment.user_id,
+                    idempotency_key
+                )
+                schedule.created_income_id = income_response["id"]
 
             # Обновить статус расписания
             schedule.status = "executed"
             schedule.executed_at = datetime.utcnow()
+            schedule.error_message = None
 
             # Обновить повторяющийся платеж
-            recurring_payment.last_executed = datetime.utcnow()
-            recurring_payment.next_execution = PaymentCalculator.calculate_next_execution(recurring_payment)
-
-            # Если достигнута дата окончания, завершить платеж
-            if recurring_payment.end_date and recurring_payment.next_execution > recurring_payment.end_date:
-                recurring_payment.status = "completed"
+            self._advance_payment(recurring_payment, schedule.executed_at)
 
             db.commit()
+            forecast_cache.invalidate(recurring_payment.user_id)
 
         except Exception as e:
             # Обновить статус расписания на failed
@@ -113,22 +459,91 @@ class PaymentExecutor:
             db.commit()
             raise
 
-    async def _create_failed_schedule(
-        self, 
-        db: Session, 
-        recurring_payment: RecurringPayment, 
-        execution_date: date, 
-        error_message: str
-    ) -> None:
-        """Создать запись о неудачном выполнении платежа"""
-        schedule = PaymentSchedule(
-            recurring_payment_id=recurring_payment.id,
-            execution_date=execution_date,
-            status="failed",
-            error_message=error_message
-        )
-        db.add(schedule)
-        db.commit()
+    @staticmethod
+    def build_idempotency_key(recurring_payment_id: UUID, execution_date: date) -> str:
+        """Ключ идемпотентности создания расхода/дохода для пары (платеж, дата)"""
+        return f"recurring:{recurring_payment_id}:{execution_date.isoformat()}"
+
+    @staticmethod
+    def _advance_payment(recurring_payment: RecurringPayment, executed_at: datetime) -> None:
+        """Перевести платеж на следующую дату выполнения"""
+        recurring_payment.last_executed = executed_at
+        recurring_payment.next_execution = PaymentCalculator.calculate_next_execution(recurring_payment)
+
+        # Если достигнута дата окончания, завершить платеж
+        if recurring_payment.end_date and recurring_payment.next_execution > recurring_payment.end_date:
+            recurring_payment.status = "completed"
+
+    @staticmethod
+    def _build_expense_data(recurring_payment: RecurringPayment, execution_date: date) -> Dict[str, Any]:
+        """Данные расхода для expense_service"""
+        return {
+            "amount": float(recurring_payment.amount),
+            "category_id": recurring_payment.category_id,
+            "description": f"Автоматический платеж: {recurring_payment.name}",
+            "date": execution_date.isoformat(),
+        }
+
+    @staticmethod
+    def _build_income_data(recurring_payment: RecurringPayment, execution_date: date) -> Dict[str, Any]:
+        """Данные дохода для income_service"""
+        return {
+            "amount": float(recurring_payment.amount),
+            "category_id": recurring_payment.category_id,
+            "description": f"Автоматический доход: {recurring_payment.name}",
+            "date": execution_date.isoformat()
+        }
+
+    @staticmethod
+    def _get_or_create_schedule(
+        db: Session,
+        recurring_payment: RecurringPayment,
+        execution_date: date
+    ) -> PaymentSchedule:
+        """Получить запись расписания за дату или создать новую (записывается при commit)"""
+        schedule = db.query(PaymentSchedule).filter(
+            PaymentSchedule.recurring_payment_id == recurring_payment.id,
+            PaymentSchedule.execution_date == execution_date
+        ).first()
+        if schedule is None:
+            schedule = PaymentSchedule(
+                recurring_payment_id=recurring_payment.id,
+                execution_date=execution_date,
+                status="pending"
+            )
+            db.add(schedule)
+        return schedule
+
+    @staticmethod
+    def _get_or_create_schedules(
+        db: Session,
+        payments: List[RecurringPayment],
+        occurrences: Dict[UUID, List[date]]
+    ) -> Dict[Tuple[UUID, date], PaymentSchedule]:
+        """Записи расписания для дат выполнения порции платежей (одним запросом)"""
+        all_dates = [occurrence_date for dates in occurrences.values() for occurrence_date in dates]
+        if not all_dates:
+            return {}
+
+        schedules = {
+            (schedule.recurring_payment_id, schedule.execution_date): schedule
+            for schedule in db.query(PaymentSchedule).filter(
+                PaymentSchedule.recurring_payment_id.in_([payment.id for payment in payments]),
+                PaymentSchedule.execution_date.between(min(all_dates), max(all_dates))
+            )
+        }
+        for recurring_payment in payments:
+            for occurrence_date in occurrences[recurring_payment.id]:
+                key = (recurring_payment.id, occurrence_date)
+                if key not in schedules:
+                    schedule = PaymentSchedule(
+                        recurring_payment_id=recurring_payment.id,
+                        execution_date=occurrence_date,
+                        status="pending"
+                    )
+                    db.add(schedule)
+                    schedules[key] = schedule
+        return schedules
 
     async def retry_failed_payment(self, db: Session, schedule_id: UUID) -> bool:
         """Повторить неудачный платеж"""
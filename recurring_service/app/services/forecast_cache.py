@@ -0,0 +1,62 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from app.config import settings
+
+
+class ForecastCache:
+    """
+    Кэш прогнозов по пользователям с ограничением по времени жизни и числу пользователей.
+
+    Прогнозы хранятся отдельно для каждого пользователя вместе с версией его платежей,
+    прочитанной из БД (см. RecurringPaymentService._forecast_version). Кэш локален
+    для процесса, но версия общая: изменение платежей в другой реплике или в шедулере
+    меняет ее, и устаревшие прогнозы не отдаются. invalidate лишь освобождает память
+    в текущем процессе.
+    """
+
+    def __init__(self, ttl: float, max_users: int):
+        self.ttl = ttl
+        self.max_users = max_users
+        self._users: "OrderedDict[int, Tuple[Hashable, Dict[Hashable, Tuple[float, Any]]]]" = OrderedDict()
+
+    def get(self, user_id: int, key: Hashable, version: Hashable = None) -> Optional[Any]:
+        """Получить прогноз из кэша, если он еще не устарел и версия платежей не изменилась"""
+        cached = self._users.get(user_id)
+        if cached is None:
+            return None
+        cached_version, entries = cached
+        if cached_version != version:
+            del self._users[user_id]
+            return None
+        if key not in entries:
+            return None
+        expires_at, value = entries[key]
+        if expires_at < time.monotonic():
+            del entries[key]
+            return None
+        self._users.move_to_end(user_id)
+        return value
+
+    def set(self, user_id: int, key: Hashable, value: Any, version: Hashable = None) -> None:
+        """Сохранить прогноз; при переполнении вытесняются давно не запрашивавшие пользователи"""
+        cached = self._users.get(user_id)
+        if cached is None or cached[0] != version:
+            cached = self._users[user_id] = (version, {})
+        cached[1][key] = (time.monotonic() + self.ttl, value)
+        self._users.move_to_end(user_id)
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """Сбросить все прогнозы пользователя"""
+        self._users.pop(user_id, None)
+
+    @property
+    def size(self) -> int:
+        return sum(len(entries) for _, entries in self._users.values())
+
+
+# Глобальный кэш прогнозов
+forecast_cache = ForecastCache(settings.FORECAST_CACHE_TTL, settings.FORECAST_CACHE_MAX_USERS)
@@ -0,0 +1,42 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AdvisoryLock:
+    """
+    Выбор лидера среди реплик через Postgres advisory lock.
+
+    Блокировка уровня сессии держится на отдельном соединении, пока выполняется блок with,
+    и автоматически снимается при обрыве соединения (падении реплики).
+    На других СУБД (SQLite в тестах) реплика одна, поэтому блокировка всегда захватывается.
+    """
+
+    def __init__(self, engine: Engine, key: int):
+        self.engine = engine
+        self.key = key
+
+    @contextmanager
+    def acquire(self) -> Iterator[bool]:
+        """Попытаться захватить блокировку без ожидания; возвращает True, если реплика стала лидером"""
+        if self.engine.dialect.name != "postgresql":
+            yield True
+            return
+
+        with self.engine.connect() as connection:
+            acquired = bool(connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}
+            ).scalar())
+            connection.commit()
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+                    connection.commit()
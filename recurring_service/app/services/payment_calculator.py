@@ -1,5 +1,7 @@
+import calendar
 from datetime import date, datetime, timedelta
-from typing import Optional
+from itertools import islice
+from typing import Iterator, List, Optional
 from dateutil.relativedelta import relativedelta
 
 from app.models.recurring_payment import RecurringPayment
@@ -15,45 +17,95 @@ class PaymentCalculator:
             return recurring_payment.next_execution
 
         current_date = recurring_payment.last_executed.date() if recurring_payment.last_executed else recurring_payment.start_date
-        schedule_type = recurring_payment.schedule_type
-        schedule_config = recurring_payment.schedule_config
+        next_date = PaymentCalculator.next_occurrence(
+            recurring_payment.schedule_type,
+            recurring_payment.schedule_config,
+            current_date
+        )
 
+        # Check if we've reached the end date
+        if recurring_payment.end_date and next_date > recurring_payment.end_date:
+            return recurring_payment.end_date
+
+        return next_date
+
+    @staticmethod
+    def next_occurrence(schedule_type: str, schedule_config: dict, current_date: date) -> date:
+        """Следующая дата по расписанию после current_date"""
         if schedule_type == "daily":
-            next_date = current_date + timedelta(days=1)
+            return current_date + timedelta(days=1)
         elif schedule_type == "weekly":
             day_of_week = schedule_config.get("day_of_week", 0)
             days_ahead = (day_of_week - current_date.weekday()) % 7
             if days_ahead == 0:
                 days_ahead = 7  # Next week
-            next_date = current_date + timedelta(days=days_ahead)
+            return current_date + timedelta(days=days_ahead)
         elif schedule_type == "monthly":
-            day_of_month = schedule_config.get("day_of_month", 1)
-            # Move to next month
             next_month = current_date + relativedelta(months=1)
-            # Try to set the day, if it doesn't exist in the month, use the last day
-            try:
-                next_date = next_month.replace(day=day_of_month)
-            except ValueError:
-                # Last day of the month
-                next_date = next_month.replace(day=1) + relativedelta(months=1) - timedelta(days=1)
+            return PaymentCalculator._clamped_date(next_month.year, next_month.month, schedule_config.get("day_of_month", 1))
         elif schedule_type == "yearly":
-            month = schedule_config.get("month", 1)
-            day = schedule_config.get("day", 1)
-            # Move to next year
-            next_year = current_date + relativedelta(years=1)
-            try:
-                next_date = next_year.replace(month=month, day=day)
-            except ValueError:
-                # Last day of the month
-                next_date = next_year.replace(month=month, day=1) + relativedelta(months=1) - timedelta(days=1)
+            return PaymentCalculator._clamped_date(
+                current_date.year + 1, schedule_config.get("month", 1), schedule_config.get("day", 1)
+            )
         else:
             raise ValueError(f"Unsupported schedule type: {schedule_type}")
 
-        # Check if we've reached the end date
-        if recurring_payment.end_date and next_date > recurring_payment.end_date:
-            return recurring_payment.end_date
+    @staticmethod
+    def iter_occurrences(schedule_type: str, schedule_config: dict, first_date: date, until: date) -> Iterator[date]:
+        """
+        Все даты выполнения от first_date до until включительно.
+        После второй даты k-я дата вычисляется напрямую (смещение на k периодов от нее),
+        без пошагового пересчета.
+        """
+        if first_date > until:
+            return
+        yield first_date
 
-        return next_date
+        second_date = PaymentCalculator.next_occurrence(schedule_type, schedule_config, first_date)
+        if schedule_type in ("daily", "weekly"):
+            step = 1 if schedule_type == "daily" else 7
+            count = (until - second_date).days // step + 1
+            for k in range(max(count, 0)):
+                yield second_date + timedelta(days=k * step)
+        elif schedule_type == "monthly":
+            day_of_month = schedule_config.get("day_of_month", 1)
+            k = 0
+            while True:
+                occurrence = PaymentCalculator._clamped_date(second_date.year, second_date.month + k, day_of_month)
+                if occurrence > until:
+                    break
+                yield occurrence
+                k += 1
+        else:  # yearly
+            month = schedule_config.get("month", 1)
+            day = schedule_config.get("day", 1)
+            k = 0
+            while True:
+                occurrence = PaymentCalculator._clamped_date(second_date.year + k, month, day)
+                if occurrence > until:
+                    break
+                yield occurrence
+                k += 1
+
+    @staticmethod
+    def missed_occurrences(recurring_payment: RecurringPayment, until: date, limit: Optional[int] = None) -> List[date]:
+        """Даты выполнения от next_execution до until (и не позже end_date), не более limit"""
+        if recurring_payment.end_date and recurring_payment.end_date < until:
+            until = recurring_payment.end_date
+        occurrences = PaymentCalculator.iter_occurrences(
+            recurring_payment.schedule_type,
+            recurring_payment.schedule_config or {},
+            recurring_payment.next_execution,
+            until
+        )
+        return list(islice(occurrences, limit))
+
+    @staticmethod
+    def _clamped_date(year: int, month: int, day: int) -> date:
+        """Дата с нормализацией месяца (>12 переносится на следующий год) и днем не позже конца месяца"""
+        year += (month - 1) // 12
+        month = (month - 1) % 12 + 1
+        return date(year, month, min(day, calendar.monthrange(year, month)[1]))
 
     @staticmethod
     def should_execute_today(recurring_payment: RecurringPayment, today: Optional[date] = None) -> bool:
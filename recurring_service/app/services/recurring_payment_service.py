@@ -1,8 +1,11 @@
+from collections import Counter, defaultdict
 from datetime import date, datetime, timedelta
+from decimal import Decimal
 from typing import Optional, List, Tuple
 from uuid import UUID
+from dateutil.relativedelta import relativedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func, or_, select, true
 
 from app.models.recurring_payment import RecurringPayment
 from app.models.payment_schedule import PaymentSchedule
@@ -11,13 +14,16 @@ from app.schemas.recurring_payment import (
     RecurringPaymentUpdate,
     RecurringPaymentResponse,
     RecurringPaymentListResponse,
-    RecurringPaymentStatusUpdate
+    RecurringPaymentStatusUpdate,
+    PaymentForecastItem,
+    PaymentForecastResponse
 )
 from app.schemas.payment_schedule import (
     PaymentScheduleResponse,
     PaymentScheduleListResponse
 )
 from app.services.payment_calculator import PaymentCalculator
+from app.services.forecast_cache import forecast_cache
 from app.clients.expense_client import ExpenseServiceClient
 from app.clients.income_client import IncomeServiceClient
 from app.clients.category_client import CategoryServiceClient
@@ -68,6 +74,7 @@ class RecurringPaymentService:
         db.add(recurring_payment)
         db.commit()
         db.refresh(recurring_payment)
+        forecast_cache.invalidate(user_id)
 
         logger.info(f"Created recurring payment {recurring_payment.id} for user {user_id}")
         return recurring_payment
@@ -153,6 +160,7 @@ class RecurringPaymentService:
 
         db.commit()
         db.refresh(payment)
+        forecast_cache.invalidate(user_id)
 
         logger.info(f"Updated recurring payment {payment_id} for user {user_id}")
         return payment
@@ -174,6 +182,7 @@ class RecurringPaymentService:
 
         db.delete(payment)
         db.commit()
+        forecast_cache.invalidate(user_id)
 
         logger.info(f"Deleted recurring payment {payment_id} for user {user_id}")
     
@@ -198,6 +207,7 @@ class RecurringPaymentService:
         payment.status = 'paused'
         db.commit()
         db.refresh(payment)
+        forecast_cache.invalidate(user_id)
 
         logger.info(f"Paused recurring payment {payment_id} for user {user_id}")
     
@@ -222,6 +232,7 @@ class RecurringPaymentService:
         payment.status = 'active'
         db.commit()
         db.refresh(payment)
+        forecast_cache.invalidate(user_id)
 
         logger.info(f"Resumed recurring payment {payment_id} for user {user_id}")
     
@@ -288,48 +299,159 @@ class RecurringPaymentService:
             pages=(total + size - 1) // size
         )
     
+    def get_payment_forecast(
+        self,
+        user_id: int,
+        db: Session,
+        horizon: int = 3,
+        group_by: str = "month",
+        today: Optional[date] = None
+    ) -> PaymentForecastResponse:
+        """
+        Прогноз будущих выполнений активных платежей на horizon месяцев вперед.
+        Расписания разворачиваются через PaymentCalculator.iter_occurrences без записи в БД,
+        суммы агрегируются по дням или месяцам отдельно для каждой валюты.
+        """
+        if group_by not in ("day", "month"):
+            raise ValueError("group_by must be 'day' or 'month'")
+
+        today = today or date.today()
+        cache_key = (today, horizon, group_by)
+        version = self._forecast_version(user_id, db)
+        cached = forecast_cache.get(user_id, cache_key, version)
+        if cached is not None:
+            return cached
+
+        until = today + relativedelta(months=horizon)
+        payments = db.query(
+            RecurringPayment.amount,
+            RecurringPayment.currency,
+            RecurringPayment.payment_type,
+            RecurringPayment.schedule_type,
+            RecurringPayment.schedule_config,
+            RecurringPayment.next_execution,
+            RecurringPayment.end_date
+        ).filter(
+            RecurringPayment.user_id == user_id,
+            RecurringPayment.status == "active",
+            RecurringPayment.next_execution <= until,
+            or_(RecurringPayment.end_date.is_(None), RecurringPayment.end_date >= today)
+        ).all()
+
+        # (период, валюта) -> [расходы, доходы, количество]
+        buckets = defaultdict(lambda: [Decimal("0"), Decimal("0"), 0])
+        # Платежи с одинаковым расписанием разворачиваются один раз
+        period_counts = {}
+        for payment in payments:
+            last_date = min(until, payment.end_date) if payment.end_date else until
+            # Просроченный платеж шедулер выполнит сегодня и продолжит расписание от сегодняшней даты
+            first_date = max(payment.next_execution, today)
+            schedule_config = payment.schedule_config or {}
+            schedule_key = (payment.schedule_type, tuple(sorted(schedule_config.items())), first_date, last_date)
+            counts = period_counts.get(schedule_key)
+            if counts is None:
+                occurrences = PaymentCalculator.iter_occurrences(
+                    payment.schedule_type, schedule_config, first_date, last_date
+                )
+                if group_by == "month":
+                    counts = Counter((occurrence.year, occurrence.month) for occurrence in occurrences)
+                else:
+                    counts = Counter(occurrences)
+                period_counts[schedule_key] = counts
+
+            # Сумма умножается один раз на период, а не складывается на каждую дату
+            column = 0 if payment.payment_type == "EXPENSE" else 1
+            for period, count in counts.items():
+                bucket = buckets[(period, payment.currency)]
+                bucket[column] += payment.amount * count
+                bucket[2] += count
+
+        items = []
+        totals = defaultdict(lambda: [Decimal("0"), Decimal("0"), 0])
+        for (period, currency), (expenses, incomes, count) in sorted(buckets.items()):
+            items.append(PaymentForecastItem(
+                period=f"{period[0]:04d}-{period[1]:02d}" if group_by == "month" else period.isoformat(),
+                currency=currency,
+                expenses=expenses,
+                incomes=incomes,
+                net=incomes - expenses,
+                payments_count=count
+            ))
+            total = totals[currency]
+            total[0] += expenses
+            total[1] += incomes
+            total[2] += count
+
+        forecast = PaymentForecastResponse(
+            date_from=today,
+            date_to=until,
+            group_by=group_by,
+            items=items,
+            totals=[
+                PaymentForecastItem(
+                    period="total",
+                    currency=currency,
+                    expenses=expenses,
+                    incomes=incomes,
+                    net=incomes - expenses,
+                    payments_count=count
+                )
+                for currency, (expenses, incomes, count) in sorted(totals.items())
+            ]
+        )
+        forecast_cache.set(user_id, cache_key, forecast, version)
+        return forecast
+
+    @staticmethod
+    def _forecast_version(user_id: int, db: Session) -> Tuple[int, Optional[datetime]]:
+        """
+        Версия платежей пользователя для кэша прогнозов: число платежей и последний updated_at.
+        Меняется при любом создании, изменении и удалении, в том числе из другой реплики
+        и при переносе next_execution шедулером.
+        """
+        count, last_updated = db.query(
+            func.count(RecurringPayment.id),
+            func.max(RecurringPayment.updated_at)
+        ).filter(RecurringPayment.user_id == user_id).one()
+        return count, last_updated
+
     def get_payment_statistics(
         self, 
         user_id: int, 
         db: Session
     ) -> dict:
-        """Получить статистику по повторяющимся платежам"""
-        # Общая статистика
-        total_payments = db.query(RecurringPayment).filter(
-            RecurringPayment.user_id == user_id
-        ).count()
-
-        active_payments = db.query(RecurringPayment).filter(
-            RecurringPayment.user_id == user_id,
-            RecurringPayment.status == "active"
-        ).count()
+        """Получить статистику по повторяющимся платежам (один запрос к БД)"""
+        month_ago = datetime.utcnow() - timedelta(days=30)
 
-        paused_payments = db.query(RecurringPayment).filter(
-            RecurringPayment.user_id == user_id,
-            RecurringPayment.status == "paused"
-        ).count()
+        # Каждый подзапрос возвращает ровно одну строку, поэтому их декартово произведение - одна строка
+        payment_counts = select(
+            func.count().label("total_payments"),
+            func.count().filter(RecurringPayment.status == "active").label("active_payments"),
+            func.count().filter(RecurringPayment.status == "paused").label("paused_payments")
+        ).where(
+            RecurringPayment.user_id == user_id
+        ).subquery()
 
         # Статистика по выполненным платежам за последний месяц
-        month_ago = datetime.utcnow() - timedelta(days=30)
-        
-        executed_this_month = db.query(PaymentSchedule).join(RecurringPayment).filter(
+        schedule_counts = select(
+            func.count().filter(PaymentSchedule.status == "executed").label("executed_this_month"),
+            func.count().filter(PaymentSchedule.status == "failed").label("failed_this_month")
+        ).select_from(PaymentSchedule).join(RecurringPayment).where(
             RecurringPayment.user_id == user_id,
-            PaymentSchedule.status == "executed",
+            PaymentSchedule.status.in_(["executed", "failed"]),
             PaymentSchedule.executed_at >= month_ago
-        ).count()
+        ).subquery()
 
-        failed_this_month = db.query(PaymentSchedule).join(RecurringPayment).filter(
-            RecurringPayment.user_id == user_id,
-            PaymentSchedule.status == "failed",
-            PaymentSchedule.executed_at >= month_ago
-        ).count()
+        row = db.execute(
+            select(payment_counts, schedule_counts).select_from(payment_counts.join(schedule_counts, true()))
+        ).one()
 
         return {
-            "total_payments": total_payments,
-            "active_payments": active_payments,
-            "paused_payments": paused_payments,
-            "executed_this_month": executed_this_month,
-            "failed_this_month": failed_this_month
+            "total_payments": row.total_payments,
+            "active_payments": row.active_payments,
+            "paused_payments": row.paused_payments,
+            "executed_this_month": row.executed_this_month,
+            "failed_this_month": row.failed_this_month
         }
 
 
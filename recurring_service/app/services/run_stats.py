@@ -0,0 +1,40 @@
+import math
+from collections import Counter
+from typing import Dict, List, Optional
+
+
+class RunStats:
+    """
+    Счетчики одного запуска выполнения платежей.
+
+    Одна единица - выполнение платежа за дату (в режиме догонки у платежа их может быть несколько).
+    Задержка - длительность пакетного запроса к expense/income service; платежи создаются
+    пакетами, поэтому задержка учитывается один раз на пакет, а не на каждый платеж.
+    """
+
+    def __init__(self):
+        self.due = 0
+        self.executed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.errors: Counter = Counter()
+        self._latencies: List[float] = []
+
+    def record_latency(self, seconds: float) -> None:
+        self._latencies.append(seconds)
+
+    def record_failure(self, kind: str, count: int = 1) -> None:
+        self.failed += count
+        self.errors[kind] += count
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Перцентиль задержки пакетных запросов в секундах (nearest-rank), None если запросов не было"""
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        rank = max(math.ceil(percentile / 100 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+    @property
+    def error_breakdown(self) -> Dict[str, int]:
+        return dict(self.errors)
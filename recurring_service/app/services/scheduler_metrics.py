@@ -0,0 +1,124 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.database import get_pool_status
+from app.models.scheduler_run import SchedulerRun
+
+# Сколько последних запусков просматривается в поиске последнего завершенного запуска каждой партиции
+RECENT_RUNS_LIMIT = 100
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class _MetricsWriter:
+    """Формирование текстового формата экспозиции Prometheus"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def metric(self, name: str, metric_type: str, description: str, samples: List[Tuple[Dict[str, str], float]]) -> None:
+        self.lines.append(f"# HELP {name} {description}")
+        self.lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in samples:
+            label_text = ",".join(f'{key}="{_escape_label(label)}"' for key, label in labels.items())
+            self.lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _last_finished_runs(db: Session) -> List[SchedulerRun]:
+    """Последний завершенный запуск каждой партиции"""
+    runs: Dict[str, SchedulerRun] = {}
+    recent = db.query(SchedulerRun).filter(
+        SchedulerRun.finished_at.isnot(None)
+    ).order_by(SchedulerRun.started_at.desc()).limit(RECENT_RUNS_LIMIT)
+    for run in recent:
+        runs.setdefault(run.partition_key, run)
+    return list(runs.values())
+
+
+def _timestamp(value: Optional[datetime]) -> float:
+    # Время в БД хранится в UTC без часового пояса
+    return (value - datetime(1970, 1, 1)).total_seconds() if value else 0.0
+
+
+def render_metrics(db: Session) -> str:
+    """Метрики запусков шедулера и пула соединений в формате Prometheus"""
+    writer = _MetricsWriter()
+
+    run_counts = db.query(SchedulerRun.status, func.count()).group_by(SchedulerRun.status).all()
+    writer.metric(
+        "recurring_scheduler_runs_total", "counter", "Scheduler runs by final status",
+        [({"status": status}, count) for status, count in run_counts]
+    )
+
+    runs = _last_finished_runs(db)
+    writer.metric(
+        "recurring_scheduler_last_run_timestamp_seconds", "gauge", "Finish time of the last run",
+        [({"partition": run.partition_key}, _timestamp(run.finished_at)) for run in runs]
+    )
+    writer.metric(
+        "recurring_scheduler_last_run_duration_seconds", "gauge", "Duration of the last run",
+        [({"partition": run.partition_key}, run.duration_seconds) for run in runs]
+    )
+    writer.metric(
+        "recurring_scheduler_last_run_success", "gauge", "Whether the last run completed without an exception",
+        [({"partition": run.partition_key}, 1 if run.status == "completed" else 0) for run in runs]
+    )
+    writer.metric(
+        "recurring_scheduler_last_run_payments", "gauge", "Payment executions in the last run by result",
+        [
+            ({"partition": run.partition_key, "result": result}, count)
+            for run in runs
+            for result, count in (
+                ("due", run.due_count),
+                ("executed", run.executed_count),
+                ("failed", run.failed_count),
+                ("skipped", run.skipped_count),
+            )
+        ]
+    )
+    writer.metric(
+        "recurring_scheduler_last_run_batch_latency_seconds", "gauge", "Bulk create request latency quantiles of the last run",
+        [
+            ({"partition": run.partition_key, "quantile": quantile}, latency_ms / 1000)
+            for run in runs
+            for quantile, latency_ms in (("0.5", run.latency_p50_ms), ("0.95", run.latency_p95_ms))
+            if latency_ms is not None
+        ]
+    )
+    writer.metric(
+        "recurring_scheduler_last_run_errors", "gauge", "Failed payment executions in the last run by error kind",
+        [
+            ({"partition": run.partition_key, "kind": kind}, count)
+            for run in runs
+            for kind, count in sorted((run.error_breakdown or {}).items())
+        ]
+    )
+
+    pool = get_pool_status()
+    writer.metric(
+        "recurring_db_pool_checkouts_total", "counter", "Database connection checkouts",
+        [({}, pool["checkouts"])]
+    )
+    writer.metric(
+        "recurring_db_pool_timeouts_total", "counter", "Database connection checkouts that timed out",
+        [({}, pool["timeouts"])]
+    )
+    writer.metric(
+        "recurring_db_pool_checkout_wait_max_seconds", "gauge", "Longest wait for a database connection",
+        [({}, pool["max_wait_ms"] / 1000)]
+    )
+    if "checked_out" in pool:
+        writer.metric(
+            "recurring_db_pool_checked_out", "gauge", "Database connections currently in use",
+            [({}, pool["checked_out"])]
+        )
+
+    return writer.render()
@@ -4,8 +4,10 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from sqlalchemy.orm import Session
 
-from app.database import SessionLocal
+from app.config import settings
+from app.database import SessionLocal, engine
 from app.services.executor import PaymentExecutor
+from app.services.leader_election import AdvisoryLock
 from app.clients.expense_client import ExpenseServiceClient
 from app.clients.income_client import IncomeServiceClient
 from app.clients.category_client import CategoryServiceClient
@@ -20,6 +22,7 @@ class SchedulerService:
     def __init__(self):
         self.scheduler = AsyncIOScheduler()
         self.executor = None
+        self.leader_lock = AdvisoryLock(engine, settings.SCHEDULER_LOCK_KEY)
         self._setup_executor()
     
     def _setup_executor(self):
@@ -42,7 +45,7 @@ class SchedulerService:
             )
             
             self.scheduler.start()
-            logger.info("Scheduler started - recurring payments will be executed daily at 00:01")
+            logger.info(f"Scheduler started in '{settings.SCHEDULER_MODE}' mode - recurring payments will be executed daily at 00:01")
         else:
             logger.warning("Scheduler is already running")
     
@@ -56,8 +59,24 @@ class SchedulerService:
     
     async def _execute_recurring_payments(self):
         """Выполнить повторяющиеся платежи (вызывается шедулером)"""
-        logger.info("Starting scheduled execution of recurring payments")
-        
+        if settings.SCHEDULER_MODE != "leader":
+            await self._run_executor()
+            return
+
+        # Выполняет только реплика, захватившая advisory lock
+        try:
+            with self.leader_lock.acquire() as is_leader:
+                if not is_leader:
+                    logger.info("Skipping scheduled execution: another replica holds the scheduler lock")
+                    return
+                await self._run_executor()
+        except Exception as e:
+            logger.error(f"Leader election failed: {str(e)}")
+
+    async def _run_executor(self):
+        """Запустить executor в отдельной сессии"""
+        logger.info(f"Starting scheduled execution of recurring payments (partition {self.executor.partition_key})")
+
         db = SessionLocal()
         try:
             executed_count = await self.executor.execute_pending_payments(db)
@@ -71,6 +90,8 @@ class SchedulerService:
         """Получить статус шедулера"""
         return {
             "running": self.scheduler.running,
+            "mode": settings.SCHEDULER_MODE,
+            "partition": self.executor.partition_key,
             "jobs": [
                 {
                     "id": job.id,
@@ -0,0 +1,167 @@
+import asyncio
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.config import settings
+from app.models.execution_checkpoint import ExecutionCheckpoint
+from app.models.payment_schedule import PaymentSchedule
+from app.models.recurring_payment import RecurringPayment
+from app.models.scheduler_run import SchedulerRun
+from app.services.executor import PaymentExecutor
+
+
+class FakeExpenseService:
+    """
+    Stand-in for expense_service bulk create: deduplicates by idempotency key
+    like the real endpoint. With `hang_first_call` the first request stores the
+    expenses and then does not answer in time.
+    """
+
+    def __init__(self, hang_first_call: bool = False, rejected_amounts=()):
+        self.hang_first_call = hang_first_call
+        self.rejected_amounts = set(rejected_amounts)
+        self.calls = 0
+        self.postings = {}
+
+    async def create_expenses_bulk(self, items):
+        self.calls += 1
+        results = []
+        for index, item in enumerate(items):
+            if item["expense"]["amount"] in self.rejected_amounts:
+                results.append({"index": index, "error": "Expense date cannot be in the future"})
+                continue
+            expense_id = self.postings.setdefault(item["idempotency_key"], (len(self.postings) + 1, item["expense"]))[0]
+            results.append({"index": index, "id": expense_id})
+        if self.hang_first_call and self.calls == 1:
+            await asyncio.sleep(5)
+        return {"results": results}
+
+
+def make_executor(session_factory, expense_client, income_client=None):
+    category_client = MagicMock()
+    category_client.get_category = AsyncMock(return_value={"id": 1})
+    return PaymentExecutor(expense_client, income_client or MagicMock(), category_client, session_factory)
+
+
+def add_payment(db, **overrides):
+    fields = {
+        "user_id": 1,
+        "name": "Подписка",
+        "amount": Decimal("100.00"),
+        "currency": "USD",
+        "category_id": 1,
+        "payment_type": "EXPENSE",
+        "schedule_type": "monthly",
+        "schedule_config": {"day_of_month": 15},
+        "start_date": date(2024, 1, 15),
+        "next_execution": date(2024, 1, 15),
+    }
+    fields.update(overrides)
+    payment = RecurringPayment(**fields)
+    db.add(payment)
+    db.commit()
+    return payment
+
+
+def run(executor, db, execution_date):
+    return asyncio.run(executor.execute_pending_payments(db, execution_date))
+
+
+class TestExecutionAfterTimeout:
+
+    def test_timed_out_payment_is_posted_once_on_next_day(self, db, session_factory):
+        payment = add_payment(db)
+        expense_service = FakeExpenseService(hang_first_call=True)
+        executor = make_executor(session_factory, expense_service)
+
+        with patch.object(settings, "EXECUTOR_CATCH_UP", False), \
+             patch.object(settings, "EXECUTOR_BATCH_TIMEOUT", 0.2):
+            assert run(executor, db, date(2024, 1, 15)) == 0
+            # Downstream created the expense, but the run saw a timeout
+            assert len(expense_service.postings) == 1
+
+            assert run(executor, db, date(2024, 1, 16)) == 1
+
+        assert expense_service.calls == 2
+        assert len(expense_service.postings) == 1
+        (_, expense), = expense_service.postings.values()
+        assert expense["date"] == "2024-01-15"
+
+        db.expire_all()
+        schedules = db.query(PaymentSchedule).filter(PaymentSchedule.recurring_payment_id == payment.id).all()
+        assert [(schedule.execution_date, schedule.status) for schedule in schedules] == [(date(2024, 1, 15), "executed")]
+        assert db.get(RecurringPayment, payment.id).next_execution > date(2024, 1, 16)
+
+
+class TestBatchResults:
+
+    def test_partial_failure_is_mapped_per_item(self, db, session_factory):
+        payments = [add_payment(db, amount=Decimal(amount)) for amount in ("10.00", "13.00", "20.00")]
+        expense_service = FakeExpenseService(rejected_amounts={13.0})
+        executor = make_executor(session_factory, expense_service)
+
+        assert run(executor, db, date(2024, 1, 15)) == 2
+
+        db.expire_all()
+        statuses = {}
+        for payment in payments:
+            schedule = db.query(PaymentSchedule).filter(PaymentSchedule.recurring_payment_id == payment.id).one()
+            statuses[float(payment.amount)] = (schedule.status, schedule.created_expense_id, schedule.error_message)
+        assert statuses[13.0] == ("failed", None, "Expense date cannot be in the future")
+        assert statuses[10.0][0] == statuses[20.0][0] == "executed"
+        assert {statuses[10.0][1], statuses[20.0][1]} == {1, 2}
+
+        # Неудачный платеж остается на своей дате и повторится в следующий запуск
+        assert db.get(RecurringPayment, payments[1].id).next_execution == date(2024, 1, 15)
+        scheduler_run = db.query(SchedulerRun).one()
+        assert (scheduler_run.executed_count, scheduler_run.failed_count) == (2, 1)
+        assert scheduler_run.error_breakdown == {"expense_rejected": 1}
+
+    def test_missing_result_fails_only_that_item(self, db, session_factory):
+        first = add_payment(db)
+        second = add_payment(db)
+        expense_client = MagicMock()
+        expense_client.create_expenses_bulk = AsyncMock(return_value={"results": [{"index": 0, "id": 7}]})
+        executor = make_executor(session_factory, expense_client)
+
+        assert run(executor, db, date(2024, 1, 15)) == 1
+
+        db.expire_all()
+        schedules = db.query(PaymentSchedule).filter(
+            PaymentSchedule.recurring_payment_id.in_([first.id, second.id])
+        ).all()
+        assert sorted((schedule.status, schedule.error_message or "") for schedule in schedules) == [
+            ("executed", ""), ("failed", "Missing result in batch response")
+        ]
+
+    def test_failed_request_fails_whole_batch(self, db, session_factory):
+        add_payment(db)
+        add_payment(db)
+        expense_client = MagicMock()
+        expense_client.create_expenses_bulk = AsyncMock(side_effect=RuntimeError("connection reset"))
+        executor = make_executor(session_factory, expense_client)
+
+        assert run(executor, db, date(2024, 1, 15)) == 0
+
+        db.expire_all()
+        assert {schedule.status for schedule in db.query(PaymentSchedule)} == {"failed"}
+        assert db.query(SchedulerRun).one().error_breakdown == {"expense_error": 2}
+
+
+class TestChunkedRun:
+
+    def test_all_chunks_are_processed_with_one_category_check(self, db, session_factory):
+        for _ in range(5):
+            add_payment(db)
+        expense_service = FakeExpenseService()
+        executor = make_executor(session_factory, expense_service)
+
+        with patch.object(settings, "EXECUTOR_CHUNK_SIZE", 2):
+            assert run(executor, db, date(2024, 1, 15)) == 5
+
+        assert expense_service.calls == 3
+        executor.category_client.get_category.assert_awaited_once_with(1, 1)
+        checkpoint = db.query(ExecutionCheckpoint).one()
+        assert checkpoint.processed_count == 5
+        assert checkpoint.completed_at is not None
@@ -0,0 +1,102 @@
+from datetime import date
+from decimal import Decimal
+
+from app.models.recurring_payment import RecurringPayment
+from app.services.forecast_cache import ForecastCache, forecast_cache
+from app.services.recurring_payment_service import RecurringPaymentService
+
+
+TODAY = date(2024, 1, 10)
+
+
+def add_payment(db, user_id=1, **overrides):
+    fields = {
+        "user_id": user_id,
+        "name": "Подписка",
+        "amount": Decimal("100.00"),
+        "currency": "USD",
+        "category_id": 1,
+        "payment_type": "EXPENSE",
+        "schedule_type": "monthly",
+        "schedule_config": {"day_of_month": 15},
+        "start_date": date(2024, 1, 15),
+        "next_execution": date(2024, 1, 15),
+    }
+    fields.update(overrides)
+    payment = RecurringPayment(**fields)
+    db.add(payment)
+    db.commit()
+    return payment
+
+
+def forecast_expenses(service, db, user_id=1):
+    forecast = service.get_payment_forecast(user_id, db, horizon=3, group_by="month", today=TODAY)
+    return [total.expenses for total in forecast.totals]
+
+
+class TestForecastCache:
+
+    def test_changed_version_drops_entries(self):
+        cache = ForecastCache(ttl=60, max_users=10)
+        cache.set(1, "key", "forecast", version=(1, "a"))
+
+        assert cache.get(1, "key", version=(1, "a")) == "forecast"
+        assert cache.get(1, "key", version=(1, "b")) is None
+        assert cache.size == 0
+
+    def test_expired_entry_is_not_returned(self):
+        cache = ForecastCache(ttl=-1, max_users=10)
+        cache.set(1, "key", "forecast")
+
+        assert cache.get(1, "key") is None
+
+    def test_least_recent_user_is_evicted(self):
+        cache = ForecastCache(ttl=60, max_users=2)
+        cache.set(1, "key", "first")
+        cache.set(2, "key", "second")
+        cache.get(1, "key")
+        cache.set(3, "key", "third")
+
+        assert cache.get(2, "key") is None
+        assert cache.get(1, "key") == "first"
+
+
+class TestForecastInvalidation:
+
+    def setup_method(self):
+        forecast_cache.invalidate(1)
+
+    def test_repeated_forecast_is_cached(self, db):
+        add_payment(db)
+        service = RecurringPaymentService()
+
+        first = service.get_payment_forecast(1, db, horizon=3, group_by="month", today=TODAY)
+        second = service.get_payment_forecast(1, db, horizon=3, group_by="month", today=TODAY)
+
+        assert second is first
+
+    def test_change_from_another_session_is_visible_without_invalidate(self, db, session_factory):
+        payment = add_payment(db)
+        service = RecurringPaymentService()
+        assert forecast_expenses(service, db) == [Decimal("300.00")]
+
+        # Другая реплика или шедулер переносит next_execution, не трогая локальный кэш
+        other = session_factory()
+        other.get(RecurringPayment, payment.id).next_execution = date(2024, 2, 15)
+        other.commit()
+        other.close()
+
+        assert forecast_expenses(service, db) == [Decimal("200.00")]
+
+    def test_deleted_payment_is_not_forecast(self, db, session_factory):
+        add_payment(db)
+        payment = add_payment(db, amount=Decimal("50.00"))
+        service = RecurringPaymentService()
+        assert forecast_expenses(service, db) == [Decimal("450.00")]
+
+        other = session_factory()
+        other.delete(other.get(RecurringPayment, payment.id))
+        other.commit()
+        other.close()
+
+        assert forecast_expenses(service, db) == [Decimal("300.00")]
@@ -0,0 +1,143 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from app.config import settings
+from app.models.recurring_payment import RecurringPayment
+from app.services.executor import PaymentExecutor
+from app.services.payment_calculator import PaymentCalculator
+
+
+def stepwise_occurrences(schedule_type, schedule_config, first_date, until):
+    """Эталон: пошаговый пересчет через next_occurrence"""
+    occurrences = []
+    current = first_date
+    while current <= until:
+        occurrences.append(current)
+        current = PaymentCalculator.next_occurrence(schedule_type, schedule_config, current)
+    return occurrences
+
+
+def make_payment(**overrides):
+    fields = {
+        "schedule_type": "monthly",
+        "schedule_config": {"day_of_month": 31},
+        "start_date": date(2024, 1, 31),
+        "next_execution": date(2024, 1, 31),
+        "end_date": None,
+        "status": "active",
+    }
+    fields.update(overrides)
+    return RecurringPayment(**fields)
+
+
+class TestNextOccurrence:
+
+    @pytest.mark.parametrize("current, expected", [
+        (date(2024, 1, 31), date(2024, 2, 29)),  # високосный год
+        (date(2023, 1, 31), date(2023, 2, 28)),
+        (date(2024, 2, 29), date(2024, 3, 31)),  # после обрезки возвращается к 31 числу
+        (date(2024, 3, 31), date(2024, 4, 30)),
+        (date(2024, 12, 31), date(2025, 1, 31)),
+    ])
+    def test_monthly_clamps_to_month_end(self, current, expected):
+        assert PaymentCalculator.next_occurrence("monthly", {"day_of_month": 31}, current) == expected
+
+    @pytest.mark.parametrize("current, expected", [
+        (date(2024, 2, 29), date(2025, 2, 28)),
+        (date(2027, 2, 28), date(2028, 2, 29)),
+    ])
+    def test_yearly_feb_29(self, current, expected):
+        assert PaymentCalculator.next_occurrence("yearly", {"month": 2, "day": 29}, current) == expected
+
+    def test_weekly_moves_to_next_week_on_same_weekday(self):
+        monday = date(2024, 1, 1)
+        assert PaymentCalculator.next_occurrence("weekly", {"day_of_week": 0}, monday) == date(2024, 1, 8)
+        assert PaymentCalculator.next_occurrence("weekly", {"day_of_week": 2}, monday) == date(2024, 1, 3)
+
+    def test_unsupported_schedule_type(self):
+        with pytest.raises(ValueError):
+            PaymentCalculator.next_occurrence("hourly", {}, date(2024, 1, 1))
+
+
+class TestIterOccurrences:
+
+    def test_monthly_day_31_over_two_years(self):
+        occurrences = list(PaymentCalculator.iter_occurrences("monthly", {"day_of_month": 31}, date(2023, 1, 31), date(2024, 12, 31)))
+
+        assert len(occurrences) == 24
+        assert occurrences[1] == date(2023, 2, 28)
+        assert occurrences[13] == date(2024, 2, 29)
+        assert all(day.day == min(31, (day.replace(day=28) + timedelta(days=4)).replace(day=1).__sub__(timedelta(days=1)).day) for day in occurrences)
+
+    def test_yearly_feb_29_across_leap_years(self):
+        occurrences = list(PaymentCalculator.iter_occurrences("yearly", {"month": 2, "day": 29}, date(2024, 2, 29), date(2032, 12, 31)))
+
+        assert occurrences == [
+            date(2024, 2, 29), date(2025, 2, 28), date(2026, 2, 28), date(2027, 2, 28),
+            date(2028, 2, 29), date(2029, 2, 28), date(2030, 2, 28), date(2031, 2, 28), date(2032, 2, 29),
+        ]
+
+    @pytest.mark.parametrize("schedule_type, schedule_config, first_date", [
+        ("daily", {}, date(2024, 2, 27)),
+        ("weekly", {"day_of_week": 4}, date(2024, 1, 5)),
+        ("weekly", {"day_of_week": 6}, date(2024, 1, 3)),
+        ("monthly", {"day_of_month": 1}, date(2024, 1, 1)),
+        ("monthly", {"day_of_month": 29}, date(2023, 1, 29)),
+        ("monthly", {"day_of_month": 30}, date(2023, 12, 30)),
+        ("monthly", {"day_of_month": 31}, date(2023, 10, 31)),
+        ("monthly", {"day_of_month": 15}, date(2024, 1, 20)),  # первая дата не совпадает с днем расписания
+        ("yearly", {"month": 2, "day": 29}, date(2023, 2, 28)),
+        ("yearly", {"month": 12, "day": 31}, date(2020, 12, 31)),
+    ])
+    def test_matches_stepwise_calculation(self, schedule_type, schedule_config, first_date):
+        until = date(2036, 3, 1)
+
+        closed_form = list(PaymentCalculator.iter_occurrences(schedule_type, schedule_config, first_date, until))
+
+        assert closed_form == stepwise_occurrences(schedule_type, schedule_config, first_date, until)
+
+    def test_until_is_inclusive(self):
+        occurrences = list(PaymentCalculator.iter_occurrences("monthly", {"day_of_month": 31}, date(2024, 1, 31), date(2024, 3, 31)))
+        assert occurrences == [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31)]
+
+    def test_first_date_after_until_is_empty(self):
+        assert list(PaymentCalculator.iter_occurrences("daily", {}, date(2024, 2, 1), date(2024, 1, 31))) == []
+
+
+class TestMissedOccurrences:
+
+    def test_bounded_by_end_date(self):
+        payment = make_payment(end_date=date(2024, 4, 15))
+
+        assert PaymentCalculator.missed_occurrences(payment, date(2024, 12, 31)) == [
+            date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31)
+        ]
+
+    def test_end_date_on_occurrence_is_included(self):
+        payment = make_payment(end_date=date(2024, 2, 29))
+
+        assert PaymentCalculator.missed_occurrences(payment, date(2024, 12, 31)) == [date(2024, 1, 31), date(2024, 2, 29)]
+
+    def test_limit_caps_occurrences(self):
+        payment = make_payment(schedule_type="daily", schedule_config={}, next_execution=date(2020, 1, 1))
+
+        occurrences = PaymentCalculator.missed_occurrences(payment, date(2024, 12, 31), limit=10)
+
+        assert occurrences == [date(2020, 1, 1) + timedelta(days=k) for k in range(10)]
+
+    def test_catch_up_is_capped_by_setting(self):
+        payment = make_payment(schedule_type="daily", schedule_config={}, next_execution=date(2020, 1, 1))
+
+        with patch.object(settings, "EXECUTOR_CATCH_UP", True), \
+             patch.object(settings, "CATCH_UP_MAX_OCCURRENCES", 5):
+            occurrences = PaymentExecutor._occurrence_dates(payment, date(2024, 1, 1))
+
+        assert occurrences == [date(2020, 1, k) for k in range(1, 6)]
+
+    def test_without_catch_up_only_scheduled_date(self):
+        payment = make_payment(next_execution=date(2020, 1, 31))
+
+        with patch.object(settings, "EXECUTOR_CATCH_UP", False):
+            assert PaymentExecutor._occurrence_dates(payment, date(2024, 1, 1)) == [date(2020, 1, 31)]
@@ -0,0 +1,88 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.dependencies import verify_metrics_token
+from app.models.payment_schedule import PaymentSchedule
+from app.models.recurring_payment import RecurringPayment
+from app.models.scheduler_run import SchedulerRun
+from app.services.executor import PaymentExecutor
+from app.services.run_stats import RunStats
+
+
+def make_executor(expense_client=None):
+    return PaymentExecutor(expense_client or MagicMock(), MagicMock(), MagicMock())
+
+
+def make_request(headers):
+    request = MagicMock()
+    request.headers = headers
+    return request
+
+
+class TestBatchLatency:
+
+    def test_latency_is_recorded_once_per_batch(self):
+        expense_client = MagicMock()
+        expense_client.create_expenses_bulk = AsyncMock(
+            return_value={"results": [{"index": index, "id": index + 1} for index in range(3)]}
+        )
+        batch = [
+            (
+                RecurringPayment(id=index, user_id=1, name="p", amount=Decimal("10"), category_id=1),
+                PaymentSchedule(execution_date=date(2024, 1, 1), status="pending")
+            )
+            for index in range(3)
+        ]
+        stats = RunStats()
+
+        executed = asyncio.run(make_executor(expense_client)._execute_batch("EXPENSE", batch, asyncio.Semaphore(1), stats))
+
+        assert executed == 3
+        assert len(stats._latencies) == 1
+
+
+class TestInterruptedRuns:
+
+    def add_run(self, db, started_at, status="running"):
+        run = SchedulerRun(execution_date=date(2024, 1, 1), status=status, started_at=started_at)
+        db.add(run)
+        db.commit()
+        return run
+
+    def test_only_stale_running_runs_are_marked(self, db):
+        stale = self.add_run(db, datetime.utcnow() - timedelta(hours=7))
+        recent = self.add_run(db, datetime.utcnow() - timedelta(minutes=5))
+        completed = self.add_run(db, datetime.utcnow() - timedelta(hours=7), status="completed")
+
+        marked = PaymentExecutor.mark_interrupted_runs(db, timedelta(hours=6))
+
+        assert marked == 1
+        assert stale.status == "interrupted"
+        assert stale.finished_at is not None
+        assert recent.status == "running"
+        assert completed.status == "completed"
+
+
+class TestMetricsToken:
+
+    def test_accepts_internal_token_header(self):
+        verify_metrics_token(make_request({"X-Internal-Token": settings.INTERNAL_SECRET_TOKEN}))
+
+    def test_accepts_bearer_token(self):
+        verify_metrics_token(make_request({"Authorization": f"Bearer {settings.INTERNAL_SECRET_TOKEN}"}))
+
+    @pytest.mark.parametrize("headers", [
+        {},
+        {"Authorization": "Bearer wrong"},
+        {"X-Internal-Token": "wrong"},
+    ])
+    def test_rejects_missing_or_wrong_token(self, headers):
+        with pytest.raises(HTTPException) as exc_info:
+            verify_metrics_token(make_request(headers))
+        assert exc_info.value.status_code == 403
@@ -0,0 +1,80 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.clients import base
+from app.clients.base import BaseServiceClient
+from app.clients.expense_client import ExpenseServiceClient
+from app.config import settings
+
+BASE_URL = "http://service.test"
+
+
+@pytest.fixture
+def responses():
+    """Ответы тестового транспорта по порядку; сделанные запросы копятся в requests"""
+    state = {"statuses": [], "requests": []}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"].append(request)
+        status = state["statuses"].pop(0) if state["statuses"] else 200
+        return httpx.Response(status, json={"ok": status == 200})
+
+    base._http_clients[BASE_URL] = httpx.AsyncClient(base_url=BASE_URL, transport=httpx.MockTransport(handler))
+    with patch.object(settings, "HTTP_RETRY_BACKOFF", 0), patch.object(settings, "HTTP_RETRY_ATTEMPTS", 3):
+        yield state
+    base._http_clients.clear()
+    base._host_semaphores.clear()
+
+
+def call(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestRetryPolicy:
+
+    @pytest.mark.parametrize("status", [502, 503, 504])
+    def test_get_is_retried_on_gateway_errors(self, responses, status):
+        responses["statuses"] = [status, 200]
+
+        assert call(BaseServiceClient(BASE_URL).get("/items")) == {"ok": True}
+        assert len(responses["requests"]) == 2
+
+    def test_post_without_idempotency_key_is_not_retried(self, responses):
+        responses["statuses"] = [503, 200]
+
+        with pytest.raises(httpx.HTTPStatusError):
+            call(BaseServiceClient(BASE_URL).post("/items", data={}))
+        assert len(responses["requests"]) == 1
+
+    def test_post_with_idempotency_key_is_retried(self, responses):
+        responses["statuses"] = [502, 200]
+
+        result = call(BaseServiceClient(BASE_URL).post("/items", data={}, headers={"Idempotency-Key": "k"}))
+
+        assert result == {"ok": True}
+        assert [request.headers["Idempotency-Key"] for request in responses["requests"]] == ["k", "k"]
+
+    def test_bulk_create_is_retried(self, responses):
+        responses["statuses"] = [504, 200]
+        client = ExpenseServiceClient()
+        client.base_url = BASE_URL
+
+        assert call(client.create_expenses_bulk([])) == {"ok": True}
+        assert len(responses["requests"]) == 2
+
+    def test_gives_up_after_configured_attempts(self, responses):
+        responses["statuses"] = [503, 503, 503, 200]
+
+        with pytest.raises(httpx.HTTPStatusError):
+            call(BaseServiceClient(BASE_URL).get("/items"))
+        assert len(responses["requests"]) == 3
+
+    def test_other_errors_are_not_retried(self, responses):
+        responses["statuses"] = [500, 200]
+
+        with pytest.raises(httpx.HTTPStatusError):
+            call(BaseServiceClient(BASE_URL).get("/items"))
+        assert len(responses["requests"]) == 1